@@ -13,23 +13,42 @@
 # -----------------------------------------------------------------------------
 
 import os
-import xml.etree.ElementTree as ET
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import datetime
-import csv
 import threading
 import sys
+import shutil
 import subprocess
+import tempfile
 import math
+import multiprocessing
+import time
+import queue
+
+# Die eigentliche Suche lebt GUI-frei in truffledog.py (auch als CLI nutzbar).
+from truffledog import (
+    DEFAULT_ENGINE, DEFAULT_WORKERS, DEFAULT_PREFILTER, COLUMNS, ResultStore, debug, FileScanner, search_files,
+    write_results, split_virtual_path, copy_virtual, BATCH_COLUMNS, read_batch_queries, search_batch, RunLog,
+    fuzzy_matcher,
+    PersonGroups, GROUP_COLUMNS, _date_bounds, DEFAULT_PARSER, DEFAULT_RECOVER, resolve_parser,
+)
+# Index, Schnellfilter, Live-Index, Suchdienst-Client und Query-Cache (samt sqlite3, asyncio, http.client)
+# importiere ich erst beim ersten Gebrauch – vor dem ersten Zeichnen braucht das Fenster nichts davon.
+
+
+def _import_date_entry():
+    """
+    Optionaler Datepicker aus tkcalendar – oder None. Ich nutze ihn gerne, ist aber kein Muss: das UI
+    fällt sauber auf 3 Comboboxen zurück. Importiert wird erst nach dem ersten Zeichnen
+    (_install_date_pickers): samt Babel kostet der Import spürbar, in der PyInstaller-EXE erst recht.
+    """
+    try:
+        from tkcalendar import DateEntry  # type: ignore
+    except ImportError:
+        return None
+    return DateEntry
 
-# Versuch, den optionalen Datepicker aus tkcalendar zu importieren.
-# Ich nutze ihn gerne, ist aber kein Muss – das UI fällt sauber auf 3 Comboboxen zurück.
-try:
-    from tkcalendar import DateEntry  # type: ignore
-    HAVE_DATEENTRY = True
-except ImportError:
-    HAVE_DATEENTRY = False
 
 """
 TruffleDog – Archivsuche (UI präzisiert, Funktion unverändert)
@@ -46,8 +65,20 @@ Meine Leitlinien hier:
 - Animation (Hund) ist rein kosmetisch; darf nie die Suche blockieren.
 """
 
-# Namespace für die XML-Dateien (so sind die XPath-Find-Aufrufe robust).
-NS = {'ns': 'http://www.unisys.com/polis/staatsarchiv/geschaeftsliste'}
+# Treffer fließen während der Suche über eine Queue ins UI. Der Hauptthread holt sie
+# zeitbudgetiert ab (ms pro Durchgang), damit das Fenster auch bei 100k Treffern bedienbar bleibt.
+DRAIN_BUDGET_MS = 15
+DRAIN_INTERVAL_MS = 40
+# Höchstens so viele Treffer-Batches warten in der Queue; ist sie voll, wartet der Suchthread aufs UI.
+# Sonst könnte eine breite Suche ("a") schneller Treffer liefern, als die Ablage sie wegschreibt.
+RESULT_QUEUE_BATCHES = 64
+# Fortschritt holt sich der Hauptthread in diesem Takt selbst ab (Zähler der Suche lesen) – früher
+# schickte der Suchthread pro Datei ein after(0), bei 100k kleinen Dateien eine Flut in Tks Event-Queue.
+PROGRESS_INTERVAL_MS = 100
+
+# Größenänderungen der Hund-Canvas erst verarbeiten, wenn so lange (ms) keine neue kam – beim Ziehen
+# am Fensterrand kommen sonst Dutzende <Configure> pro Sekunde, jedes mit Neuskalieren des Bildes.
+RESIZE_DEBOUNCE_MS = 80
 
 # Bildpfade (zuerst meine lokalen Pfade, dann Fallbacks relativ zum Skript).
 # Tipp an mich selbst: Falls ich portabel sein will, einfach nur die Fallbacks verwenden.
@@ -55,10 +86,142 @@ DEFAULT_LOGO_PATH = r"C:\Users\BZZ1391\Bingo\Truffle_Dog\Logo.png"
 DEFAULT_DOG_PATH  = r"C:\Users\BZZ1391\Bingo\Truffle_Dog\Suchhund.png"
 
 
-def debug(msg: str) -> None:
-    """Kompakter Debug-Print mit Uhrzeit. Reicht mir völlig für die Konsole."""
-    now = datetime.datetime.now().strftime("%H:%M:%S")
-    print(f"[{now}] {msg}", flush=True)
+# -----------------------------------------------------------------------------
+# Virtualisierte Ergebnisanzeige (Daten liegen im ResultStore bzw. in PersonGroups aus truffledog.py)
+# -----------------------------------------------------------------------------
+class VirtualResultView(tk.Frame):
+    """
+    Ergebnisliste, die nur die sichtbaren Zeilen als Treeview-Items anlegt.
+    Scrollen schreibt lediglich die Werte der vorhandenen Items neu – egal ob 100 oder 1M Treffer.
+    Die vertikale Scrollbar rechne ich selbst (Offset/Anzahl), die horizontale macht der Treeview.
+    """
+
+    ROW_HEIGHT = 20     # muss zu style 'Treeview' rowheight passen (_style_widgets)
+    HEADER_HEIGHT = 24  # grob; lieber eine Zeile zu wenig als eine halb abgeschnittene
+
+    def __init__(self, master: tk.Misc, store: ResultStore, columns: tuple[str, ...], **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.store = store
+        self.offset = 0          # erste sichtbare Anzeigeposition
+        self.visible_rows = 1
+        self.selected: int | None = None  # Speicherindex der gewählten Zeile (überlebt das Scrollen)
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', selectmode='browse')
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))  # Windows/macOS
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))                           # Linux
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-"), ("<Next>", "page+"),
+                          ("<Home>", "home"), ("<End>", "end")):
+            self.tree.bind(key, lambda e, st=step: self._on_key(st))
+
+    # --- Anzeige -------------------------------------------------------
+    def refresh(self) -> None:
+        """Sichtbares Fenster neu befüllen (nach neuen Treffern, Sortierung, Scrollen, Löschen)."""
+        total = len(self.store)
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        count = max(0, min(self.visible_rows, total - self.offset))
+        items = self.tree.get_children()
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+        for i in range(len(items), count):
+            self.tree.insert("", "end", iid=f"r{i}")
+        selected_iid = None
+        for i in range(count):
+            idx = self.store.index_at(self.offset + i)
+            self.tree.item(f"r{i}", values=self.store.row(idx))
+            if idx == self.selected:
+                selected_iid = f"r{i}"
+        if selected_iid:
+            self.tree.selection_set(selected_iid)
+            self.tree.focus(selected_iid)
+        else:
+            self.tree.selection_set(())
+        if total:
+            self.vsb.set(self.offset / total, (self.offset + count) / total)
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def show(self, store: ResultStore | PersonGroups, columns: tuple[str, ...]) -> None:
+        """Andere Ablage mit ihren Spalten anzeigen (Fundstellen ↔ Personen); Überschriften setzt der Aufrufer."""
+        self.store = store
+        self.tree.configure(columns=columns)
+        self.offset = 0
+        self.selected = None
+        self.refresh()
+
+    def clear(self) -> None:
+        """Ablage leeren und Anzeige zurücksetzen – O(sichtbare Zeilen)."""
+        self.store.clear()
+        self.offset = 0
+        self.selected = None
+        self.refresh()
+
+    def sort_by(self, column: str) -> None:
+        """Spaltenkopf-Klick: sortieren und an den Anfang springen."""
+        self.store.sort(column)
+        self.offset = 0
+        self.refresh()
+
+    def scroll(self, rows: int) -> None:
+        self.offset += rows
+        self.refresh()
+
+    def focus_row(self) -> tuple[str, str, str] | None:
+        """Die aktuell gewählte Zeile direkt aus der Ablage (nicht aus den Item-Werten)."""
+        return self.store.row(self.selected) if self.selected is not None and self.selected < len(self.store) else None
+
+    # --- Events ----------------------------------------------------------
+    def _on_resize(self, event: tk.Event) -> None:
+        self.visible_rows = max(1, (event.height - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+        self.refresh()
+
+    def _on_scrollbar(self, *args: str) -> None:
+        total = len(self.store)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * (self.visible_rows if args[2] == "pages" else 1)
+        self.refresh()
+
+    def _on_select(self, _event: tk.Event) -> None:
+        sel = self.tree.selection()
+        if sel:
+            self.selected = self.store.index_at(self.offset + int(sel[0][1:]))
+
+    def _on_key(self, step) -> str:
+        """Tastaturnavigation über die ganze Liste, nicht nur über die sichtbaren Items."""
+        total = len(self.store)
+        if not total:
+            return "break"
+        pos = self.offset + (int(self.tree.selection()[0][1:]) if self.tree.selection() else 0)
+        if step == "home":
+            pos = 0
+        elif step == "end":
+            pos = total - 1
+        elif step in ("page-", "page+"):
+            pos += self.visible_rows if step == "page+" else -self.visible_rows
+        else:
+            pos += step
+        pos = max(0, min(pos, total - 1))
+        if pos < self.offset:
+            self.offset = pos
+        elif pos >= self.offset + self.visible_rows:
+            self.offset = pos - self.visible_rows + 1
+        self.selected = self.store.index_at(pos)
+        self.refresh()
+        return "break"
 
 
 class ArchiveSearchApp(tk.Tk):
@@ -80,8 +243,27 @@ class ArchiveSearchApp(tk.Tk):
         # State / Threads / Ergebnisse
         # ------------------------------
         self.search_thread: threading.Thread | None = None
+        self.scanner: FileScanner | None = None           # Verzeichnis-Walk der laufenden Dateisuche
+        self.run_log: RunLog | None = None                # Laufprotokoll der laufenden Suche (JSON am Ende)
         self.stop_event = threading.Event()
-        self.results: list[tuple[str, str, str]] = []  # (Name, Geburtsdatum, Datei)
+        self.results = ResultStore()  # (Name, Geburtsdatum, Datei) – kompakt, siehe ResultStore
+        self.groups = PersonGroups()  # dieselben Treffer je Person – nur gefüllt, solange zusammengefasst wird
+        self.live_index = None                            # LiveIndex für "Ordner beobachten": Personen im Speicher, laufend abgeglichen
+        self.result_queue: queue.Queue | None = None      # Treffer-Batches der laufenden Suche (None = fertig)
+        self._pending_batch: list[tuple[str, str, str]] | None = None
+        self._pending_pos = 0
+        self.search_engine = DEFAULT_ENGINE
+        self.search_workers = DEFAULT_WORKERS
+        self.search_prefilter = DEFAULT_PREFILTER
+        self.search_parser = DEFAULT_PARSER
+        self._extract_dir: str | None = None       # Temp-Ordner für geöffnete Archiv-Mitglieder
+        self._extracted: dict[str, str] = {}       # virtueller Pfad → entpackte Kopie
+        self._index = None        # PersonIndex, BloomCache, QueryCache – beim ersten Zugriff (s. Properties)
+        self._bloom = None
+        self._query_cache = None
+        self._progress_snapshot = None   # liefert (Wert, Maximum, Text) für _poll_progress; None = ruhig
+        self._progress_polling = False
+        self._index_progress = (0, 1)    # letzter Stand von Index-/Schnellfilter-Refresh (done, total)
 
         # ------------------------------
         # Animationszustand (Suchhund)
@@ -95,13 +277,18 @@ class ArchiveSearchApp(tk.Tk):
         self.dog_img: tk.PhotoImage | None = None
         self.dog_img_raw: tk.PhotoImage | None = None
         self.logo_img: tk.PhotoImage | None = None
+        self._scaled_images: dict[tuple[str, int], tk.PhotoImage] = {}  # (Bild, Faktor) → verkleinert
+        self._resize_job: str | None = None
 
         # ------------------------------
-        # UI aufbauen, stylen, Bilder laden
+        # UI aufbauen und stylen; Bilder und tkcalendar erst nach dem ersten Zeichnen
         # ------------------------------
+        # Auf den Thin Clients (PyInstaller-EXE) stand das Fenster sonst spürbar später da.
+        self._t_start = time.perf_counter()
+        self.startup_times: dict[str, float] = {}  # Sekunden ab __init__: "fenster" (gezeichnet), "bereit"
         self._create_widgets()
         self._style_widgets()
-        self._load_images()
+        self._expose_binding = self.bind("<Expose>", self._on_first_expose, add="+")
 
         # Sauberes Verhalten beim Fenster-Schließen (inkl. laufender Suche)
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -110,6 +297,30 @@ class ArchiveSearchApp(tk.Tk):
     # ------------------------------------------------------------------
     # UI-Aufbau
     # ------------------------------------------------------------------
+    @property
+    def index(self):
+        """SQLite-Personenindex (PersonIndex)."""
+        if self._index is None:
+            from truffledog_index import PersonIndex
+            self._index = PersonIndex()
+        return self._index
+
+    @property
+    def bloom(self):
+        """Schnellfilter (BloomCache); wird genutzt, sobald er einmal aufgebaut ist."""
+        if self._bloom is None:
+            from truffledog_bloom import BloomCache
+            self._bloom = BloomCache()
+        return self._bloom
+
+    @property
+    def query_cache(self):
+        """Wiederholte Abfragen (QueryCache): gültig, solange der Baum (Pfad/mtime/Größe) unverändert ist."""
+        if self._query_cache is None:
+            from truffledog_cache import QueryCache, QUERY_CACHE_PERSIST, DEFAULT_CACHE_PATH
+            self._query_cache = QueryCache(DEFAULT_CACHE_PATH if QUERY_CACHE_PERSIST else None)
+        return self._query_cache
+
     def _create_widgets(self) -> None:
         """Erstellt alle Widgets und ordnet sie sauber in Frames an."""
         debug("Baue Widgets …")
@@ -151,45 +362,87 @@ class ArchiveSearchApp(tk.Tk):
         date_label = tk.Label(top_frame, text="Geburtsdatum (TT-MM-JJJJ):", font=('Helvetica', 12), bg='light blue')
         date_label.grid(row=2, column=0, sticky='e', pady=4)
 
-        if HAVE_DATEENTRY:
-            # Wenn tkcalendar da ist, nehme ich den DateEntry (ist angenehmer).
-            self.date_entry = DateEntry(
-                top_frame,
-                date_pattern='dd-MM-yyyy',
-                locale='de_DE',
-                firstweekday='monday',
-            )
-            self.date_entry.grid(row=2, column=1, columnspan=3, sticky='w')
-            self.day_combobox = None  # type: ignore
-            self.month_combobox = None  # type: ignore
-            self.year_combobox = None  # type: ignore
-        else:
-            # Fallback: Drei Comboboxen – funktioniert überall.
-            self.day_combobox   = ttk.Combobox(top_frame, values=[f"{i:02d}" for i in range(1, 32)], width=3)
-            self.month_combobox = ttk.Combobox(top_frame, values=[f"{i:02d}" for i in range(1, 13)], width=3)
-            current_year = datetime.datetime.now().year
-            self.year_combobox  = ttk.Combobox(top_frame, values=[str(i) for i in range(1900, current_year + 1)], width=5)
-            self.day_combobox.grid(row=2, column=1, sticky='w')
-            self.month_combobox.grid(row=2, column=2, sticky='w')
-            self.year_combobox.grid(row=2, column=3, sticky='w')
+        # Zuerst die drei Comboboxen – die funktionieren überall und sind sofort da. Ist tkcalendar
+        # installiert, tauscht _install_date_pickers sie nach dem ersten Zeichnen gegen den DateEntry.
+        self.date_from_frame = tk.Frame(top_frame, bg='light blue')
+        self.date_from_frame.grid(row=2, column=1, columnspan=3, sticky='w')
+        self.date_entry = None
+        self.day_combobox, self.month_combobox, self.year_combobox = self._date_comboboxes(self.date_from_frame)
+
+        # Genauigkeit + optionaler Zeitraum ("bis"). Bei den Comboboxen geht "nur Jahr"
+        # auch einfach durch Leerlassen von Tag/Monat.
+        range_label = tk.Label(top_frame, text="Genauigkeit / Zeitraum:", font=('Helvetica', 12), bg='light blue')
+        range_label.grid(row=3, column=0, sticky='e', pady=4)
+        range_frame = tk.Frame(top_frame, bg='light blue')
+        range_frame.grid(row=3, column=1, columnspan=3, sticky='w')
+        self.date_precision = ttk.Combobox(range_frame, values=["Tag", "Monat", "Jahr"], width=6, state='readonly')
+        self.date_precision.set("Tag")
+        self.date_precision.pack(side='left')
+        self.date_range_var = tk.BooleanVar(value=False)
+        range_check = tk.Checkbutton(range_frame, text="bis:", variable=self.date_range_var, bg='light blue')
+        range_check.pack(side='left', padx=(12, 0))
+        self.date_to_frame = tk.Frame(range_frame, bg='light blue')
+        self.date_to_frame.pack(side='left')
+        self.date_to_entry = None
+        self.day_to_combobox, self.month_to_combobox, self.year_to_combobox = self._date_comboboxes(self.date_to_frame)
 
         # Nameingabe (Teil- oder Volltreffer, case-insensitive)
         name_label = tk.Label(top_frame, text="Name:", font=('Helvetica', 12), bg='light blue')
-        name_label.grid(row=3, column=0, sticky='e', pady=4)
+        name_label.grid(row=4, column=0, sticky='e', pady=4)
         self.name_entry = tk.Entry(top_frame)
-        self.name_entry.grid(row=3, column=1, columnspan=3, sticky='we')
+        self.name_entry.grid(row=4, column=1, columnspan=3, sticky='we')
 
         # Verzeichniswahl
         directory_label = tk.Label(top_frame, text="Suchverzeichnis:", font=('Helvetica', 12), bg='light blue')
-        directory_label.grid(row=4, column=0, sticky='e', pady=4)
+        directory_label.grid(row=5, column=0, sticky='e', pady=4)
         self.directory_entry = tk.Entry(top_frame)
-        self.directory_entry.grid(row=4, column=1, columnspan=2, sticky='we')
+        self.directory_entry.grid(row=5, column=1, columnspan=2, sticky='we')
         dir_button = tk.Button(top_frame, text="Verzeichnis wählen", command=self._choose_directory)
-        dir_button.grid(row=4, column=3, sticky='w')
+        dir_button.grid(row=5, column=3, sticky='w')
+
+        # Optionen: Suche über den persistenten Index statt über die XML-Dateien
+        opts = tk.Frame(top_frame, bg='light blue')
+        opts.grid(row=6, column=1, columnspan=3, sticky='w', pady=(4, 0))
+        self.use_index_var = tk.BooleanVar(value=False)
+        index_check = tk.Checkbutton(opts, text="Index verwenden (schnell)", variable=self.use_index_var, bg='light blue')
+        index_check.pack(side='left')
+        # Beobachten: einmal einlesen, danach nur Geändertes nachparsen – jede weitere Suche aus dem Speicher
+        self.watch_var = tk.BooleanVar(value=False)
+        watch_check = tk.Checkbutton(opts, text="Ordner beobachten", variable=self.watch_var,
+                                     command=self._toggle_watch, bg='light blue')
+        watch_check.pack(side='left', padx=(8, 0))
+        # Suchdienst (truffledog.py serve): ein gemeinsamer warmer Index statt eigenem Durchkämmen des Shares
+        self.server_var = tk.BooleanVar(value=bool(os.environ.get("TRUFFLEDOG_SERVER")))
+        server_check = tk.Checkbutton(opts, text="Suchdienst", variable=self.server_var, bg='light blue')
+        server_check.pack(side='left', padx=(8, 0))
+        # Unscharf: Meier = Meyer = Maier, Müller = Mueller, ein Tippfehler (Kölner Phonetik)
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        fuzzy_check = tk.Checkbutton(opts, text="Name unscharf", variable=self.fuzzy_var, bg='light blue')
+        fuzzy_check.pack(side='left', padx=(8, 0))
+        # Tolerant parsen: Treffer aus kaputten Dateien behalten (bis zum Fehler, mit lxml auch dahinter).
+        # Index, Live-Index und Suchdienst kennen nur heile Dateien – darum läuft die Suche dann über die Dateien.
+        self.recover_var = tk.BooleanVar(value=DEFAULT_RECOVER)
+        recover_check = tk.Checkbutton(opts, text="Kaputte Dateien retten", variable=self.recover_var,
+                                       bg='light blue')
+        recover_check.pack(side='left', padx=(8, 0))
+        self.to_file_var = tk.BooleanVar(value=False)
+        to_file_check = tk.Checkbutton(opts, text="Direkt in Datei", variable=self.to_file_var, bg='light blue')
+        to_file_check.pack(side='left', padx=(8, 0))
+        # Eine Zeile je Person (Name/Datum normalisiert) statt je Fundstelle; Doppelklick zeigt die Dateien
+        self.group_var = tk.BooleanVar(value=False)
+        group_check = tk.Checkbutton(opts, text="Personen zusammenfassen", variable=self.group_var,
+                                     command=self._toggle_grouping, bg='light blue')
+        group_check.pack(side='left', padx=(8, 0))
+        index_button = tk.Button(opts, text="Index aktualisieren", command=self._refresh_index)
+        index_button.pack(side='left', padx=(8, 0))
+        bloom_button = tk.Button(opts, text="Schnellfilter aktualisieren", command=self._refresh_bloom)
+        bloom_button.pack(side='left', padx=(8, 0))
+        batch_button = tk.Button(opts, text="Liste abfragen …", command=self._start_batch)
+        batch_button.pack(side='left', padx=(8, 0))
 
         # Aktionsbuttons (gleichmäßig verteilt)
         btns = tk.Frame(top_frame, bg='light blue')
-        btns.grid(row=5, column=0, columnspan=4, pady=(8, 2), sticky='we')
+        btns.grid(row=7, column=0, columnspan=4, pady=(8, 2), sticky='we')
         for i in range(4):
             btns.grid_columnconfigure(i, weight=1)
 
@@ -203,33 +456,17 @@ class ArchiveSearchApp(tk.Tk):
         cancel_button.grid(row=0, column=2, padx=4, sticky='we')
         export_button.grid(row=0, column=3, padx=4, sticky='we')
 
-        # Fortschrittsbalken (auf Anzahl der XML-Dateien kalibriert)
+        # Fortschrittsbalken: verarbeitet vs. bisher gefunden (das Maximum wächst mit dem Walk mit)
         self.progress = ttk.Progressbar(top_frame, orient='horizontal', mode='determinate')
-        self.progress.grid(row=6, column=0, columnspan=4, sticky='we', pady=(6, 0))
-
-        # Ergebnisse (Treeview mit Scrollbars)
-        results_frame = tk.Frame(self, bg='light blue')
-        results_frame.pack(fill='both', expand=True, padx=10, pady=(0, 6))
-        results_frame.grid_rowconfigure(0, weight=1)
-        results_frame.grid_columnconfigure(0, weight=1)
-
-        columns = ("Name", "Geburtsdatum", "Datei")
-        self.tree = ttk.Treeview(results_frame, columns=columns, show='headings')
-        for col in columns:
-            self.tree.heading(col, text=col)
-            if col == "Datei":
-                self.tree.column(col, width=500, anchor='w')
-            elif col == "Name":
-                self.tree.column(col, width=180, anchor='w')
-            else:
-                self.tree.column(col, width=130, anchor='center')
+        self.progress.grid(row=8, column=0, columnspan=4, sticky='we', pady=(6, 0))
+        self.progress_label = tk.Label(top_frame, text="", bg='light blue', anchor='w')
+        self.progress_label.grid(row=9, column=0, columnspan=4, sticky='we')
 
-        vsb = ttk.Scrollbar(results_frame, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(results_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        vsb.grid(row=0, column=1, sticky='ns')
-        hsb.grid(row=1, column=0, sticky='ew')
+        # Ergebnisse (virtualisierter Treeview: nur sichtbare Zeilen existieren als Items)
+        self.result_view = VirtualResultView(self, self.results, COLUMNS, bg='light blue')
+        self.result_view.pack(fill='both', expand=True, padx=10, pady=(0, 6))
+        self.tree = self.result_view.tree
+        self._configure_columns(COLUMNS)
 
         # Doppelklick auf Eintrag => öffnet zugehörige Datei
         self.tree.bind("<Double-1>", self._open_selected_file)
@@ -243,11 +480,72 @@ class ArchiveSearchApp(tk.Tk):
         self.anim_canvas.pack(fill='x', expand=True)
         self.anim_canvas.bind("<Configure>", self._on_canvas_resize)
 
+    def _configure_columns(self, columns: tuple[str, ...]) -> None:
+        """Überschriften (Klick = sortieren) und Breiten der Ergebnisspalten."""
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.result_view.sort_by(c))
+            if col in ("Datei", "Dateien"):
+                self.tree.column(col, width=500, anchor='w')
+            elif col == "Name":
+                self.tree.column(col, width=180, anchor='w')
+            else:
+                self.tree.column(col, width=130, anchor='center')
+
+    def _date_comboboxes(self, parent: tk.Misc) -> tuple[ttk.Combobox, ttk.Combobox, ttk.Combobox]:
+        """Tag/Monat/Jahr als drei Comboboxen nebeneinander in parent."""
+        current_year = datetime.datetime.now().year
+        day = ttk.Combobox(parent, values=[f"{i:02d}" for i in range(1, 32)], width=3)
+        month = ttk.Combobox(parent, values=[f"{i:02d}" for i in range(1, 13)], width=3)
+        year = ttk.Combobox(parent, values=[str(i) for i in range(1900, current_year + 1)], width=5)
+        for cb in (day, month, year):
+            cb.pack(side='left', padx=(0, 4))
+        return day, month, year
+
+    def _install_date_pickers(self) -> None:
+        """
+        tkcalendar nachladen und die Comboboxen gegen den DateEntry tauschen (ist angenehmer).
+        Hat jemand in der Zwischenzeit schon ein Datum gewählt, bleiben die Comboboxen stehen.
+        """
+        date_entry_cls = _import_date_entry()
+        if date_entry_cls is None:
+            debug("[INFO] tkcalendar nicht installiert – Datum über Tag/Monat/Jahr.")
+            return
+        boxes = (self.day_combobox, self.month_combobox, self.year_combobox,
+                 self.day_to_combobox, self.month_to_combobox, self.year_to_combobox)
+        if any(cb.get() for cb in boxes):
+            debug("Datum schon eingegeben – Comboboxen bleiben.")
+            return
+        for cb in boxes:
+            cb.destroy()
+        self.day_combobox = self.month_combobox = self.year_combobox = None  # type: ignore
+        self.day_to_combobox = self.month_to_combobox = self.year_to_combobox = None  # type: ignore
+        options = dict(date_pattern='dd-MM-yyyy', locale='de_DE', firstweekday='monday')
+        self.date_entry = date_entry_cls(self.date_from_frame, **options)
+        self.date_entry.pack(side='left')
+        self.date_to_entry = date_entry_cls(self.date_to_frame, **options)
+        self.date_to_entry.pack(side='left')
+
+    def _on_first_expose(self, _event: tk.Event) -> None:
+        """Das Fenster wird zum ersten Mal gezeichnet – jetzt erst nachladen, was den Start bremste."""
+        self.unbind("<Expose>", self._expose_binding)
+        self.startup_times["fenster"] = time.perf_counter() - self._t_start
+        # Idle läuft erst, wenn keine Ereignisse mehr anstehen – also nach den übrigen Expose-Events.
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self) -> None:
+        """Bilder und tkcalendar nach dem ersten Zeichnen laden; startup_times["bereit"] markiert das Ende."""
+        self.update_idletasks()  # noch ausstehendes Zeichnen zuerst
+        self._load_images()
+        self._install_date_pickers()
+        self.startup_times["bereit"] = time.perf_counter() - self._t_start
+        debug(f"Start: Fenster nach {self.startup_times['fenster'] * 1000:.0f} ms gezeichnet, "
+              f"bereit nach {self.startup_times['bereit'] * 1000:.0f} ms.")
+
     def _style_widgets(self) -> None:
         """Ein paar Stilparameter für Treeview – das reicht mir."""
         debug("Style anwenden …")
         style = ttk.Style()
-        style.configure("Treeview", font=("Arial", 10))
+        style.configure("Treeview", font=("Arial", 10), rowheight=VirtualResultView.ROW_HEIGHT)
         style.configure("Treeview.Heading", font=("Arial", 11, 'bold'))
 
     # ------------------------------------------------------------------
@@ -269,12 +567,8 @@ class ArchiveSearchApp(tk.Tk):
         logo_path = self._first_existing(DEFAULT_LOGO_PATH, os.path.join(script_dir, "Logo.png"))
         if logo_path:
             try:
-                img = tk.PhotoImage(file=logo_path)
                 # Bei zu großem Logo skaliere ich es runter, damit es ästhetisch sitzt.
-                max_h = 60
-                if img.height() > max_h:
-                    factor = max(1, math.ceil(img.height() / max_h))
-                    img = img.subsample(factor, factor)
+                img = self._scaled("logo", tk.PhotoImage(file=logo_path), 60)
                 self.logo_img = img
                 self.logo_label.configure(image=self.logo_img)
                 debug(f"Logo geladen: {logo_path} ({img.width()}x{img.height()})")
@@ -298,14 +592,29 @@ class ArchiveSearchApp(tk.Tk):
     # ------------------------------------------------------------------
     # Animation (Hund unten)
     # ------------------------------------------------------------------
+    def _scaled(self, name: str, raw: tk.PhotoImage, max_h: int) -> tk.PhotoImage:
+        """
+        raw auf höchstens max_h Pixel Höhe verkleinern (subsample, ganzzahliger Faktor). Je Zielhöhe
+        rechne ich nur den Faktor aus – das Bild je Faktor gibt es einmal, viele Höhen teilen sich einen.
+        """
+        factor = max(1, math.ceil(raw.height() / max(1, max_h)))
+        if factor == 1:
+            return raw
+        img = self._scaled_images.get((name, factor))
+        if img is None:
+            img = self._scaled_images[(name, factor)] = raw.subsample(factor, factor)
+        return img
+
     def _prepare_dog_image(self) -> None:
         """Skaliert das Hundebild passend zur Canvas-Höhe und aktualisiert die Anzeige."""
         if not self.dog_img_raw:
             return
         # Ich rechne defensiv: Canvas-Höhe kann zum Zeitpunkt des Aufrufs noch klein sein.
         canvas_h = max(1, int(self.anim_canvas.winfo_height() or 110) - 10)
-        factor = max(1, math.ceil(self.dog_img_raw.height() / canvas_h))
-        self.dog_img = self.dog_img_raw.subsample(factor, factor)
+        img = self._scaled("dog", self.dog_img_raw, canvas_h)
+        if img is self.dog_img:
+            return  # gleicher Faktor wie bisher – nichts neu zu setzen
+        self.dog_img = img
         if self.dog_item is not None and self.dog_img:
             cy = self._canvas_center_y()
             self.anim_canvas.itemconfigure(self.dog_item, image=self.dog_img)
@@ -328,7 +637,14 @@ class ArchiveSearchApp(tk.Tk):
         return left, right
 
     def _on_canvas_resize(self, _event: tk.Event) -> None:
-        """Reagiere auf Resize-Events: Bild ggf. neu skalieren und Hund-Position validieren."""
+        """Resize-Events sammeln: erst wenn RESIZE_DEBOUNCE_MS lang keins mehr kam, wird angepasst."""
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DEBOUNCE_MS, self._apply_canvas_resize)
+
+    def _apply_canvas_resize(self) -> None:
+        """Bild ggf. neu skalieren (aus dem Cache) und Hund-Position validieren."""
+        self._resize_job = None
         self._prepare_dog_image()
         if self.dog_item is not None and self.dog_img is not None:
             left, right = self._dog_bounds()
@@ -389,10 +705,12 @@ class ArchiveSearchApp(tk.Tk):
     def _clear_results(self) -> None:
         """Entfernt alle Einträge aus der Ergebnisliste."""
         debug("Lösche Ergebnisse …")
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.results = []
+        self.results.clear()
+        self.groups.clear()
+        self.result_view.clear()
+        self._pending_batch, self._pending_pos = None, 0
         self.progress["value"] = 0
+        self.progress_label.configure(text="")
 
     def _cancel_search(self) -> None:
         """Bricht eine laufende Suche ab (setzt nur das Event; Thread beendet sich selbst)."""
@@ -402,25 +720,56 @@ class ArchiveSearchApp(tk.Tk):
         else:
             debug("Keine aktive Suche zum Abbrechen.")
 
-    def _validate_date(self) -> bool:
+    def _read_date(self, entry, day_cb, month_cb, year_cb) -> str:
+        """
+        Liest ein (Teil-)Datum aus DateEntry oder den 3 Comboboxen und kürzt es auf die
+        gewählte Genauigkeit ("1985", "1985-12" oder "1985-12-03").
+        - Bei den Comboboxen heißt leerer Tag = Monat, leerer Tag+Monat = Jahr.
+        - Gültigkeit prüfe ich per datetime.date(); Unsinn gibt ValueError.
         """
-        Validiert die Datumsangabe (unverändert).
-        - Mit DateEntry ist die Eingabe ohnehin immer gültig.
-        - Bei den 3 Comboboxen checke ich per datetime.date().
+        if entry is not None:
+            dt = entry.get_date()
+            year, month, day = dt.year, dt.month, dt.day
+        else:
+            day_s, month_s = day_cb.get().strip(), month_cb.get().strip()
+            if day_s and not month_s:
+                raise ValueError("Tag ohne Monat")
+            year = int(year_cb.get())
+            month = int(month_s) if month_s else None
+            day = int(day_s) if day_s else None
+            datetime.date(year, month or 1, day or 1)
+        precision = self.date_precision.get()
+        if precision == "Jahr" or month is None:
+            return f"{year:04d}"
+        if precision == "Monat" or day is None:
+            return f"{year:04d}-{month:02d}"
+        return f"{year:04d}-{month:02d}-{day:02d}"
+
+    def _read_date_query(self) -> str | None:
+        """
+        Baut den date_str für die Suche: Teildatum oder Zeitraum "von..bis".
+        Ein einzelnes volles Datum bleibt der exakte Vergleich wie früher.
+        Gibt None zurück (nach Fehlermeldung), wenn die Eingabe nicht passt.
         """
-        if HAVE_DATEENTRY and getattr(self, 'date_entry', None) is not None:
-            debug("Datum via DateEntry – keine Validierung nötig.")
-            return True
         try:
-            day = int(self.day_combobox.get())
-            month = int(self.month_combobox.get())
-            year = int(self.year_combobox.get())
-            datetime.date(year, month, day)
-            debug(f"Datum validiert: {year:04d}-{month:02d}-{day:02d}")
-            return True
+            date_from = self._read_date(self.date_entry, self.day_combobox, self.month_combobox,
+                                        self.year_combobox)
+            if not self.date_range_var.get():
+                debug(f"Datum validiert: {date_from}")
+                return date_from
+            date_to = self._read_date(self.date_to_entry, self.day_to_combobox,
+                                      self.month_to_combobox, self.year_to_combobox)
+            date_str = f"{date_from}..{date_to}"
+            try:
+                _date_bounds(date_str)  # beide Teile sind geprüft – ValueError heißt hier: von nach bis
+            except ValueError:
+                messagebox.showerror("Ungültiger Zeitraum", "Das Von-Datum liegt nach dem Bis-Datum.")
+                return None
+            debug(f"Zeitraum validiert: {date_str}")
+            return date_str
         except Exception:
             messagebox.showerror("Ungültiges Datum", "Bitte geben Sie ein gültiges Datum ein.")
-            return False
+            return None
 
     # ------------------------------------------------------------------
     # Hauptsuche (unverändert – nur Animation gestartet/gestoppt + ein paar Debugs)
@@ -440,16 +789,10 @@ class ArchiveSearchApp(tk.Tk):
         # Datum ermitteln (falls Suchart es erfordert)
         date_str = ""
         if search_type in ("birth", "both"):
-            if not self._validate_date():
+            # Intern immer ISO (YYYY-MM-DD bzw. gekürzt), Zeiträume als "von..bis".
+            date_str = self._read_date_query()
+            if date_str is None:
                 return
-            if HAVE_DATEENTRY and getattr(self, 'date_entry', None) is not None:
-                dt = self.date_entry.get_date()
-                date_str = dt.strftime('%Y-%m-%d')  # Ich speichere intern in ISO (YYYY-MM-DD).
-            else:
-                day = self.day_combobox.get().strip().zfill(2)
-                month = self.month_combobox.get().strip().zfill(2)
-                year = self.year_combobox.get().strip()
-                date_str = f"{year}-{month}-{day}"
 
         # Name ermitteln (falls Suchart es erfordert)
         name_value = ""
@@ -458,76 +801,476 @@ class ArchiveSearchApp(tk.Tk):
             if not name_value:
                 messagebox.showwarning("Warnung", "Bitte geben Sie einen Namen ein.")
                 return
+        fuzzy = self.fuzzy_var.get() and bool(name_value)
+        recover = self.recover_var.get()
+
+        # "Direkt in Datei": Treffer gehen beim Finden in eine CSV, nichts landet in der Ergebnisliste –
+        # für Suchen, deren Trefferzahl man nicht kennt. Läuft immer als Live-Suche (nicht über den Index).
+        out_path = None
+        if self.to_file_var.get():
+            out_path = filedialog.asksaveasfilename(title="Treffer speichern unter", defaultextension=".csv",
+                                                    filetypes=[("CSV Dateien", "*.csv")])
+            if not out_path:
+                return
+        # Nur die Suche über die Dateien schreibt in eine Datei bzw. rettet kaputte Dateien.
+        direct = out_path is not None or recover
 
-        debug(f"Suchparam: suchart={search_type}, datum={date_str or '-'}, name={name_value or '-'}")
+        debug(f"Suchparam: suchart={search_type}, datum={date_str or '-'}, name={name_value or '-'}"
+              f"{' (unscharf)' if fuzzy else ''}{' (kaputte Dateien retten)' if recover else ''}")
         debug(f"Durchsuche Verzeichnis: {directory}")
 
         # Bisherige Ergebnisse löschen und Abbruch-Flag zurücksetzen
         self._clear_results()
         self.stop_event.clear()
+        server = self.server_var.get() and not direct
+        if server:
+            from truffledog_server import SERVER_URL
+        run = RunLog("search", {
+            "search_type": search_type, "birth": date_str, "name": name_value, "dir": directory,
+            "engine": self.search_engine, "parser": resolve_parser(self.search_parser, recover),
+            "recover": recover, "jobs": self.search_workers,
+            "index": self.use_index_var.get() and not direct, "prefilter": self.search_prefilter,
+            "out": out_path, "fuzzy": fuzzy, "watch": self.watch_var.get() and not direct,
+            "server": SERVER_URL if server else None,
+        })
+
+        if out_path is not None:
+            scanner = FileScanner(directory, self.stop_event, sizes=True).start()
+            batches = search_files(scanner, search_type, date_str, name_value, self.search_engine,
+                                   self.search_workers, self.stop_event, self.search_prefilter,
+                                   stats=run.stats, bloom=self.bloom,
+                                   matcher=fuzzy_matcher(search_type, date_str, name_value, fuzzy),
+                                   parser=self.search_parser, recover=recover)
+            columns = GROUP_COLUMNS if self.group_var.get() else COLUMNS
+            self._start_file_thread(scanner, batches, out_path, columns, run, "")
+            return
+        self.run_log = run
+
+        if server:
+            # Client des Suchdienstes: kein eigener Walk; Seiten kommen wie Batches über die Queue.
+            self._start_animation()
+            self._begin_result_stream()
+            self._watch_index_progress()
+            self.search_thread = threading.Thread(
+                target=self._run_server_search,
+                args=(directory, search_type, date_str, name_value, fuzzy),
+                daemon=True
+            )
+            self.search_thread.start()
+            debug(f"Suche über den Suchdienst ({SERVER_URL}) gestartet.")
+            return
 
-        # XML-Dateien sammeln (rekursiv)
-        xml_files: list[str] = []
-        for root_dir, _, files in os.walk(directory):
-            for f in files:
-                if f.lower().endswith(".xml"):
-                    xml_files.append(os.path.join(root_dir, f))
-        if not xml_files:
-            messagebox.showinfo("Information", "Keine XML-Dateien im angegebenen Verzeichnis gefunden.")
+        if self.watch_var.get() and not direct:
+            # Live-Index: beim ersten Mal einlesen (Fortschritt wie beim Index), danach nur abgleichen.
+            live = self._live_index_for(directory)
+            self._start_animation()
+            self._begin_result_stream()
+            self._watch_index_progress()
+            self.search_thread = threading.Thread(
+                target=self._run_live_search,
+                args=(live, search_type, date_str, name_value, fuzzy),
+                daemon=True
+            )
+            self.search_thread.start()
+            debug("Suche im Live-Index gestartet.")
+            return
+
+        if self.use_index_var.get() and not direct:
+            # Index-Suche: kein Walk/Parse im Hauptthread; fehlt der Index noch, baut der Thread ihn zuerst.
+            self._start_animation()
+            self._begin_result_stream()
+            self._watch_index_progress()
+            self.search_thread = threading.Thread(
+                target=self._run_index_search,
+                args=(directory, search_type, date_str, name_value, fuzzy),
+                daemon=True
+            )
+            self.search_thread.start()
+            debug("Index-Suchthread gestartet.")
             return
 
-        debug(f"Anzahl XML-Dateien zum Durchsuchen: {len(xml_files)}")
+        # XML-Dateien sammelt der Scanner im Hintergrund (os.scandir); geparst wird, sobald die ersten da sind.
+        # Früher lief hier ein kompletter os.walk im Hauptthread – auf Netzlaufwerken minutenlang eingefroren.
+        from truffledog_cache import cache_key
+        self.scanner = FileScanner(directory, self.stop_event, fingerprint=True).start()
+        key = cache_key(search_type, date_str, name_value, directory, self.scanner.archives, fuzzy, recover,
+                        resolve_parser(self.search_parser, recover))
 
-        # Fortschrittsbalken vorbereiten
-        self.progress["maximum"] = len(xml_files)
+        # Fortschrittsbalken vorbereiten (Maximum wächst mit den gefundenen Bytes)
+        self.progress["maximum"] = 1
         self.progress["value"] = 0
+        self._watch_search_progress(self.scanner, self.run_log.stats)
 
         # Hund laufen lassen (nur Show)
         self._start_animation()
 
-        # Suchthread starten
+        # Suchthread starten; Treffer kommen laufend über die Queue
+        self._begin_result_stream()
         self.search_thread = threading.Thread(
             target=self._run_search,
-            args=(xml_files, search_type, date_str, name_value),
+            args=(self.scanner, search_type, date_str, name_value, fuzzy, key, recover),
             daemon=True
         )
         self.search_thread.start()
         debug("Suchthread gestartet.")
 
-    def _run_search(self, xml_files: list[str], search_type: str, date_str: str, name_value: str) -> None:
-        """Durchsucht die XML-Dateien im Hintergrundthread und aktualisiert den Fortschritt."""
+    def _run_search(self, scanner: FileScanner, search_type: str, date_str: str, name_value: str, fuzzy: bool,
+                    key: str, recover: bool = False) -> None:
+        """
+        Durchsucht die XML-Dateien im Hintergrundthread (Consumer des Scanners) und meldet den Fortschritt.
+        Läuft über den Query-Cache: bei unverändertem Baum kommen die Treffer nach dem Walk aus dem Cache.
+        """
+        from truffledog_cache import search_cached
         debug(f"Starte Suche nach Suchart '{search_type}' …")
-        results_local: list[tuple[str, str, str]] = []
-        total = len(xml_files)
-        for idx, file_path in enumerate(xml_files, start=1):
-            if self.stop_event.is_set():
-                debug("Suche wurde durch Benutzer abgebrochen.")
-                break
-            try:
-                # Ich logge moderat – jede Datei zu loggen ist ok; wenn's zu viel wird, hier drosseln.
-                debug(f"[{idx}/{total}] Verarbeite: {file_path}")
-                entries = self._search_in_xml(file_path, search_type, date_str, name_value)
-                results_local.extend(entries)
-            except Exception as e:
-                debug(f"Fehler beim Verarbeiten von {file_path}: {e}")
-            # Fortschritt aktualisieren (UI-thread-sicher via after)
-            self._update_progress(idx)
-        # Ergebnisse an das UI übergeben
-        self.after(0, lambda: self._on_search_complete(results_local))
-
-    def _update_progress(self, value: int) -> None:
-        """Aktualisiert den Fortschrittsbalken im Hauptthread."""
-        self.after(0, lambda val=value: self.progress.configure(value=val))
-
-    def _on_search_complete(self, results_local: list[tuple[str, str, str]]) -> None:
-        """Wird aufgerufen, wenn die Suche abgeschlossen ist oder abgebrochen wurde."""
-        debug(f"Suche abgeschlossen. Treffer: {len(results_local)}")
+        out = self.result_queue
+        run = self.run_log
+        try:
+            with run.profiled():
+                batches = search_files(scanner, search_type, date_str, name_value, self.search_engine,
+                                       self.search_workers, self.stop_event, self.search_prefilter,
+                                       stats=run.stats, bloom=self.bloom,
+                                       matcher=fuzzy_matcher(search_type, date_str, name_value, fuzzy),
+                                       parser=self.search_parser, recover=recover)
+                # Den Fortschritt liest der Hauptthread selbst aus run.stats (_poll_progress).
+                for _, entries in search_cached(self.query_cache, key, scanner, batches, self.stop_event,
+                                                run.stats):
+                    if entries:
+                        out.put(entries)
+        finally:
+            scanner.close()
+            # Ende signalisieren; _drain_results schließt ab, sobald alles eingefügt ist
+            out.put(None)
+
+    def _start_batch(self) -> None:
+        """
+        Anfrageliste (CSV: Name, Geburtsdatum) in einem Durchlauf abarbeiten.
+        Die Treffer gehen samt Anfrage direkt in eine CSV – die Ergebnisliste hat dafür keine Spalten.
+        """
+        if self.search_thread and self.search_thread.is_alive():
+            messagebox.showwarning("Suche läuft", "Bitte warten Sie, bis die aktuelle Suche abgeschlossen ist oder brechen Sie sie ab.")
+            return
+        directory = self.directory_entry.get().strip()
+        if not directory:
+            messagebox.showwarning("Warnung", "Bitte wählen Sie ein Suchverzeichnis.")
+            return
+        query_path = filedialog.askopenfilename(title="Anfrageliste wählen",
+                                                filetypes=[("CSV Dateien", "*.csv"), ("Alle Dateien", "*")])
+        if not query_path:
+            return
+        try:
+            with open(query_path, encoding="utf-8-sig", newline="") as fh:
+                queries = read_batch_queries(fh)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Anfrageliste", f"Die Anfrageliste ist nicht lesbar:\n{e}")
+            return
+        if not queries:
+            messagebox.showinfo("Anfrageliste", "Die Liste enthält keine Anfragen.")
+            return
+        out_path = filedialog.asksaveasfilename(title="Treffer speichern unter", defaultextension=".csv",
+                                                filetypes=[("CSV Dateien", "*.csv")])
+        if not out_path:
+            return
+
+        debug(f"Batch: {len(queries)} Anfragen aus {query_path}, Treffer nach {out_path}")
+        self.stop_event.clear()
+        scanner = FileScanner(directory, self.stop_event, sizes=True).start()
+        run = RunLog("batch", {"count": len(queries), "dir": directory, "out": out_path, "jobs": self.search_workers})
+        batches = search_batch(scanner, queries, self.search_workers, self.stop_event, run.stats)
+        self._start_file_thread(scanner, batches, out_path, BATCH_COLUMNS, run, f" für {len(queries)} Anfragen")
+
+    def _start_file_thread(self, scanner: FileScanner, batches, out_path: str, columns: tuple[str, ...],
+                           run: RunLog, what: str) -> None:
+        """Gemeinsamer Start für 'Direkt in Datei' und 'Liste abfragen' (Fortschritt, Hund, Thread)."""
+        self.progress["maximum"] = 1
+        self.progress["value"] = 0
+        self._watch_search_progress(scanner, run.stats)
+        self._start_animation()
+        self.search_thread = threading.Thread(target=self._run_to_file,
+                                              args=(scanner, batches, out_path, columns, run, what), daemon=True)
+        self.search_thread.start()
+        debug(f"Suchthread gestartet (Treffer direkt nach {out_path}).")
+
+    def _run_to_file(self, scanner: FileScanner, batches, out_path: str, columns: tuple[str, ...],
+                     run: RunLog, what: str) -> None:
+        """
+        Hintergrundthread: Treffer (aus search_files/search_batch) gestreamt in eine CSV – im Speicher bleibt nichts.
+        Mit GROUP_COLUMNS sammle ich erst die Personen (PersonGroups) und schreibe sie am Ende.
+        """
+        def rows():
+            for _, entries in batches:
+                yield from entries
+
+        count = None
+        unit = "Personen" if columns == GROUP_COLUMNS else "Treffer"
+        try:
+            with open(out_path, 'w', newline='', encoding='utf-8') as fh, run.profiled():
+                source = rows()
+                if columns == GROUP_COLUMNS:
+                    source = PersonGroups()
+                    source.extend(rows())
+                count = write_results(source, fh, "csv", columns)
+            text = f"{count} {unit}{what} gespeichert in:\n{out_path}"
+        except OSError as e:
+            text = f"Fehler beim Schreiben der Trefferliste: {e}"
+        finally:
+            scanner.close()
+            run.finish(hits=count, cancelled=self.stop_event.is_set())
+        self.after(0, lambda: self._on_index_refreshed(text, "Fertig"))
+
+    def _run_index_search(self, directory: str, search_type: str, date_str: str, name_value: str,
+                          fuzzy: bool = False) -> None:
+        """Beantwortet die Suche aus dem SQLite-Index (Hintergrundthread)."""
+        import sqlite3
+        out = self.result_queue
+        try:
+            refreshed = self.index.last_refresh(directory)
+            if refreshed is None:
+                debug("Verzeichnis noch nicht indexiert – baue Index auf …")
+                self.index.refresh(directory, self.stop_event, self._update_index_progress)
+            else:
+                stamp = datetime.datetime.fromtimestamp(refreshed).strftime("%d.%m.%Y %H:%M")
+                debug(f"Antwort aus Index (Stand {stamp}).")
+            if not self.stop_event.is_set():
+                t0 = time.perf_counter()
+                results_local = self.index.search(directory, search_type, date_str, name_value, fuzzy=fuzzy)
+                debug(f"Index-Abfrage: {len(results_local)} Treffer in {(time.perf_counter() - t0) * 1000:.1f} ms")
+                out.put(results_local)
+        except (OSError, sqlite3.Error) as e:
+            debug(f"Fehler im Index: {e}")
+        finally:
+            out.put(None)
+
+    def _toggle_watch(self) -> None:
+        """'Ordner beobachten' aus: Live-Index verwerfen (Speicher frei, Hintergrund-Abgleich beendet)."""
+        if not self.watch_var.get() and self.live_index is not None:
+            self.live_index.close()
+            self.live_index = None
+            debug("Live-Index verworfen.")
+
+    def _live_index_for(self, directory: str):
+        """Live-Index (LiveIndex) des Verzeichnisses; ein anderes Verzeichnis ersetzt den bisherigen."""
+        from truffledog_watch import LiveIndex
+        directory = os.path.abspath(directory)
+        if self.live_index is None or self.live_index.directory != directory:
+            if self.live_index is not None:
+                self.live_index.close()
+            self.live_index = LiveIndex(directory, jobs=self.search_workers)
+        return self.live_index
+
+    def _run_live_search(self, live, search_type: str, date_str: str, name_value: str,
+                         fuzzy: bool = False) -> None:
+        """
+        Beantwortet die Suche aus dem Live-Index (Hintergrundthread). Vorher ein Abgleich – so sind
+        auch Änderungen seit dem letzten Takt drin (kostet bei ruhigem Baum nur ein stat je Ordner).
+        """
+        out = self.result_queue
+        run = self.run_log
+        try:
+            with run.profiled():
+                if not live.ready:
+                    debug("Ordner noch nicht eingelesen – baue Live-Index auf …")
+                run.stats["live"] = live.update(self.stop_event, None if live.ready else self._update_index_progress)
+                if live.ready and not self.stop_event.is_set():
+                    live.watch()
+                    t0 = time.perf_counter()
+                    results_local = live.search(search_type, date_str, name_value,
+                                                matcher=fuzzy_matcher(search_type, date_str, name_value, fuzzy))
+                    debug(f"Live-Index: {len(results_local)} Treffer in {(time.perf_counter() - t0) * 1000:.1f} ms")
+                    out.put(results_local)
+        except OSError as e:
+            debug(f"Fehler im Live-Index: {e}")
+        finally:
+            out.put(None)
+
+    def _run_server_search(self, directory: str, search_type: str, date_str: str, name_value: str,
+                           fuzzy: bool = False) -> None:
+        """Fragt den Suchdienst (Hintergrundthread); liest er noch ein, läuft dessen Fortschritt im Balken mit."""
+        from truffledog_server import SearchClient, ServerError, SERVER_URL
+        out = self.result_queue
+        client = SearchClient(SERVER_URL)
+        pages = client.search(directory, search_type, date_str, name_value, fuzzy, self._update_index_progress)
+        try:
+            for page in pages:
+                if self.stop_event.is_set():
+                    break
+                out.put(page)
+            debug(f"Suchdienst: {client.last.get('hits', '?')} Treffer in {client.last.get('seconds', '?')} s")
+        except (ConnectionError, TimeoutError, ServerError) as e:
+            text = f"Der Suchdienst ({SERVER_URL}) antwortet nicht wie erwartet:\n{e}"
+            debug(text)
+            self.after(0, lambda: messagebox.showerror("Suchdienst", text))
+        finally:
+            pages.close()  # bei Abbruch: Verbindung zu, der Dienst hört auf zu senden
+            out.put(None)
+
+    def _refresh_index(self, target=None) -> None:
+        """Aktualisiert den Index für das gewählte Verzeichnis (nur neue/geänderte Dateien).
+        target: Thread-Funktion (Standard _run_index_refresh; der Schnellfilter nutzt denselben Ablauf)."""
+        if self.search_thread and self.search_thread.is_alive():
+            messagebox.showwarning("Suche läuft", "Bitte warten Sie, bis die aktuelle Suche abgeschlossen ist oder brechen Sie sie ab.")
+            return
+        directory = self.directory_entry.get().strip()
+        if not directory:
+            messagebox.showwarning("Warnung", "Bitte wählen Sie ein Suchverzeichnis.")
+            return
+        self.stop_event.clear()
+        self._start_animation()
+        self._watch_index_progress()
+        self.search_thread = threading.Thread(target=target or self._run_index_refresh, args=(directory,), daemon=True)
+        self.search_thread.start()
+        debug("Index-Refresh gestartet.")
+
+    def _refresh_bloom(self) -> None:
+        """Baut den Bloom-Schnellfilter für das gewählte Verzeichnis auf (nur neue/geänderte Dateien)."""
+        self._refresh_index(target=self._run_bloom_refresh)
+
+    def _run_bloom_refresh(self, directory: str) -> None:
+        """Hintergrundthread für 'Schnellfilter aktualisieren'."""
+        try:
+            stats = self.bloom.build(directory, self.stop_event, self._update_index_progress)
+            fp = self.bloom.stats()
+            text = (f"Neu/geändert: {stats['built']}, unverändert: {stats['unchanged']}, "
+                    f"entfernt: {stats['removed']}, Parse-Fehler: {stats['errors']}\n"
+                    f"Erwartete Falsch-Positiv-Rate: {fp['expected_fp_mean']:.2%} "
+                    f"(max. {fp['expected_fp_max']:.2%}), Cache: {fp['bytes'] / 1024:.0f} KB")
+        except OSError as e:
+            text = f"Fehler beim Aufbau des Schnellfilters: {e}"
+        self.after(0, lambda: self._on_index_refreshed(text, "Schnellfilter aktualisiert"))
+
+    def _run_index_refresh(self, directory: str) -> None:
+        """Hintergrundthread für 'Index aktualisieren'."""
+        import sqlite3
+        try:
+            stats = self.index.refresh(directory, self.stop_event, self._update_index_progress)
+            text = (f"Neu: {stats['new']}, geändert: {stats['changed']}, unverändert: {stats['unchanged']}, "
+                    f"gelöscht: {stats['removed']}, Parse-Fehler: {stats['errors']}")
+        except (OSError, sqlite3.Error) as e:
+            text = f"Fehler beim Aktualisieren des Index: {e}"
+        self.after(0, lambda: self._on_index_refreshed(text))
+
+    def _update_index_progress(self, done: int, total: int) -> None:
+        """Fortschritt des Index-Refresh (Maximum kennt erst der Thread nach dem Walk) – nur merken,
+        angezeigt wird er über _poll_progress."""
+        self._index_progress = (done, total)
+
+    def _watch_index_progress(self) -> None:
+        self._index_progress = (0, 1)
+        self._watch_progress(lambda: (*self._index_progress, None))
+
+    def _on_index_refreshed(self, text: str, title: str = "Index aktualisiert") -> None:
+        """Abschluss des Index-Refresh (bzw. Schnellfilter-Aufbaus) im Hauptthread."""
+        self._progress_snapshot = None
+        title = "Abgebrochen" if self.stop_event.is_set() else title
+        messagebox.showinfo(title, text)
+        self.progress["value"] = 0
+        self.search_thread = None
+        self._stop_animation()
+
+    def _watch_progress(self, snapshot) -> None:
+        """
+        Fortschritt ab jetzt alle PROGRESS_INTERVAL_MS aus snapshot() holen: (Wert, Maximum, Text oder None).
+        Die Hintergrundthreads rufen Tk dafür nie auf – egal wie viele Dateien, es bleibt ein Callback pro Takt.
+        """
+        self._progress_snapshot = snapshot
+        if not self._progress_polling:
+            self._progress_polling = True
+            self.after(PROGRESS_INTERVAL_MS, self._poll_progress)
+
+    def _poll_progress(self) -> None:
+        snapshot = self._progress_snapshot
+        if snapshot is None:
+            self._progress_polling = False
+            return
+        value, maximum, text = snapshot()
+        self.progress.configure(maximum=max(1, maximum), value=value)
+        if text is not None:
+            self.progress_label.configure(text=text)
+        self.after(PROGRESS_INTERVAL_MS, self._poll_progress)
+
+    def _watch_search_progress(self, scanner: FileScanner, stats: dict) -> None:
+        """
+        Balken und Zähler (verarbeitet / gefunden) einer Dateisuche. Die Skala sind Bytes
+        (stats["bytes_done"] wächst mit der Lese-Position des Parsers, auch mitten in einer Riesendatei);
+        ohne Größen (discovered_bytes 0) wie früher nach Dateien.
+        """
+        def snapshot():
+            done, discovered = stats.get("files", 0), scanner.discovered
+            found = f"{discovered}" if scanner.finished else f"{discovered}+ (Suche im Verzeichnis läuft …)"
+            text = f"Verarbeitet: {done} / gefunden: {found}"
+            total = scanner.discovered_bytes
+            if not total:
+                return done, discovered, text
+            read = stats.get("bytes_done", 0)
+            text += f" · {read / (1024 * 1024):.0f} von {total / (1024 * 1024):.0f}{'' if scanner.finished else '+'} MB"
+            return read, total, text
+
+        self._watch_progress(snapshot)
+
+    def _begin_result_stream(self) -> None:
+        """Neue Treffer-Queue für eine Suche anlegen und das Abholen im Hauptthread starten."""
+        self.result_queue = queue.Queue(RESULT_QUEUE_BATCHES)
+        self._pending_batch, self._pending_pos = None, 0
+        self.after(DRAIN_INTERVAL_MS, self._drain_results, self.result_queue)
+
+    def _drain_results(self, q: queue.Queue) -> None:
+        """
+        Holt Treffer-Batches aus der Queue und hängt sie an die Ergebnisablage – aber nur für
+        DRAIN_BUDGET_MS, dann gebe ich die Kontrolle an Tk zurück (Klicks, Scrollen, Animation).
+        Große Batches zerlege ich dafür in Scheiben; der Rest bleibt in _pending_batch liegen.
+        """
+        if q is not self.result_queue:
+            return  # Queue einer älteren Suche – die ist erledigt
+        started = time.perf_counter()
+        deadline = started + DRAIN_BUDGET_MS / 1000
+        finished = False
+        while time.perf_counter() < deadline:
+            if self._pending_batch is None:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                self._pending_batch, self._pending_pos = item, 0
+                continue
+            end = min(len(self._pending_batch), self._pending_pos + 5000)
+            chunk = self._pending_batch[self._pending_pos:end]
+            self.results.extend(chunk)
+            if self.group_var.get():
+                self.groups.extend(chunk)
+            self._pending_pos = end
+            if end >= len(self._pending_batch):
+                self._pending_batch = None
+
+        # Die Ansicht materialisiert nur das sichtbare Fenster – einmal pro Durchgang reicht.
+        self.result_view.refresh()
+        if self.run_log is not None:
+            stats = self.run_log.stats
+            stats["t_ui"] = stats.get("t_ui", 0.0) + time.perf_counter() - started
+        if finished:
+            self.result_queue = None
+            self._on_search_complete()
+            return
+        # Budget aufgebraucht → sofort weiter (nach den UI-Events); sonst gemütlich wieder nachsehen.
+        busy = self._pending_batch is not None or not q.empty()
+        self.after(1 if busy else DRAIN_INTERVAL_MS, self._drain_results, q)
+
+    def _on_search_complete(self) -> None:
+        """Wird aufgerufen, wenn die Suche abgeschlossen ist oder abgebrochen wurde (alle Treffer sind schon drin)."""
+        debug(f"Suche abgeschlossen. Treffer: {len(self.results)}")
+        self._progress_snapshot = None
+        scanner, self.scanner = self.scanner, None
+        if self.run_log is not None:
+            self.run_log.finish(hits=len(self.results), cancelled=self.stop_event.is_set())
+            self.run_log = None
         if self.stop_event.is_set():
             messagebox.showinfo("Abgebrochen", "Die Suche wurde abgebrochen.")
+        elif scanner is not None and scanner.discovered == 0:
+            messagebox.showinfo("Information", "Keine XML-Dateien im angegebenen Verzeichnis gefunden.")
         else:
-            messagebox.showinfo("Fertig", f"Suche abgeschlossen. Gefundene Einträge: {len(results_local)}")
-        self.results = results_local
-        self._display_results(results_local)
+            persons = f" ({len(self.groups)} Personen)" if self.group_var.get() else ""
+            messagebox.showinfo("Fertig", f"Suche abgeschlossen. Gefundene Einträge: {len(self.results)}{persons}")
         # Fortschritt zurücksetzen und Thread-Ref freigeben
         self.progress["value"] = 0
         self.search_thread = None
@@ -536,58 +1279,26 @@ class ArchiveSearchApp(tk.Tk):
         self._stop_animation()
 
     # ------------------------------------------------------------------
-    # XML-Analyse (unverändert)
+    # Ergebnisdarstellung und Export
     # ------------------------------------------------------------------
-    @staticmethod
-    def _search_in_xml(file_path: str, search_type: str, date_str: str, name_value: str) -> list[tuple[str, str, str]]:
+    def _toggle_grouping(self) -> None:
         """
-        Durchsucht eine einzelne XML-Datei nach passenden Personen.
-        Entscheidendes Detail:
-        - Ich vergleiche das Geburtsdatum als exakten ISO-String (YYYY-MM-DD).
-        - Beim Namen reicht 'in' (Teiltreffer), case-insensitive.
+        Ansicht umschalten: eine Zeile je Fundstelle bzw. je Person. Beim Einschalten baue ich die Gruppen
+        einmal aus der Ablage auf (ein Durchgang, kein Sortieren); während der Suche wachsen sie in
+        _drain_results mit. Ausschalten gibt die Gruppen wieder frei.
         """
-        found_entries: list[tuple[str, str, str]] = []
-        try:
-            tree = ET.parse(file_path)
-        except ET.ParseError:
-            debug(f"Fehler beim Parsen der Datei: {file_path}")
-            return found_entries
-        root = tree.getroot()
-
-        # Ich greife Personen-Knoten über den Namespace 'ns' ab.
-        for person in root.findall('.//ns:Person', NS):
-            name_node = person.find('ns:Name', NS)
-            birth_node = person.find('ns:Geburtsdatum', NS)
-            person_name = name_node.text if name_node is not None else ""
-            person_birth = birth_node.text if birth_node is not None else ""
-
-            match = False
-            if search_type == "birth":
-                match = (person_birth == date_str)
-            elif search_type == "name":
-                match = name_value.lower() in person_name.lower()
-            elif search_type == "both":
-                match = (person_birth == date_str and name_value.lower() in person_name.lower())
-
-            if match:
-                found_entries.append((person_name or "Unbekannt", person_birth or "", file_path))
-        return found_entries
-
-    # ------------------------------------------------------------------
-    # Ergebnisdarstellung und Export
-    # ------------------------------------------------------------------
-    def _display_results(self, results: list[tuple[str, str, str]]) -> None:
-        """Zeigt die Ergebnisliste im Treeview an."""
-        debug("Ergebnisse anzeigen …")
-        # Bestehende Zeilen entfernen
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        # Neue Zeilen einfügen
-        for row in results:
-            self.tree.insert("", "end", values=row)
+        self.groups.clear()
+        if self.group_var.get():
+            self.groups.extend(self.results)
+            self.result_view.show(self.groups, GROUP_COLUMNS)
+            self._configure_columns(GROUP_COLUMNS)
+            debug(f"Zusammengefasst: {len(self.results)} Treffer → {len(self.groups)} Personen")
+        else:
+            self.result_view.show(self.results, COLUMNS)
+            self._configure_columns(COLUMNS)
 
     def _export_results(self) -> None:
-        """Exportiert die aktuellen Ergebnisse als CSV (UTF-8, Semikolonfrei)."""
+        """Exportiert die aktuellen Ergebnisse als CSV (UTF-8, Semikolonfrei) – zusammengefasst eine Zeile je Person."""
         if not self.results:
             messagebox.showinfo("Keine Daten", "Es gibt keine Ergebnisse zum Exportieren.")
             return
@@ -598,29 +1309,61 @@ class ArchiveSearchApp(tk.Tk):
         try:
             debug(f"Exportiere Ergebnisse nach: {file_path}")
             with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Name", "Geburtsdatum", "Datei"])
-                for row in self.results:
-                    writer.writerow(row)
+                if self.group_var.get():
+                    write_results(self.groups, csvfile, "csv", GROUP_COLUMNS)
+                else:
+                    write_results(self.results, csvfile, "csv")
             messagebox.showinfo("Exportiert", f"Ergebnisse erfolgreich exportiert nach:\n{file_path}")
             debug(f"Export erfolgreich: {file_path}")
         except Exception as exc:
             messagebox.showerror("Fehler", f"Fehler beim Exportieren der Datei: {exc}")
 
     def _open_selected_file(self, event: tk.Event) -> None:
-        """Öffnet die ausgewählte Datei mit der systemeigenen Anwendung (plattformabhängig)."""
-        selected = self.tree.focus()
-        if not selected:
+        """Öffnet die ausgewählte Datei mit der systemeigenen Anwendung (plattformabhängig).
+        Zusammengefasst: bei mehreren Dateien erst die Liste der Fundstellen (_show_group_files)."""
+        row = self.result_view.focus_row()
+        if row is None:
             return
-        values = self.tree.item(selected, 'values')
-        if len(values) < 3:
+        if self.result_view.store is self.groups:
+            files = self.groups.files(self.result_view.selected)
+            if len(files) > 1:
+                self._show_group_files(row, files)
+                return
+            self._open_file(files[0])
             return
-        file_path = values[2]
-        if not os.path.exists(file_path):
+        self._open_file(row[2])
+
+    def _show_group_files(self, row: tuple, files: list[str]) -> None:
+        """Die Dateien einer Person aufklappen (eigenes Fenster); Doppelklick/Enter öffnet die Datei."""
+        win = tk.Toplevel(self, bg='light blue')
+        win.title(f"{row[0]} ({row[1]}) – {row[2]} Fundstellen in {len(files)} Dateien")
+        win.geometry("700x300")
+        listbox = tk.Listbox(win, activestyle='dotbox')
+        vsb = ttk.Scrollbar(win, orient="vertical", command=listbox.yview)
+        listbox.configure(yscrollcommand=vsb.set)
+        listbox.pack(side='left', fill='both', expand=True, padx=(10, 0), pady=10)
+        vsb.pack(side='left', fill='y', pady=10, padx=(0, 10))
+        listbox.insert(tk.END, *files)
+
+        def open_current(_event: tk.Event) -> None:
+            sel = listbox.curselection()
+            if sel:
+                self._open_file(files[sel[0]])
+
+        listbox.bind("<Double-1>", open_current)
+        listbox.bind("<Return>", open_current)
+        listbox.focus_set()
+
+    def _open_file(self, file_path: str) -> None:
+        """Datei bzw. Archiv-Mitglied mit der Systemanwendung öffnen."""
+        parts = split_virtual_path(file_path)
+        if not os.path.exists(parts[0] if parts else file_path):
             messagebox.showerror("Fehler", f"Datei existiert nicht: {file_path}")
             return
         debug(f"Öffne Datei: {file_path}")
         try:
+            if parts:
+                file_path = self._extract_member(file_path)
             if sys.platform.startswith('darwin'):
                 subprocess.Popen(['open', file_path])  # macOS
             elif os.name == 'nt':
@@ -632,6 +1375,25 @@ class ArchiveSearchApp(tk.Tk):
         except Exception as exc:
             messagebox.showerror("Fehler", f"Fehler beim Öffnen der Datei: {exc}")
 
+    def _extract_member(self, virtual_path: str) -> str:
+        """
+        Packt ein Archiv-Mitglied ("a.zip!/x/liste.xml") einmalig in einen Temp-Ordner aus und
+        liefert den Pfad – die Systemanwendung braucht eine echte Datei. Aufgeräumt wird beim Schließen.
+        """
+        if virtual_path in self._extracted and os.path.exists(self._extracted[virtual_path]):
+            return self._extracted[virtual_path]
+        if self._extract_dir is None:
+            self._extract_dir = tempfile.mkdtemp(prefix="truffledog_")
+        # Eigener Unterordner je Mitglied: gleiche Dateinamen aus verschiedenen Archiven kollidieren nicht.
+        target_dir = os.path.join(self._extract_dir, str(len(self._extracted)))
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, os.path.basename(split_virtual_path(virtual_path)[1]))
+        debug(f"Entpacke {virtual_path} → {target}")
+        with open(target, "wb") as out:
+            copy_virtual(virtual_path, out)
+        self._extracted[virtual_path] = target
+        return target
+
     # ------------------------------------------------------------------
     # Fensterverwaltung
     # ------------------------------------------------------------------
@@ -646,12 +1408,22 @@ class ArchiveSearchApp(tk.Tk):
             self.stop_event.set()
             debug("Abbruchsignal an Suchthread gesendet.")
         self._stop_animation()
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        if self.live_index is not None:
+            self.live_index.close()
+        self.results.clear()  # löscht auch eine ausgelagerte Ablage (Temp-Datei)
+        if self._extract_dir is not None:
+            # Entpackte Archiv-Mitglieder wegräumen (noch offene Dateien unter Windows bleiben halt liegen).
+            shutil.rmtree(self._extract_dir, ignore_errors=True)
         self.destroy()
         debug("Applikation beendet.")
 
 
 # Haupteinstiegspunkt
 if __name__ == "__main__":
+    # Für die PyInstaller-EXE nötig, sonst startet jeder Worker-Prozess eine neue GUI.
+    multiprocessing.freeze_support()
     debug("Starte TruffleDog GUI …")
     app = ArchiveSearchApp()
     app.mainloop()
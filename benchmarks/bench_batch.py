@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch-Benchmark: Laufzeit eines Durchlaufs mit 1, 10, 100, … Anfragen über denselben Bestand.
+Die Zeit soll mit dem Bestand wachsen, nicht mit Anfragen × Bestand – zum Vergleich steht daneben,
+was N Einzelsuchen (N × eine Einzelsuche ohne Vorfilter) kosten würden.
+
+Aufruf:
+  python benchmarks/bench_batch.py --corpus /tmp/bestand --queries 1 10 100 500 --jobs 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import iter_persons, list_xml_files, search_batch, search_files  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+
+
+def sample_queries(xml_files: list[str], count: int, seed: int) -> list[tuple[str, str]]:
+    """Anfragen aus echten Personen des Bestands (gemischt: Name+Datum, nur Name, nur Datum)."""
+    rnd = random.Random(seed)
+    persons: list[tuple[str, str]] = []
+    for path in xml_files[:20]:
+        try:
+            persons.extend(iter_persons(path))
+        except Exception:
+            continue
+    queries = []
+    for i in range(count):
+        name, birth = rnd.choice(persons)
+        queries.append([(name, birth), (name, ""), ("", birth)][i % 3])
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Bestandsverzeichnis (wird erzeugt, falls kein manifest.json da ist)")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, "manifest.json")):
+        generate_corpus(args.corpus, args.files, seed=args.seed)
+    xml_files = list_xml_files(args.corpus)
+
+    # Referenz: eine Einzelsuche (ohne Vorfilter, damit sie wie ein Batch-Durchlauf jede Datei parst)
+    name, birth = sample_queries(xml_files, 1, args.seed)[0]
+    t0 = time.perf_counter()
+    for _ in search_files(xml_files, "both", birth, name, jobs=args.jobs, prefilter=False):
+        pass
+    single = time.perf_counter() - t0
+
+    print(f"{len(xml_files)} Dateien, Einzelsuche: {single:.2f} s")
+    print(f"{'Anfragen':>9} {'Batch s':>9} {'N×einzeln s':>12} {'Treffer':>9}")
+    for count in args.queries:
+        queries = sample_queries(xml_files, count, args.seed)
+        t0 = time.perf_counter()
+        hits = sum(len(entries) for _, entries in search_batch(xml_files, queries, args.jobs))
+        elapsed = time.perf_counter() - t0
+        print(f"{count:>9} {elapsed:>9.2f} {count * single:>12.1f} {hits:>9}")
+
+
+if __name__ == "__main__":
+    main()
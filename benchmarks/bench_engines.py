@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: "tree" (ET.parse) gegen "stream" (iterparse) in search_in_xml.
+
+Erzeugt synthetische Geschäftslisten-Dateien in wachsender Größe und misst pro Engine
+Laufzeit (ms pro MB) und Peak-Speicher (tracemalloc). Nebenbei prüfe ich, dass beide
+Engines exakt dieselben Treffer liefern.
+
+Aufruf:
+  python benchmarks/bench_engines.py --sizes 5 20 80
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import NS, get_engine  # noqa: E402
+
+
+# Kommt im Generator regelmäßig vor (Person 85, 85+840, …) – damit es überhaupt Treffer gibt.
+QUERY_DATE = "1985-02-14"
+
+
+def write_file(path: str, size_mb: float) -> int:
+    """Schreibt eine Geschäftsliste mit ca. size_mb MB; liefert die Anzahl Personen."""
+    target = int(size_mb * 1024 * 1024)
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fh.write(f'<Geschaeftsliste xmlns="{NS["ns"]}">\n  <Personen>\n')
+        while fh.tell() < target:
+            fh.write(
+                "    <Person>\n"
+                f"      <Name>Person {count} Muster</Name>\n"
+                f"      <Geburtsdatum>{1900 + count % 120:04d}-{1 + count % 12:02d}-{1 + count % 28:02d}</Geburtsdatum>\n"
+                "    </Person>\n"
+            )
+            count += 1
+        fh.write("  </Personen>\n</Geschaeftsliste>\n")
+    return count
+
+
+def measure(engine: str, path: str) -> tuple[float, int, list[tuple[str, str, str]]]:
+    """Liefert (Sekunden, Peak-Bytes, Treffer) für eine Engine.
+    Zeit und Speicher messe ich in getrennten Läufen – tracemalloc bremst sonst die Zeitmessung."""
+    func = get_engine(engine)
+    t0 = time.perf_counter()
+    func(path, "birth", QUERY_DATE, "")
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    hits = func(path, "birth", QUERY_DATE, "")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[5, 20, 80], help="Dateigrößen in MB")
+    args = parser.parse_args()
+
+    print(f"{'MB':>6} {'Personen':>10} {'Engine':>7} {'ms/MB':>8} {'Peak MB':>8} {'Treffer':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"liste_{size:g}mb.xml")
+            persons = write_file(path, size)
+            real_mb = os.path.getsize(path) / (1024 * 1024)
+            hits_by_engine = {}
+            for engine in ("tree", "stream"):
+                elapsed, peak, hits_by_engine[engine] = measure(engine, path)
+                print(f"{real_mb:6.1f} {persons:10d} {engine:>7} {elapsed * 1000 / real_mb:8.1f} "
+                      f"{peak / (1024 * 1024):8.1f} {len(hits_by_engine[engine]):8d}")
+            if hits_by_engine["tree"] != hits_by_engine["stream"]:
+                print("!! Engines liefern unterschiedliche Treffer", file=sys.stderr)
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: unscharfe Namenssuche im PersonIndex gegen die scharfe Suche.
+
+Füllt einen Index direkt mit synthetischen Personen (wie bench_name_index), diesmal mit
+Schreibvarianten: Nachnamen aus Silben, dazu Meier/Meyer/Maier, Müller/Mueller usw. und ein
+Anteil Tippfehler. Gemessen wird die Latenz pro Abfrage:
+  - exakt:  PersonIndex.search (FTS5-Trigramm)
+  - fuzzy:  PersonIndex.search(fuzzy=True) – Wortverzeichnis, Kölner Code, Löschnachbarn
+  - python: FuzzyMatcher über eine Liste im Speicher (nur bis --check Personen, als Gegenprobe)
+Bis --check Personen prüfe ich außerdem, dass Index und FuzzyMatcher dieselben Treffer liefern.
+
+Aufruf:
+  python benchmarks/bench_fuzzy.py --persons 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import FuzzyMatcher  # noqa: E402
+from truffledog_index import PersonIndex  # noqa: E402
+
+FIRST = ["Hans", "Anna", "Peter", "Maria", "Jürgen", "Juergen", "Ursula", "Karl", "Carl", "Ruth", "Walter",
+         "Verena", "Fritz", "Elisabeth", "Heinrich", "Margrit", "Ernst", "Rosa", "Jakob", "Gertrud", "Otto"]
+VARIANTS = ["Meier", "Meyer", "Maier", "Mayer", "Müller", "Mueller", "Muller", "Schmidt", "Schmitt", "Schmid",
+            "Weiß", "Weiss", "Großmann", "Grossmann", "Fischer", "Fisher", "Kälin", "Kaelin"]
+SYLLABLES = ["ber", "hof", "stein", "wald", "mann", "brun", "egg", "zur", "kel", "ler", "bach", "moos",
+             "ried", "am", "matt", "hub", "er", "wil", "tal", "lin", "gut", "knecht", "rüt", "li"]
+PERSONS_PER_FILE = 10_000
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def surname(rnd: random.Random) -> str:
+    if rnd.random() < 0.2:
+        name = rnd.choice(VARIANTS)
+    else:
+        name = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randrange(2, 4))).capitalize()
+    if rnd.random() < 0.05:  # Tippfehler
+        i = rnd.randrange(len(name))
+        name = name[:i] + rnd.choice(ALPHABET) + name[i + 1:]
+    return name
+
+
+def build_index(index: PersonIndex, root: str, persons: int, seed: int, keep: int) -> list[tuple[str, str, str]]:
+    """Befüllt den Index; liefert die ersten keep Personen als Liste (für die Gegenprobe)."""
+    rnd = random.Random(seed)
+    rows: list[tuple[str, str, str]] = []
+    vocab: dict[str, int] = {}
+    conn = index._connect()
+    try:
+        for file_no in range(0, persons, PERSONS_PER_FILE):
+            path = os.path.join(root, f"liste_{file_no // PERSONS_PER_FILE:06d}.xml")
+            file_id = conn.execute("INSERT INTO files(path, mtime, size, hash) VALUES (?, 0, 0, '')", (path,)).lastrowid
+            batch = []
+            for seq in range(min(PERSONS_PER_FILE, persons - file_no)):
+                name = f"{rnd.choice(FIRST)} {surname(rnd)}"
+                birth = f"{rnd.randrange(1900, 2020)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}"
+                batch.append((file_id, seq, name, name.lower(), birth, birth))
+                if file_no + seq < keep:
+                    rows.append((name, birth, path))
+            conn.executemany("INSERT INTO persons(file_id, seq, name, name_lower, birth, birth_norm) VALUES (?, ?, ?, ?, ?, ?)", batch)
+            PersonIndex._index_words(conn, file_id, vocab)
+        conn.execute("INSERT INTO roots(path, refreshed) VALUES (?, ?)", (os.path.abspath(root), time.time()))
+        conn.commit()
+    finally:
+        conn.close()
+    print(f"Wortverzeichnis: {len(vocab):,} verschiedene Namenswörter")
+    return rows
+
+
+def timed(func, repeat: int) -> tuple[float, list]:
+    """Bester von `repeat` Läufen in ms."""
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=1_000_000)
+    parser.add_argument("--queries", nargs="+", default=["meier", "mueller", "hans schmidt", "bergwald", "kaelin"])
+    parser.add_argument("--check", type=int, default=1_000_000, help="Gegenprobe mit FuzzyMatcher bis zu so vielen Personen")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    check = args.persons <= args.check
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "archiv")
+        index = PersonIndex(os.path.join(tmp, "index.sqlite"))
+        t0 = time.perf_counter()
+        rows = build_index(index, root, args.persons, args.seed, args.persons if check else 0)
+        print(f"Index mit {args.persons:,} Personen in {time.perf_counter() - t0:.1f} s gebaut "
+              f"({os.path.getsize(index.db_path) / (1024 * 1024):.0f} MB)")
+
+        print(f"{'Abfrage':>14} {'exakt':>8} {'ms':>8} {'fuzzy':>8} {'ms':>8} {'python ms':>10} {'identisch':>10}")
+        for query in args.queries:
+            t_exact, hits_exact = timed(lambda: index.search(root, "name", "", query), args.repeat)
+            t_fuzzy, hits_fuzzy = timed(lambda: index.search(root, "name", "", query, fuzzy=True), args.repeat)
+            t_py, same = float("nan"), "-"
+            if check:
+                matcher = FuzzyMatcher(query)
+                t_py, hits_py = timed(lambda: [r for r in rows if matcher.match(r[0], r[1])], 1)
+                same = "ja" if sorted(hits_py) == sorted(hits_fuzzy) else "NEIN"
+            print(f"{query:>14} {len(hits_exact):8d} {t_exact:8.1f} {len(hits_fuzzy):8d} {t_fuzzy:8.1f} "
+                  f"{t_py:10.1f} {same:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Namenssuche im PersonIndex – FTS5-Trigramm gegen linearen Scan.
+
+Füllt einen Index direkt mit synthetischen Personen (ohne XML, sonst dauert das Befüllen
+bei 10 Mio. Personen länger als der eigentliche Vergleich) und misst die Latenz pro Abfrage:
+  - trigram: PersonIndex.search mit FTS5 (Standard)
+  - instr:   PersonIndex.search linear in SQLite (so wie bei Suchbegriffen < 3 Zeichen)
+  - python:  die Schleife aus search_in_xml (truffledog.py) über eine Liste im Speicher
+Nebenbei prüfe ich, dass alle drei dieselben Treffer liefern.
+
+Aufruf:
+  python benchmarks/bench_name_index.py --persons 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog_index import PersonIndex  # noqa: E402
+
+FIRST = ["Hans", "Anna", "Peter", "Maria", "Jürgen", "Ursula", "Karl", "Ruth", "Walter", "Verena",
+         "Fritz", "Elisabeth", "Heinrich", "Margrit", "Ernst", "Rosa", "Jakob", "Gertrud", "Otto", "Lina"]
+LAST = ["Muster", "Meier", "Müller", "Keller", "Huber", "Schneider", "Weber", "Brunner", "Baumann",
+        "Frei", "Zimmermann", "Gerber", "Moser", "Steiner", "Fischer", "Graf", "Wyss", "Kälin", "Bachmann"]
+PERSONS_PER_FILE = 10_000
+
+
+def build_index(index: PersonIndex, root: str, persons: int, seed: int) -> list[tuple[str, str, str]]:
+    """Befüllt den Index; liefert dieselben Personen als Liste (für den Python-Scan)."""
+    rnd = random.Random(seed)
+    rows: list[tuple[str, str, str]] = []
+    conn = index._connect()
+    try:
+        for file_no in range(0, persons, PERSONS_PER_FILE):
+            path = os.path.join(root, f"liste_{file_no // PERSONS_PER_FILE:06d}.xml")
+            file_id = conn.execute("INSERT INTO files(path, mtime, size, hash) VALUES (?, 0, 0, '')", (path,)).lastrowid
+            batch = []
+            for seq in range(min(PERSONS_PER_FILE, persons - file_no)):
+                name = f"{rnd.choice(FIRST)} {rnd.choice(LAST)}{rnd.randrange(10000)}"
+                birth = f"{rnd.randrange(1900, 2020)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}"
+                batch.append((file_id, seq, name, name.lower(), birth, birth))
+                rows.append((name, birth, path))
+            conn.executemany("INSERT INTO persons(file_id, seq, name, name_lower, birth, birth_norm) VALUES (?, ?, ?, ?, ?, ?)", batch)
+        conn.execute("INSERT INTO roots(path, refreshed) VALUES (?, ?)", (os.path.abspath(root), time.time()))
+        conn.commit()
+    finally:
+        conn.close()
+    return rows
+
+
+def timed(func, repeat: int) -> tuple[float, list]:
+    """Bester von `repeat` Läufen in ms."""
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persons", type=int, default=1_000_000)
+    parser.add_argument("--queries", nargs="+", default=["müller4711", "keller99", "elisabeth wyss", "ursula kälin12"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "archiv")
+        index = PersonIndex(os.path.join(tmp, "index.sqlite"))
+        t0 = time.perf_counter()
+        rows = build_index(index, root, args.persons, args.seed)
+        print(f"Index mit {args.persons:,} Personen in {time.perf_counter() - t0:.1f} s gebaut "
+              f"({os.path.getsize(index.db_path) / (1024 * 1024):.0f} MB, FTS5: {'ja' if index.has_fts else 'nein'})")
+
+        print(f"{'Abfrage':>16} {'Treffer':>8} {'trigram ms':>11} {'instr ms':>9} {'python ms':>10} {'identisch':>10}")
+        for query in args.queries:
+            index.has_fts = True
+            t_fts, hits_fts = timed(lambda: index.search(root, "name", "", query), args.repeat)
+            index.has_fts = False
+            t_lin, hits_lin = timed(lambda: index.search(root, "name", "", query), args.repeat)
+            needle = query.lower()
+            t_py, hits_py = timed(lambda: [r for r in rows if needle in r[0].lower()], 1)
+            same = "ja" if hits_fts == hits_lin == hits_py else "NEIN"
+            print(f"{query:>16} {len(hits_fts):8d} {t_fts:11.1f} {t_lin:9.1f} {t_py:10.1f} {same:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Prozess-Pool-Suche (search_in_pool) mit steigender Worker-Zahl.
+
+Erzeugt einen synthetischen Bestand aus vielen Dateien und misst die Laufzeit für
+1, 2, 4, … Prozesse bis zur Kernzahl. Ausgegeben werden Zeit, Speedup gegenüber
+dem sequentiellen Lauf und ob die Treffer (inkl. Reihenfolge) identisch sind.
+
+Aufruf:
+  python benchmarks/bench_parallel.py --files 400 --size-mb 0.5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import get_engine, search_in_pool  # noqa: E402
+from bench_engines import QUERY_DATE, write_file  # noqa: E402
+
+
+def run_sequential(xml_files: list[str]) -> list[tuple[str, str, str]]:
+    """Referenz: dieselbe Schleife wie _run_search mit einem Worker."""
+    func = get_engine("stream")
+    results: list[tuple[str, str, str]] = []
+    for path in xml_files:
+        results.extend(func(path, "birth", QUERY_DATE, ""))
+    return results
+
+
+def run_pool(xml_files: list[str], workers: int) -> list[tuple[str, str, str]]:
+    results: list[tuple[str, str, str]] = []
+    for _, entries in search_in_pool(xml_files, "birth", QUERY_DATE, "", "stream", workers, threading.Event()):
+        results.extend(entries)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400, help="Anzahl XML-Dateien")
+    parser.add_argument("--size-mb", type=float, default=0.5, help="Größe pro Datei in MB")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_files = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"liste_{i:05d}.xml")
+            write_file(path, args.size_mb)
+            xml_files.append(path)
+        total_mb = sum(os.path.getsize(p) for p in xml_files) / (1024 * 1024)
+        print(f"Bestand: {len(xml_files)} Dateien, {total_mb:.1f} MB")
+
+        t0 = time.perf_counter()
+        reference = run_sequential(xml_files)
+        base = time.perf_counter() - t0
+        print(f"{'Worker':>7} {'Sekunden':>9} {'MB/s':>7} {'Speedup':>8} {'identisch':>10}")
+        print(f"{'seq':>7} {base:9.2f} {total_mb / base:7.1f} {1.0:8.2f} {'ja':>10}")
+
+        counts = sorted({args.max_workers, *(2 ** k for k in range(8) if 2 ** k <= args.max_workers)})
+        for workers in counts:
+            t0 = time.perf_counter()
+            results = run_pool(xml_files, workers)
+            elapsed = time.perf_counter() - t0
+            same = "ja" if results == reference else "NEIN"
+            print(f"{workers:7d} {elapsed:9.2f} {total_mb / elapsed:7.1f} {base / elapsed:8.2f} {same:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Parser-Backends von iter_persons (PARSER_BACKENDS) auf einem synthetischen Bestand (benchmarks/corpus.py).
+
+Gemessen, je installiertem Backend, alles in einem Prozess auf einem Kern:
+  durchsatz – alle Dateien parsen (bester von --repeat): s, MB/s, Personen/s, Faktor gegen "etree"
+              (iterparse, das ursprüngliche Verfahren); dazu ob die Personen der heilen Dateien
+              exakt dieselben sind wie bei "etree"
+  gerettet  – kaputte Dateien mit recover=True: Personen, die übrig bleiben, gegen die geschriebenen –
+              getrennt nach abgeschnittenen und verstümmelten Dateien (--garbled; nur lxml liest dort
+              hinter dem Fehler weiter)
+Zum Schluss die Probe-Abfrage über search() ohne und mit recover, gegen die Trefferzahl im Manifest.
+
+Aufruf:
+  python benchmarks/bench_parsers.py --corpus /tmp/bestand --files 200 --malformed 0.1 --garbled 0.5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import PARSER_BACKENDS, available_parsers, iter_persons, resolve_parser, search  # noqa: E402
+from corpus import generate_corpus, PROBE_NAME, PROBE_BIRTH  # noqa: E402
+
+
+def parse_all(paths: list[str], parser: str, recover: bool = False) -> tuple[list[list], list[bool]]:
+    """Personen je Datei und ob die Datei einen ParseError gemeldet hat."""
+    persons, failed = [], []
+    for path in paths:
+        found: list = []
+        try:
+            found.extend(iter_persons(path, parser, recover))
+            failed.append(False)
+        except ET.ParseError:
+            failed.append(True)
+        persons.append(found)
+    return persons, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Bestandsverzeichnis (wird erzeugt, falls kein manifest.json da ist)")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=float, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--malformed", type=float, default=0.1)
+    parser.add_argument("--garbled", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.corpus, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    else:
+        manifest = generate_corpus(args.corpus, args.files, args.size_kb, malformed=args.malformed,
+                                   seed=args.seed, garbled=args.garbled)
+    entries = manifest["entries"]
+    paths = [os.path.join(args.corpus, e["path"]) for e in entries]
+    broken = [i for i, e in enumerate(entries) if e["malformed"]]
+    print(f"Bestand: {manifest['files']} Dateien, {manifest['total_bytes'] / (1024 * 1024):.1f} MB, "
+          f"{manifest['total_persons']:,} Personen, {len(broken)} kaputt "
+          f"(davon {sum(e.get('garbled', False) for e in entries)} verstümmelt)")
+    installed = available_parsers()
+    missing = [name for name in PARSER_BACKENDS if name not in installed]
+    print(f"Backends: {', '.join(installed)} – auto = {resolve_parser('auto')}, mit recover = "
+          f"{resolve_parser('auto', True)}" + (f" (nicht installiert: {', '.join(missing)})" if missing else ""))
+
+    mb = manifest["total_bytes"] / (1024 * 1024)
+    reference, _ = parse_all(paths, "etree")
+    timings = {}
+    print(f"{'Backend':>8} {'s':>7} {'MB/s':>7} {'Pers./s':>10} {'Faktor':>7} {'identisch':>9}")
+    for name in ["etree"] + [n for n in installed if n != "etree"]:
+        best, persons = float("inf"), []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            persons, failed = parse_all(paths, name)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+        same = all(persons[i] == reference[i] for i in range(len(paths)) if i not in broken)
+        count = sum(map(len, persons))
+        print(f"{name:>8} {best:7.2f} {mb / best:7.1f} {count / best:10,.0f} {timings['etree'] / best:6.2f}x "
+              f"{'ja' if same else 'NEIN':>9}")
+
+    print(f"{'Backend':>8} {'Fehler gemeldet':>16} {'abgeschnitten gerettet':>24} {'verstümmelt gerettet':>24}")
+    for name in installed:
+        persons, failed = parse_all([paths[i] for i in broken], name, recover=True)
+        cells = []
+        for garbled in (False, True):
+            rows = [j for j, i in enumerate(broken) if entries[i].get("garbled", False) == garbled]
+            kept = sum(len(persons[j]) for j in rows)
+            written = sum(entries[broken[j]]["persons"] for j in rows)
+            cells.append(f"{kept:,} von {written:,}" if rows else "-")
+        print(f"{name:>8} {sum(failed):>7} von {len(broken):<5} {cells[0]:>24} {cells[1]:>24}")
+
+    print(f"Probe ({PROBE_NAME}, {PROBE_BIRTH}), Manifest ohne kaputte Dateien: {manifest['expected_hits']}")
+    for recover in (False, True):
+        stats: dict = {}
+        hits = list(search(args.corpus, "both", PROBE_BIRTH, PROBE_NAME, prefilter=False, stats=stats,
+                           recover=recover))
+        print(f"  {'mit' if recover else 'ohne'} recover: {len(hits)} Treffer, {stats['parse_errors']} Parse-Fehler, "
+              f"{stats['recovered']:,} Personen gerettet")
+
+
+if __name__ == "__main__":
+    main()
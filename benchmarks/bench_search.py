@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-End-Benchmark über einen synthetischen Bestand (benchmarks/corpus.py).
+
+Szenarien (jedes in einem eigenen Prozess, damit der Peak-RSS sauber getrennt ist):
+  search_in_xml[tree|stream]  – Datei für Datei, mit Zeit pro Datei (p50/p99)
+  run_search[jobs=N]          – FileScanner + search_files, also der Weg von _run_search ohne Tk
+  …,prefilter                 – dasselbe mit Byte-Vorfilter (nur Kandidaten werden geparst)
+
+Ausgabe je Szenario: Dateien/s, MB/s, Personen/s, p50/p99 pro Datei (nur Einzeldatei-Szenarien),
+Peak-RSS, Anzahl geparster Dateien und ob die Trefferzahl zum Manifest passt. Das Ergebnis landet als JSON in --out,
+mit --compare alt.json werden die Durchsätze gegen einen früheren Lauf gestellt.
+
+Aufruf:
+  python benchmarks/bench_search.py --corpus /tmp/bestand --files 500 --jobs 1 4
+  python benchmarks/bench_search.py --corpus /tmp/bestand --compare bench_results/alt.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import FileScanner, Prefilter, get_engine, list_xml_files, search_files  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+
+try:
+    import resource  # nur Unix
+except ImportError:
+    resource = None
+
+SEARCH_TYPE = "both"
+
+
+def peak_rss_kb() -> int | None:
+    """Peak-RSS dieses Prozesses plus beendeter Kinder (Pool-Worker) in KB; None auf Windows."""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS meldet Bytes, Linux KB
+    return max(own, children) // scale
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_scenario(corpus_dir: str, scenario: str, manifest: dict) -> dict:
+    """Führt ein Szenario im aktuellen Prozess aus und liefert die Kennzahlen."""
+    probe = manifest["probe"]
+    xml_files = list_xml_files(corpus_dir)
+    per_file: list[float] = []
+    hits = 0
+    options = scenario[scenario.index("[") + 1:-1].split(",")
+    prefilter = "prefilter" in options
+    stats = {"files": 0, "parsed": 0}
+
+    t0 = time.perf_counter()
+    if scenario.startswith("search_in_xml"):
+        func = get_engine(options[0])
+        pf = Prefilter(SEARCH_TYPE, probe["birth"], probe["name"]) if prefilter else None
+        for path in xml_files:
+            t = time.perf_counter()
+            if pf is None or pf.may_match(path):
+                stats["parsed"] += 1
+                hits += len(func(path, SEARCH_TYPE, probe["birth"], probe["name"]))
+            per_file.append(time.perf_counter() - t)
+    else:
+        jobs = int(options[0].split("=")[1])
+        scanner = FileScanner(corpus_dir).start()  # wie _start_search: der Walk gehört zur Laufzeit
+        for _, entries in search_files(scanner, SEARCH_TYPE, probe["birth"], probe["name"], jobs=jobs,
+                                       prefilter=prefilter, stats=stats):
+            hits += len(entries)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "scenario": scenario,
+        "seconds": round(elapsed, 4),
+        "files_per_s": round(len(xml_files) / elapsed, 1),
+        "mb_per_s": round(manifest["total_bytes"] / (1024 * 1024) / elapsed, 2),
+        "persons_per_s": round(manifest["total_persons"] / elapsed),
+        "p50_ms": round(percentile(per_file, 50) * 1000, 3) if per_file else None,
+        "p99_ms": round(percentile(per_file, 99) * 1000, 3) if per_file else None,
+        "peak_rss_kb": peak_rss_kb(),
+        "parsed_files": stats["parsed"],
+        "hits": hits,
+        "hits_ok": hits == manifest["expected_hits"],
+    }
+
+
+def run_isolated(corpus_dir: str, scenario: str) -> dict:
+    """Startet das Szenario in einem frischen Interpreter und liest das JSON von stdout."""
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--corpus", corpus_dir, "--scenario", scenario],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, old_path: str) -> None:
+    with open(old_path, encoding="utf-8") as fh:
+        old = {r["scenario"]: r for r in json.load(fh)["results"]}
+    print(f"\nVergleich mit {old_path}:")
+    for r in current["results"]:
+        if r["scenario"] in old:
+            ratio = r["mb_per_s"] / old[r["scenario"]]["mb_per_s"]
+            print(f"  {r['scenario']:<32} {old[r['scenario']]['mb_per_s']:>8.2f} → {r['mb_per_s']:>8.2f} MB/s  ({ratio:.2f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Bestandsverzeichnis (wird erzeugt, falls kein manifest.json da ist)")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=float, default=256)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--hit-rate", type=float, default=0.001)
+    parser.add_argument("--malformed", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--prefilter", choices=("on", "off", "both"), default="both",
+                        help="Szenarien mit/ohne Byte-Vorfilter (Standard: beide zum Vergleich)")
+    parser.add_argument("--out", default=None, help="JSON-Datei (Standard: bench_results/<Zeitstempel>.json)")
+    parser.add_argument("--compare", default=None, help="früheres Ergebnis-JSON zum Vergleich")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)  # interner Einstieg für run_isolated
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.corpus, "manifest.json")
+    if args.scenario:
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        print(json.dumps(run_scenario(args.corpus, args.scenario, manifest)))
+        return
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    else:
+        manifest = generate_corpus(args.corpus, args.files, args.size_kb, 1.0, args.depth,
+                                   args.hit_rate, args.malformed, args.seed)
+    print(f"Bestand: {manifest['files']} Dateien, {manifest['total_bytes'] / (1024 * 1024):.1f} MB, "
+          f"{manifest['total_persons']:,} Personen, {manifest['expected_hits']} erwartete Treffer")
+
+    base = ["search_in_xml[tree]", "search_in_xml[stream]"] + [f"run_search[jobs={j}]" for j in dict.fromkeys(args.jobs)]
+    suffixes = {"off": [""], "on": [",prefilter"], "both": ["", ",prefilter"]}[args.prefilter]
+    scenarios = [f"{b[:-1]}{suffix}]" for b in base for suffix in suffixes]
+    results = []
+    print(f"{'Szenario':<32} {'Datei/s':>9} {'MB/s':>8} {'Pers./s':>10} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} "
+          f"{'geparst':>8}  Treffer")
+    for scenario in scenarios:
+        r = run_isolated(args.corpus, scenario)
+        results.append(r)
+        fmt = lambda v, f: format(v, f) if v is not None else f"{'-':>8}"  # noqa: E731
+        rss = r["peak_rss_kb"] / 1024 if r["peak_rss_kb"] is not None else None
+        print(f"{scenario:<32} {r['files_per_s']:>9.1f} {r['mb_per_s']:>8.2f} {r['persons_per_s']:>10,} "
+              f"{fmt(r['p50_ms'], '>8.2f')} {fmt(r['p99_ms'], '>8.2f')} {fmt(rss, '>8.1f')} "
+              f"{r['parsed_files']:>8}  {r['hits']} {'ok' if r['hits_ok'] else 'FALSCH'}")
+
+    summary = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus": {k: v for k, v in manifest.items() if k != "entries"},
+        "results": results,
+    }
+    out = args.out or os.path.join("bench_results", time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, ensure_ascii=False, indent=1)
+    print(f"\nGespeichert: {out}")
+    if args.compare:
+        compare(summary, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: lokaler Suchdienst (truffledog_server.py) mit mehreren gleichzeitigen Clients – alles auf localhost.
+
+Startet den Dienst im selben Prozess (Thread, freier Port) über einem synthetischen Bestand
+(benchmarks/corpus.py) und misst:
+  warm-up   – Zeit bis zur ersten Antwort (Aufbau des Live-Index, Fortschritt kommt als Stream)
+  clients   – --clients Threads schicken je --rounds Mal alle Abfragen; Latenz p50/p99 je Abfrage
+              (bis zur letzten Seite) und Abfragen/s gesamt
+Jede Antwort vergleiche ich mit der Live-Suche über die Dateien (einmal je Abfrage gerechnet).
+
+Aufruf:
+  python benchmarks/bench_server.py --corpus /tmp/bestand --files 200 --clients 1 8 32
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import search  # noqa: E402
+from truffledog_server import SearchServer, SearchClient  # noqa: E402
+from corpus import generate_corpus, PROBE_NAME, PROBE_BIRTH  # noqa: E402
+
+QUERIES = [
+    ("name", "", PROBE_NAME),
+    ("birth", PROBE_BIRTH, ""),
+    ("both", "1985", PROBE_NAME.split()[0]),
+    ("birth", "1950..1952", ""),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def fetch(client: SearchClient, query: tuple) -> list[tuple]:
+    return [row for page in client.search(None, *query) for row in page]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Bestandsverzeichnis (wird erzeugt, falls kein manifest.json da ist)")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=float, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.corpus, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    else:
+        manifest = generate_corpus(args.corpus, args.files, args.size_kb, seed=args.seed)
+    print(f"Bestand: {manifest['files']} Dateien, {manifest['total_bytes'] / (1024 * 1024):.1f} MB, "
+          f"{manifest['total_persons']:,} Personen")
+
+    expected = {query: sorted(search(args.corpus, *query, jobs=args.jobs)) for query in QUERIES}
+
+    server = SearchServer(args.corpus, port=0, jobs=args.jobs)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    server.listening.wait()
+    url = f"http://127.0.0.1:{server.port}"
+    try:
+        t0 = time.perf_counter()
+        rows = fetch(SearchClient(url), QUERIES[0])
+        print(f"Warm-up (erste Antwort inkl. Aufbau): {time.perf_counter() - t0:.1f} s, "
+              f"{'identisch' if sorted(rows) == expected[QUERIES[0]] else 'ABWEICHUNG'}")
+
+        print(f"{'Clients':>8} {'Abfragen':>9} {'p50 ms':>8} {'p99 ms':>8} {'Abfr./s':>8} {'identisch':>9}")
+        for clients in args.clients:
+            latencies: list[float] = []
+            mismatches = 0
+            lock = threading.Lock()
+
+            def worker() -> None:
+                nonlocal mismatches
+                client = SearchClient(url)
+                for _ in range(args.rounds):
+                    for query in QUERIES:
+                        t_start = time.perf_counter()
+                        rows = fetch(client, query)
+                        elapsed = time.perf_counter() - t_start
+                        with lock:
+                            latencies.append(elapsed * 1000)
+                            mismatches += sorted(rows) != expected[query]
+
+            threads = [threading.Thread(target=worker) for _ in range(clients)]
+            t0 = time.perf_counter()
+            for worker_thread in threads:
+                worker_thread.start()
+            for worker_thread in threads:
+                worker_thread.join()
+            elapsed = time.perf_counter() - t0
+            print(f"{clients:8d} {len(latencies):9d} {percentile(latencies, 50):8.1f} {percentile(latencies, 99):8.1f} "
+                  f"{len(latencies) / elapsed:8.1f} {'ja' if not mismatches else f'NEIN ({mismatches})':>9}")
+    finally:
+        server.stop()
+        thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Suche über einen Snapshot (truffledog_snapshot.py) gegen die Live-Suche über die XML-Dateien.
+
+Gemessen auf einem synthetischen Bestand (benchmarks/corpus.py):
+  xml       – search() über die Dateien (Prozess-Pool mit --jobs), je Abfrage
+  export    – Bestand parsen und Snapshot schreiben (einmalig), Dateigröße gegen den Bestand
+  load      – Snapshot öffnen (mmap, Pfad- und Datumstabelle), mit und ohne NumPy
+  snapshot  – dieselben Abfragen aus dem Snapshot (bester von --repeat), mit NumPy bzw. nur array/memoryview
+Für jede Abfrage prüfe ich, dass Snapshot und Live-Suche dieselben Treffer liefern.
+
+Aufruf:
+  python benchmarks/bench_snapshot.py --corpus /tmp/bestand --files 400 --jobs 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import search  # noqa: E402
+from truffledog_snapshot import Snapshot, export_snapshot, np  # noqa: E402
+from corpus import generate_corpus, PROBE_NAME, PROBE_BIRTH  # noqa: E402
+
+QUERIES = [
+    ("name", "", PROBE_NAME),
+    ("birth", PROBE_BIRTH, ""),
+    ("both", "1985", PROBE_NAME.split()[0]),
+    ("birth", "1950..1952", ""),
+    ("name", "", "zzzq"),
+    ("name", "", "er"),
+]
+
+
+def timed(func, repeat: int) -> tuple[float, list]:
+    """Bester von `repeat` Läufen in ms."""
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Bestandsverzeichnis (wird erzeugt, falls kein manifest.json da ist)")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=float, default=256)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(args.corpus, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    else:
+        manifest = generate_corpus(args.corpus, args.files, args.size_kb, seed=args.seed)
+    print(f"Bestand: {manifest['files']} Dateien, {manifest['total_bytes'] / (1024 * 1024):.1f} MB, "
+          f"{manifest['total_persons']:,} Personen")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bestand.tdsnap")
+        t0 = time.perf_counter()
+        stats = export_snapshot(args.corpus, path, jobs=args.jobs)
+        print(f"Export: {time.perf_counter() - t0:.1f} s, {stats['bytes'] / (1024 * 1024):.1f} MB "
+              f"({stats['bytes'] / manifest['total_bytes']:.1%} des Bestands)")
+
+        variants = [False] + ([True] if np is not None else [])
+        snapshots = {}
+        for use_numpy in variants:
+            t_load, snapshot = timed(lambda: Snapshot(path, use_numpy=use_numpy), 1)
+            snapshots[use_numpy] = snapshot
+            print(f"Laden ({'NumPy' if use_numpy else 'ohne NumPy'}): {t_load:.1f} ms")
+        if np is None:
+            print("(NumPy nicht installiert – nur array/memoryview)")
+
+        print(f"{'Abfrage':>28} {'Treffer':>8} {'xml ms':>9} " +
+              " ".join(f"{'numpy ms' if v else 'array ms':>9}" for v in variants) + f" {'Faktor':>7} {'identisch':>9}")
+        for query in QUERIES:
+            t_xml, expected = timed(lambda: list(search(args.corpus, *query, jobs=args.jobs)), 1)
+            times, same = [], True
+            for use_numpy in variants:
+                t_snap, hits = timed(lambda: snapshots[use_numpy].search(*query), args.repeat)
+                times.append(t_snap)
+                same = same and sorted(hits) == sorted(expected)
+            label = "/".join(part for part in query if part)
+            print(f"{label:>28} {len(expected):8d} {t_xml:9.0f} " + " ".join(f"{t:9.1f}" for t in times) +
+                  f" {t_xml / min(times):6.0f}x {'ja' if same else 'NEIN':>9}")
+        for snapshot in snapshots.values():
+            snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
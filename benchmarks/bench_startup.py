@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Startzeit der GUI (Truffledog_1.py) – braucht ein Display (unter Linux ohne X: xvfb-run).
+
+Jeder Lauf ist ein frischer Python-Prozess (kalte Imports wie beim Doppelklick). Gemessen, Median und Maximum:
+  import   – import Truffledog_1 (inkl. truffledog & Co.)
+  fenster  – ArchiveSearchApp() bis zum ersten Zeichnen (startup_times["fenster"])
+  bereit   – bis Bilder und tkcalendar nachgeladen sind (startup_times["bereit"])
+  resize   – --resizes Größenänderungen des Fensters hintereinander, bis alles verarbeitet ist
+             (entprellt: am Ende zählt nur die letzte)
+Mit --out schreibe ich die Werte als JSON, mit --compare vergleiche ich gegen so eine Datei.
+
+Aufruf:
+  xvfb-run python benchmarks/bench_startup.py --runs 10 --out /tmp/start.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS = ("import", "fenster", "bereit", "resize")
+
+
+def child(resizes: int) -> None:
+    """Ein Lauf im eigenen Prozess; gibt die Zeiten (s) als JSON-Zeile auf stdout aus."""
+    sys.path.insert(0, ROOT)
+    t0 = time.perf_counter()
+    import Truffledog_1  # noqa: E402
+    t_import = time.perf_counter() - t0
+
+    app = Truffledog_1.ArchiveSearchApp()
+    try:
+        deadline = time.perf_counter() + 30
+        while "bereit" not in app.startup_times:
+            if time.perf_counter() > deadline:
+                raise SystemExit("GUI wurde nicht innerhalb von 30 s bereit")
+            app.update()
+            time.sleep(0.001)
+
+        width, height = app.winfo_width(), app.winfo_height()
+        t0 = time.perf_counter()
+        for i in range(resizes):
+            app.geometry(f"{width + i % 40}x{height + i % 25}")
+            app.update()
+        while app._resize_job is not None:
+            app.update()
+            time.sleep(0.001)
+        t_resize = time.perf_counter() - t0
+        result = {"import": t_import, "fenster": app.startup_times["fenster"], "bereit": app.startup_times["bereit"],
+                  "resize": t_resize, "scaled": len(app._scaled_images)}
+    finally:
+        app._on_closing()
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--resizes", type=int, default=200)
+    parser.add_argument("--out", help="Ergebnisse als JSON schreiben")
+    parser.add_argument("--compare", help="gegen eine früher mit --out geschriebene Datei vergleichen")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.resizes)
+        return
+
+    runs: list[dict] = []
+    for _ in range(args.runs):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", "--resizes", str(args.resizes)],
+                              capture_output=True, text=True, cwd=ROOT)
+        if proc.returncode != 0:
+            print(proc.stderr.strip(), file=sys.stderr)
+            if "TclError" in proc.stderr:
+                print("Kein Display? Unter Linux ohne X: xvfb-run python benchmarks/bench_startup.py", file=sys.stderr)
+            raise SystemExit(1)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)["median_ms"]
+    print(f"{args.runs} Läufe, {args.resizes} Größenänderungen, {runs[-1]['scaled']} skalierte Bilder im Cache")
+    print(f"{'':>8} {'Median ms':>10} {'Max ms':>8}" + (f" {'vorher ms':>10} {'Faktor':>7}" if baseline else ""))
+    medians = {}
+    for metric in METRICS:
+        values = [run[metric] * 1000 for run in runs]
+        medians[metric] = statistics.median(values)
+        line = f"{metric:>8} {medians[metric]:10.1f} {max(values):8.1f}"
+        if baseline and metric in baseline:
+            line += f" {baseline[metric]:10.1f} {baseline[metric] / medians[metric]:6.2f}x"
+        print(line)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"runs": args.runs, "resizes": args.resizes, "median_ms": medians, "raw": runs}, fh, indent=2)
+        print(f"Ergebnisse geschrieben: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetischer Geschäftslisten-Bestand für Benchmarks – deterministisch über --seed.
+
+Schreibt namespaced XML im Format aus dem README (Geschaeftsliste/Personen/Person) und
+steuert dabei:
+  --files        Anzahl Dateien
+  --size-kb      Median der Dateigröße (log-normal verteilt, Streuung über --size-sigma)
+  --depth        Verzeichnistiefe (Dateien landen zufällig in Unterordnern bis zu dieser Tiefe)
+  --hit-rate     Anteil Personen, die auf die Probe-Abfrage passen
+  --malformed    Anteil kaputter Dateien (abgeschnitten mitten im XML)
+  --garbled      Anteil der kaputten Dateien, die statt abgeschnitten in der Mitte ein unmaskiertes "&"
+                 im Namen bekommen (der Rest bleibt intakt – für das tolerante Parsen, --recover)
+
+Neben den XML-Dateien liegt manifest.json mit Größen, Personenzahlen und der erwarteten
+Trefferzahl für die Probe (Name PROBE_NAME, Geburtsdatum PROBE_BIRTH) – so kann der
+Benchmark auch gleich die Korrektheit prüfen.
+
+Aufruf:
+  python benchmarks/corpus.py /tmp/bestand --files 500 --size-kb 256 --depth 3
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truffledog import NS  # noqa: E402
+
+PROBE_NAME = "Trüffel Treffer"
+PROBE_BIRTH = "1985-12-03"
+
+FIRST = ["Hans", "Anna", "Peter", "Maria", "Jürgen", "Ursula", "Karl", "Ruth", "Walter", "Verena",
+         "Fritz", "Elisabeth", "Heinrich", "Margrit", "Ernst", "Rosa", "Jakob", "Gertrud", "Otto", "Lina"]
+LAST = ["Muster", "Meier", "Müller", "Keller", "Huber", "Schneider", "Weber", "Brunner", "Baumann",
+        "Frei", "Zimmermann", "Gerber", "Moser", "Steiner", "Fischer", "Graf", "Wyss", "Kälin", "Bachmann"]
+
+
+def _random_birth(rnd: random.Random) -> str:
+    """Zufallsdatum, das nie das Probe-Datum ist (sonst stimmt die erwartete Trefferzahl nicht)."""
+    while True:
+        birth = f"{rnd.randrange(1900, 2020)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}"
+        if birth != PROBE_BIRTH:
+            return birth
+
+
+def write_liste(path: str, size_bytes: int, rnd: random.Random, hit_rate: float) -> tuple[int, int]:
+    """Schreibt eine Geschäftsliste mit ca. size_bytes; liefert (Personen, Probe-Treffer)."""
+    persons = hits = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fh.write(f'<Geschaeftsliste xmlns="{NS["ns"]}">\n  <Personen>\n')
+        while fh.tell() < size_bytes:
+            if rnd.random() < hit_rate:
+                name, birth = f"{rnd.choice(FIRST)} {PROBE_NAME}", PROBE_BIRTH
+                hits += 1
+            else:
+                name, birth = f"{rnd.choice(FIRST)} {rnd.choice(LAST)}", _random_birth(rnd)
+            fh.write(f"    <Person>\n      <Name>{name}</Name>\n      <Geburtsdatum>{birth}</Geburtsdatum>\n    </Person>\n")
+            persons += 1
+        fh.write("  </Personen>\n</Geschaeftsliste>\n")
+    return persons, hits
+
+
+def generate_corpus(out_dir: str, files: int = 200, size_kb: float = 256, size_sigma: float = 1.0,
+                    depth: int = 2, hit_rate: float = 0.001, malformed: float = 0.02, seed: int = 42,
+                    garbled: float = 0.0) -> dict:
+    """Erzeugt den Bestand und schreibt/liefert das Manifest."""
+    rnd = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    for i in range(files):
+        parts = [f"ordner_{rnd.randrange(4)}" for _ in range(rnd.randint(0, depth))]
+        folder = os.path.join(out_dir, *parts)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"liste_{i:06d}.xml")
+        # Log-normal um den Median: ein paar große Brocken, viele kleine – wie im echten Archiv.
+        size = max(1024, int(size_kb * 1024 * math.exp(rnd.gauss(0, size_sigma))))
+        persons, hits = write_liste(path, size, rnd, hit_rate)
+        broken = rnd.random() < malformed
+        garble = broken and garbled > 0 and rnd.random() < garbled
+        if garble:
+            with open(path, "r+b") as fh:
+                data = fh.read()
+                cut = data.find(b"<Name>", len(data) // 2) + len(b"<Name>")
+                fh.seek(cut)
+                fh.write(b"& " + data[cut:])
+        elif broken:
+            with open(path, "r+b") as fh:
+                fh.truncate(os.path.getsize(path) // 2)
+        if broken:
+            hits = 0  # kaputte Datei liefert (wie in der App, ohne --recover) keine Treffer
+        entries.append({"path": os.path.relpath(path, out_dir), "bytes": os.path.getsize(path),
+                        "persons": persons, "hits": hits, "malformed": broken, "garbled": garble})
+
+    manifest = {
+        "seed": seed, "files": files, "size_kb": size_kb, "size_sigma": size_sigma, "depth": depth,
+        "hit_rate": hit_rate, "malformed": malformed, "garbled": garbled,
+        "probe": {"name": PROBE_NAME, "birth": PROBE_BIRTH},
+        "total_bytes": sum(e["bytes"] for e in entries),
+        "total_persons": sum(e["persons"] for e in entries),
+        "expected_hits": sum(e["hits"] for e in entries),
+        "entries": entries,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=float, default=256)
+    parser.add_argument("--size-sigma", type=float, default=1.0)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--hit-rate", type=float, default=0.001)
+    parser.add_argument("--malformed", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--garbled", type=float, default=0.0)
+    args = parser.parse_args()
+    m = generate_corpus(args.out_dir, args.files, args.size_kb, args.size_sigma, args.depth,
+                        args.hit_rate, args.malformed, args.seed, args.garbled)
+    print(f"{m['files']} Dateien, {m['total_bytes'] / (1024 * 1024):.1f} MB, {m['total_persons']:,} Personen, "
+          f"{m['expected_hits']} erwartete Treffer → {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2597 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – Kern (ohne GUI)
+# -----------------------------------------------------------------------------
+# Alles, was sucht, parst und exportiert, lebt hier – ohne tkinter, PIL oder tkcalendar.
+# Die GUI (Truffledog_1.py) ist nur noch ein Aufrufer von vielen: Nachtjobs und Server
+# ohne Display nutzen dieselben Funktionen über die Kommandozeile oder als Bibliothek.
+# -----------------------------------------------------------------------------
+
+"""
+TruffleDog – Kern und Kommandozeile
+===================================
+
+Bibliothek (Generator-API):
+    import truffledog
+    for name, geburtsdatum, datei in truffledog.search("/archiv", "name", name_value="muster"):
+        ...
+
+Kommandozeile (Treffer gehen gestreamt nach stdout, Debug-Ausgaben nach stderr):
+    python truffledog.py search --birth 1985-12-03 --dir /archiv --format csv
+    python truffledog.py search --name muster --birth 1980..1985 --dir /archiv --jobs 8 --format jsonl
+
+--birth versteht dieselben Formen wie die GUI: "1985-12-03" (exakt), "1985", "1985-12",
+Zeiträume "1980..1985-06" (eine Seite darf fehlen).
+
+Anfrageliste (CSV: Name, Geburtsdatum) in einem Durchlauf, jeder Treffer mit seiner Anfrage:
+    python truffledog.py batch --queries liste.csv --dir /archiv > treffer.csv
+
+Wiederholte Abfragen aus dem Query-Cache (gültig, solange sich kein Pfad/mtime/Größe geändert hat):
+    python truffledog.py search --name muster --dir /archiv --cache
+
+Unscharf nach Namen (Meier = Meyer = Maier, Müller = Mueller, ein Tippfehler), auch mit --index:
+    python truffledog.py search --name meier --fuzzy --dir /archiv
+
+Eine Zeile je Person statt je Fundstelle (Name/Datum normalisiert, mit Anzahl und Dateien):
+    python truffledog.py search --birth 1985 --dir /archiv --group > personen.csv
+
+Bloom-Schnellfilter (schließt Dateien ohne Öffnen aus, siehe truffledog_bloom.py):
+    python truffledog.py bloom --dir /archiv
+
+Jeder Lauf hinterlässt ein JSON-Protokoll (Zähler, Stufenzeiten walk/filter/read/parse/match)
+in ~/.truffledog/runs/; mit --profile cprofile|tracemalloc zusätzlich ein Profil.
+
+Treffer in Archiven haben virtuelle Pfade ("lieferung.zip!/ordner/liste.xml"):
+    python truffledog.py cat "lieferung.zip!/ordner/liste.xml" > liste.xml
+"""
+
+import os
+import sys
+import re
+import mmap
+import codecs
+import gzip
+import shutil
+import tarfile
+import zipfile
+import zlib
+import hashlib
+import csv
+import json
+import time
+import datetime
+import unicodedata
+import functools
+import contextlib
+import queue
+import threading
+import argparse
+import multiprocessing
+import xml.etree.ElementTree as ET
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Namespace für die XML-Dateien (so sind die XPath-Find-Aufrufe robust).
+NS = {'ns': 'http://www.unisys.com/polis/staatsarchiv/geschaeftsliste'}
+
+# Such-Engine: "stream" (iterparse, flacher Speicher) oder "tree" (ET.parse, ganzer DOM).
+# Beide liefern exakt dieselben Treffer – "tree" bleibt als Referenz/Fallback drin.
+DEFAULT_ENGINE = "stream"
+
+# Parser-Backend der Personen (iter_persons): "auto" = das schnellste installierte aus PARSER_BACKENDS
+# (mit recover lxml, falls installiert), sonst fest "expat" (Stdlib, ohne Element-Objekte), "lxml"
+# (optional: pip install lxml) oder "etree" (iterparse – das ursprüngliche Verfahren, Referenz).
+# Alle liefern dieselben Personen.
+DEFAULT_PARSER = "auto"
+
+# Tolerant parsen: Personen einer kaputten Datei behalten, statt die ganze Datei zu verwerfen
+# (bis zum Fehler; lxml liest auch dahinter weiter). Aus = kaputte Datei liefert keine Treffer.
+DEFAULT_RECOVER = False
+
+# Anzahl Prozesse für die Suche. 1 = alles im aufrufenden Thread; mehr lohnt sich erst,
+# wenn genug Dateien da sind (der GIL lässt im Thread nur einen Kern parsen).
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Ab wie viel anstehender Arbeit search_files den Prozess-Pool startet (Dateien bzw. Bytes, falls der
+# Scanner die Größen kennt). Darunter bleibt es sequentiell – der Pool kostet beim Start (unter Windows
+# je Prozess ein neuer Interpreter) mehr, als er bei drei Dateien spart.
+PARALLEL_MIN_FILES = 16
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Byte-Vorfilter vor dem Parser (siehe Prefilter). False = jede Datei wird geparst (Referenz/Fehlersuche).
+DEFAULT_PREFILTER = True
+
+# Archive (.zip, .tar[.gz|.bz2|.xz], .tgz, .xml.gz) mitdurchsuchen – gestreamt, ohne Entpacken.
+DEFAULT_ARCHIVES = True
+
+# Pipeline: so viele gefundene Pfade puffert der Scanner höchstens, bevor er auf die Parser wartet.
+DISCOVERY_QUEUE_SIZE = 10_000
+
+# Spalten für Export und Anzeige – überall dieselbe Reihenfolge.
+COLUMNS = ("Name", "Geburtsdatum", "Datei")
+
+# Ab so vielen Treffern lagert ResultStore auf die Platte aus (temporäre SQLite-Datei); None = nie.
+RESULT_SPILL_ROWS = 500_000
+
+# Batch-Export: jede Zeile trägt die Anfrage mit, die getroffen hat (Nr. = Zeile in der Anfrageliste).
+BATCH_COLUMNS = ("Anfrage", "Anfrage Name", "Anfrage Geburtsdatum", "Name", "Geburtsdatum", "Datei")
+
+# Zusammengefasst (PersonGroups): eine Zeile je Person mit Anzahl Fundstellen und ihren Dateien –
+# im Export durch GROUP_FILE_SEP getrennt (Pfade enthalten kein "|", Windows verbietet es sogar).
+GROUP_COLUMNS = ("Name", "Geburtsdatum", "Fundstellen", "Dateien")
+GROUP_FILE_SEP = " | "
+
+# Unscharfe Namenssuche (FuzzyMatcher): höchstens so viele Tippfehler je Wort (Levenshtein),
+# und das erst ab Wörtern dieser Länge – bei "Li"/"Le" wäre ein Fehler schon ein anderer Name.
+# Der Index legt seine Löschnachbarn für genau diesen Abstand an (Änderung → Index neu aufbauen).
+FUZZY_MAX_DISTANCE = 1
+FUZZY_MIN_LENGTH = 4
+
+# Debug-Ausgaben an/aus. Die CLI schaltet sie ohne --verbose ab.
+VERBOSE = True
+
+# Meldungen pro Datei ("Verarbeite …", Parse-Fehler) höchstens so oft pro Sekunde – bei 100k Dateien
+# war die Konsolenausgabe selbst ein messbarer Teil der Laufzeit. Die Zahlen stehen im Laufprotokoll.
+DEBUG_FILE_RATE = 5.0
+
+# Laufprotokolle (JSON je Suche, siehe RunLog): Ablage und wie viele ich aufhebe.
+RUN_DIR = os.path.join(os.path.expanduser("~"), ".truffledog", "runs")
+RUN_KEEP = 200
+
+# Profiling je Lauf: None, "cprofile" oder "tracemalloc" (GUI: Umgebungsvariable TRUFFLEDOG_PROFILE).
+DEFAULT_PROFILE = os.environ.get("TRUFFLEDOG_PROFILE") or None
+
+
+def debug(msg: str) -> None:
+    """Kompakter Debug-Print mit Uhrzeit. Geht nach stderr, damit stdout den Treffern gehört."""
+    if not VERBOSE:
+        return
+    now = datetime.datetime.now().strftime("%H:%M:%S")
+    print(f"[{now}] {msg}", file=sys.stderr, flush=True)
+
+
+class _Throttle:
+    """debug() mit Ratenbegrenzung: was zu dicht kommt, wird nur gezählt und bei der nächsten Meldung erwähnt."""
+
+    def __init__(self, per_second: float) -> None:
+        self.interval = 1.0 / per_second
+        self.next_at = 0.0
+        self.suppressed = 0
+
+    def __call__(self, msg: str) -> None:
+        if not VERBOSE:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            self.suppressed += 1
+            return
+        self.next_at = now + self.interval
+        if self.suppressed:
+            msg = f"{msg} (+{self.suppressed} weitere Meldungen unterdrückt)"
+            self.suppressed = 0
+        debug(msg)
+
+
+debug_file = _Throttle(DEBUG_FILE_RATE)
+
+
+# -----------------------------------------------------------------------------
+# Datumsabfragen: exakt, Jahr, Jahr-Monat und Zeiträume
+# -----------------------------------------------------------------------------
+# Ein date_str ist entweder ein Teildatum ("1985", "1985-12", "1985-12-03") oder ein
+# Zeitraum "von..bis" aus solchen Teildaten (eine Seite darf leer sein: "1980..", "..1985-06").
+# Ein einzelnes volles Datum bleibt der alte exakte String-Vergleich – bewusst, damit sich
+# für bestehende Suchen nichts ändert.
+_PARTIAL_DATE = re.compile(r"^(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?$")
+_ISO_PREFIX = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+_SWISS_DATE = re.compile(r"^(\d{1,2})\.(\d{1,2})\.(\d{4})$")
+
+
+def _normalize_birth(value: str) -> str:
+    """Bringt ein Geburtsdatum auf YYYY-MM-DD ("" wenn es sich nicht deuten lässt).
+    Neben ISO (auch mit Zeitanteil) akzeptiere ich TT.MM.JJJJ – das kommt in Altbeständen vor."""
+    value = value.strip()
+    m = _ISO_PREFIX.match(value)
+    if m:
+        return m.group(0)
+    m = _SWISS_DATE.match(value)
+    if m:
+        return f"{m.group(3)}-{int(m.group(2)):02d}-{int(m.group(1)):02d}"
+    return ""
+
+
+def _partial_bounds(part: str, upper: bool) -> str:
+    """Unter- bzw. Obergrenze eines Teildatums als ISO-String ("1985-02" → 1985-02-01 / 1985-02-31).
+    Der 31. als Obergrenze ist für den String-Vergleich richtig, auch wenn es den Tag nicht gibt –
+    Monat und Tag der Eingabe selbst prüfe ich aber (1985-13 oder 1985-02-30 sind ein Tippfehler)."""
+    if not part:
+        return "9999-12-31" if upper else "0000-01-01"
+    m = _PARTIAL_DATE.match(part)
+    if not m:
+        raise ValueError(f"Ungültiges Datum in Abfrage: {part}")
+    year, month, day = m.groups()
+    try:
+        datetime.date(int(year), int(month or 1), int(day or 1))
+    except ValueError:
+        raise ValueError(f"Ungültiges Datum in Abfrage: {part}") from None
+    return f"{year}-{month or ('12' if upper else '01')}-{day or ('31' if upper else '01')}"
+
+
+@functools.lru_cache(maxsize=64)
+def _date_bounds(date_str: str) -> tuple[str, str] | None:
+    """(von, bis) für Teildatum/Zeitraum; None für ein einzelnes volles Datum (exakter Vergleich).
+    ValueError bei ungültigem Datum und bei einem Zeitraum, dessen Von nach dem Bis liegt."""
+    if ".." in date_str:
+        lo, hi = date_str.split("..", 1)
+        bounds = _partial_bounds(lo.strip(), False), _partial_bounds(hi.strip(), True)
+        if bounds[0] > bounds[1]:
+            raise ValueError(f"Ungültiger Zeitraum in Abfrage (von liegt nach bis): {date_str}")
+        return bounds
+    m = _PARTIAL_DATE.match(date_str)
+    if m and m.group(3):
+        _partial_bounds(date_str, False)  # nur prüfen
+        return None
+    return _partial_bounds(date_str, False), _partial_bounds(date_str, True)
+
+
+# -----------------------------------------------------------------------------
+# XML-Analyse
+# -----------------------------------------------------------------------------
+def get_engine(engine: str):
+    """Liefert die Suchfunktion zur Engine ("stream" oder "tree")."""
+    if engine == "tree":
+        return search_in_xml
+    if engine == "stream":
+        return search_in_xml_stream
+    raise ValueError(f"Unbekannte Such-Engine: {engine}")
+
+
+def person_matches(person_name: str, person_birth: str, search_type: str, date_str: str, name_value: str) -> bool:
+    """Filterlogik für eine Person – von beiden Engines geteilt, damit die Treffer identisch bleiben.
+    Datum: exakter String-Vergleich bei vollem Datum, sonst Bereich auf dem normalisierten Datum."""
+    if search_type == "name":
+        return name_value.lower() in person_name.lower()
+    if search_type not in ("birth", "both"):
+        return False
+    bounds = _date_bounds(date_str)
+    if bounds is None:
+        date_ok = person_birth == date_str
+    else:
+        birth = _normalize_birth(person_birth)
+        date_ok = bool(birth) and bounds[0] <= birth <= bounds[1]
+    if search_type == "birth":
+        return date_ok
+    return date_ok and name_value.lower() in person_name.lower()
+
+
+def _count_file(counts: dict | None, persons: int, t_match: float, parse_error: bool = False,
+                recovered: int = 0) -> None:
+    """Zähler einer Datei in counts (stats der Suche) übernehmen – counts=None: nichts zählen."""
+    if counts is None:
+        return
+    counts["persons"] += persons
+    counts["t_match"] += t_match
+    if parse_error:
+        counts["parse_errors"] += 1
+    if recovered:
+        counts["recovered"] += recovered
+
+
+def _parse_failed(file_path: str, counts: dict | None, persons: int, t_match: float, recover: bool) -> bool:
+    """
+    ParseError einer Datei protokollieren und zählen. Rückgabe True = Treffer bis zum Fehler behalten
+    (recover) – die Personen zählen dann als gerettet; sonst verwirft der Aufrufer die ganze Datei.
+    """
+    debug_file(f"Fehler beim Parsen der Datei: {file_path}")
+    _count_file(counts, persons, t_match, parse_error=True, recovered=persons if recover else 0)
+    return recover
+
+
+def search_in_xml(file_path: str, search_type: str, date_str: str, name_value: str,
+                  source=None, counts: dict | None = None, parser: str | None = None,
+                  recover: bool = False) -> list[tuple[str, str, str]]:
+    """
+    Durchsucht eine einzelne XML-Datei nach passenden Personen.
+    Entscheidendes Detail:
+    - Ich vergleiche das Geburtsdatum als exakten ISO-String (YYYY-MM-DD).
+    - Beim Namen reicht 'in' (Teiltreffer), case-insensitive.
+    - source: offener Binärstrom (z. B. Archiv-Mitglied); file_path ist dann nur der Name in den Treffern.
+    - counts: stats der Suche (Personen, Zeit im Abgleich, Parse-Fehler), optional.
+    - parser/recover nehme ich nur der gleichen Signatur wegen an: die Referenz parst immer mit
+      ET.parse und verwirft kaputte Dateien ganz.
+    """
+    found_entries: list[tuple[str, str, str]] = []
+    try:
+        tree = ET.parse(source if source is not None else file_path)
+    except ET.ParseError:
+        debug_file(f"Fehler beim Parsen der Datei: {file_path}")
+        _count_file(counts, 0, 0.0, parse_error=True)
+        return found_entries
+    root = tree.getroot()
+
+    # Ich greife Personen-Knoten über den Namespace 'ns' ab.
+    clock = time.perf_counter
+    t_match = 0.0
+    persons = root.findall('.//ns:Person', NS)
+    for person in persons:
+        name_node = person.find('ns:Name', NS)
+        birth_node = person.find('ns:Geburtsdatum', NS)
+        person_name = name_node.text if name_node is not None else ""
+        person_birth = birth_node.text if birth_node is not None else ""
+
+        t = clock()
+        hit = person_matches(person_name or "", person_birth or "", search_type, date_str, name_value)
+        t_match += clock() - t
+        if hit:
+            found_entries.append((person_name or "Unbekannt", person_birth or "", file_path))
+    _count_file(counts, len(persons), t_match)
+    return found_entries
+
+
+def _iter_persons_etree(file_path):
+    """
+    Backend "etree": iterparse mit Element-Objekten (das ursprüngliche Verfahren, Referenz).
+    - Jede Person wird beim 'end'-Event ausgewertet und danach verworfen.
+    - Alles außerhalb einer Person werfe ich ebenfalls sofort weg (clear + aus dem Parent lösen),
+      sonst würden leere Element-Hüllen bei großen Dateien trotzdem mitwachsen.
+    - Verschachtelte Personen puffere ich bis zum Ende der äußersten Person und sortiere sie
+      nach Startreihenfolge – so stimmt auch die Reihenfolge exakt mit findall('.//') überein.
+    """
+    person_tag = f"{{{NS['ns']}}}Person"
+    nested: list[tuple[int, tuple[str, str]]] = []  # (Startnummer, Person) innerhalb äußerer Person
+    stack: list[ET.Element] = []      # offene Elemente (für das Lösen aus dem Parent)
+    person_starts: list[int] = []     # Startnummern der offenen Personen
+    person_count = 0
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == person_tag:
+                person_starts.append(person_count)
+                person_count += 1
+            continue
+
+        stack.pop()
+        if elem.tag == person_tag:
+            order = person_starts.pop()
+            name_node = elem.find('ns:Name', NS)
+            birth_node = elem.find('ns:Geburtsdatum', NS)
+            person = (
+                (name_node.text if name_node is not None else "") or "",
+                (birth_node.text if birth_node is not None else "") or "",
+            )
+            if person_starts:
+                nested.append((order, person))
+            else:
+                # Äußerste Person fertig: sie kommt vor allen inneren (Dokumentreihenfolge).
+                yield person
+                if nested:
+                    yield from (p for _, p in sorted(nested))
+                    nested.clear()
+
+        if person_starts:
+            # Innerhalb einer offenen Person brauche ich den Teilbaum noch (Name/Geburtsdatum).
+            continue
+        elem.clear()
+        if stack:
+            parent = stack[-1]
+            if len(parent) and parent[-1] is elem:
+                del parent[-1]
+            else:
+                parent.remove(elem)
+
+
+# Parser-Backends, das schnellste zuerst (gemessen mit benchmarks/bench_parsers.py). Bei iterparse
+# kostet nicht expat, sondern das Bauen, Durchsuchen und Wegräumen der Element-Objekte in Python.
+# Die Target-Backends lesen Name und Geburtsdatum direkt aus den Parser-Callbacks (_PersonTarget) –
+# über ET.XMLParser (expat, Stdlib) bzw. lxml (libxml2). Gemessen gegen iterparse: expat ~2,8x,
+# lxml ~2,1x schneller (die Python-Callbacks dominieren, und die ruft lxml teurer auf). Dafür liest
+# lxml als einziges hinter einem Fehler weiter – "auto" nimmt es darum nur mit recover.
+PARSER_BACKENDS = ("expat", "lxml", "etree")
+
+# So viele Bytes füttere ich den Target-Parsern je read() (iterparse liest intern 16 KB).
+_PARSER_CHUNK = 64 * 1024
+
+_PERSON_TAG = f"{{{NS['ns']}}}Person"
+_NAME_TAG = f"{{{NS['ns']}}}Name"
+_BIRTH_TAG = f"{{{NS['ns']}}}Geburtsdatum"
+
+
+@functools.lru_cache(maxsize=None)
+def _lxml_etree():
+    """
+    lxml.etree oder None (optional – ohne lxml nimmt "auto" den schnellsten Parser der Stdlib).
+    Importiert wird erst, wenn wirklich jemand das Backend "lxml" nimmt: allein lxml.etree kostet
+    ~20 ms, und "import truffledog" soll schlank bleiben.
+    """
+    try:
+        from lxml import etree  # type: ignore
+    except ImportError:
+        return None
+    return etree
+
+
+def available_parsers() -> list[str]:
+    """Installierte Parser-Backends, das schnellste zuerst. Für lxml nur nachsehen, nicht importieren."""
+    import importlib.util
+    has_lxml = importlib.util.find_spec("lxml") is not None
+    return [name for name in PARSER_BACKENDS if name != "lxml" or has_lxml]
+
+
+def resolve_parser(parser: str | None = None, recover: bool = False) -> str:
+    """Backend-Name zu parser – None/"auto" heißt DEFAULT_PARSER bzw. das schnellste installierte,
+    mit recover lxml, falls installiert (nur lxml liest hinter einem Fehler weiter)."""
+    parser = parser or DEFAULT_PARSER
+    if parser == "auto":
+        installed = available_parsers()
+        return "lxml" if recover and "lxml" in installed else installed[0]
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unbekannter Parser: {parser}")
+    if parser not in available_parsers():
+        raise ValueError(f"Parser {parser} ist nicht installiert (pip install {parser})")
+    return parser
+
+
+class _PersonTarget:
+    """
+    Parser-Target (ET.XMLParser bzw. lxml): sammelt (Name, Geburtsdatum) aus den Callbacks, ohne
+    Element-Objekte. Dieselbe Semantik wie find() im Element-Baum:
+    - Name/Geburtsdatum = erstes direktes Kind dieses Namens, Text bis zu dessen erstem Kind-Element (.text).
+    - Verschachtelte Personen kommen nach der äußeren, in Startreihenfolge (wie findall('.//')).
+    Fertige Personen hängen in persons; der Aufrufer holt sie nach jedem feed() ab.
+    Die Callbacks laufen für jedes Element – darum so wenig Attribut-Zugriffe wie möglich.
+    """
+
+    def __init__(self) -> None:
+        self.persons: list[tuple[str, str]] = []
+        self._depth = 0
+        self._child_depth = -1           # Tiefe der direkten Kinder der innersten offenen Person
+        self._open: list[list] = []      # offene Personen: [Startnummer, Kind-Tiefe, Name, Geburtsdatum]
+        self._nested: list[tuple[int, tuple[str, str]]] = []
+        self._count = 0
+        self._field: list | None = None  # offene Person, deren Feld gerade Text sammelt
+        self._slot = 0
+        self._text: list[str] = []
+
+    def start(self, tag: str, attrib) -> None:
+        if self._field is not None:
+            self._end_field()  # .text endet am ersten Kind-Element
+        depth = self._depth = self._depth + 1
+        if tag == _PERSON_TAG:
+            self._open.append([self._count, depth + 1, None, None])
+            self._child_depth = depth + 1
+            self._count += 1
+        elif depth == self._child_depth:
+            slot = 2 if tag == _NAME_TAG else 3 if tag == _BIRTH_TAG else 0
+            if slot and self._open[-1][slot] is None:
+                self._field, self._slot = self._open[-1], slot
+                self._text = []
+
+    def data(self, text: str) -> None:
+        if self._field is not None:
+            self._text.append(text)
+
+    def end(self, tag: str) -> None:
+        self._depth -= 1
+        if self._field is not None:
+            self._end_field()
+        if tag != _PERSON_TAG:
+            return
+        opened = self._open
+        order, _, name, birth = opened.pop()
+        person = (name or "", birth or "")
+        if opened:
+            self._child_depth = opened[-1][1]
+            self._nested.append((order, person))
+            return
+        # Äußerste Person fertig: sie kommt vor allen inneren (Dokumentreihenfolge).
+        self._child_depth = -1
+        self.persons.append(person)
+        if self._nested:
+            self.persons.extend(p for _, p in sorted(self._nested))
+            self._nested.clear()
+
+    def _end_field(self) -> None:
+        self._field[self._slot] = "".join(self._text)
+        self._field = None
+
+    def close(self) -> None:
+        return None
+
+
+def _iter_persons_target(file_path, use_lxml: bool, recover: bool):
+    """
+    Backends "expat" und "lxml": die Datei blockweise in den Parser füttern und nach jedem Block
+    die fertigen Personen liefern – der Speicher bleibt flach wie bei iterparse.
+    - Fehler kommen als ET.ParseError (auch von lxml), die Personen davor sind dann schon geliefert.
+    - recover (nur lxml): libxml2 liest über Fehler hinweg weiter; den ParseError werfe ich dann erst
+      am Ende, damit der Aufrufer die Datei trotzdem als kaputt zählt.
+    """
+    target = _PersonTarget()
+    lxml_etree = _lxml_etree() if use_lxml else None
+    if lxml_etree is not None:
+        # huge_tree: keine Grenzen für Tiefe und Textlänge – die hat ET auch nicht.
+        parser = lxml_etree.XMLParser(target=target, recover=recover, huge_tree=True)
+        errors = (lxml_etree.XMLSyntaxError, ET.ParseError)
+    else:
+        parser = ET.XMLParser(target=target)
+        errors = (ET.ParseError,)
+    persons = target.persons
+    opened = open(file_path, "rb") if isinstance(file_path, (str, os.PathLike)) else None
+    fh = opened or file_path
+    try:
+        while True:
+            chunk = fh.read(_PARSER_CHUNK)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            if persons:
+                yield from persons
+                persons.clear()
+        parser.close()
+    except errors as e:
+        yield from persons
+        if isinstance(e, ET.ParseError):
+            raise
+        raise ET.ParseError(str(e)) from e
+    finally:
+        if opened is not None:
+            opened.close()
+    yield from persons
+    if lxml_etree is not None and recover:
+        log = [entry for entry in parser.feed_error_log if entry.level >= lxml_etree.ErrorLevels.ERROR]
+        if log:
+            raise ET.ParseError(f"{len(log)} Fehler übergangen, zuerst: {log[0].message} (Zeile {log[0].line})")
+
+
+def iter_persons(file_path, parser: str | None = None, recover: bool = False):
+    """
+    Liefert (Name, Geburtsdatum) jeder Person einer Datei (Pfad oder Binärstrom) – streamend, der
+    Speicher bleibt flach. Fehlende Knoten/Texte kommen als "" zurück.
+    - parser: Backend aus PARSER_BACKENDS, None/"auto" = das schnellste installierte. Alle liefern
+      dieselben Personen in derselben Reihenfolge.
+    - ET.ParseError geht an den Aufrufer (der entscheidet, was mit der Datei passiert); die Personen
+      bis zum Fehler sind dann schon geliefert.
+    - recover: mit lxml über Fehler hinweg weiterlesen (der ParseError kommt dann am Ende);
+      die Stdlib-Backends können das nicht, dort endet die Datei am Fehler.
+    """
+    backend = resolve_parser(parser, recover)
+    if backend == "etree":
+        return _iter_persons_etree(file_path)
+    return _iter_persons_target(file_path, backend == "lxml", recover)
+
+
+def search_in_xml_stream(file_path: str, search_type: str, date_str: str, name_value: str,
+                         source=None, counts: dict | None = None, parser: str | None = None,
+                         recover: bool = False) -> list[tuple[str, str, str]]:
+    """Wie search_in_xml, aber streamend über iter_persons (Parser-Backend parser).
+    Parse-Fehler verwerfen die ganze Datei – mit recover bleiben die Treffer bis zum Fehler."""
+    found_entries: list[tuple[str, str, str]] = []
+    clock = time.perf_counter
+    persons = 0
+    t_match = 0.0
+    try:
+        for person_name, person_birth in iter_persons(source if source is not None else file_path, parser, recover):
+            persons += 1
+            t = clock()
+            hit = person_matches(person_name, person_birth, search_type, date_str, name_value)
+            t_match += clock() - t
+            if hit:
+                found_entries.append((person_name or "Unbekannt", person_birth, file_path))
+    except ET.ParseError:
+        return found_entries if _parse_failed(file_path, counts, persons, t_match, recover) else []
+    _count_file(counts, persons, t_match)
+    return found_entries
+
+
+# -----------------------------------------------------------------------------
+# Byte-Vorfilter (vor dem XML-Parser)
+# -----------------------------------------------------------------------------
+# Die allermeisten Dateien enthalten keinen Treffer, kosten aber trotzdem einen vollen Parse.
+# Der Vorfilter mappt jede Datei per mmap und sucht Datum bzw. Namen direkt in den Bytes;
+# nur Kandidaten gehen an den Parser. Oberstes Gebot: keine falsch Negativen. Darum:
+# - Name: jedes Zeichen darf in jeder Schreibweise stehen, deren lower() es enthält (auch K→k
+#   über das Kelvin-Zeichen), kodiert in der Datei-Kodierung oder als &#…;/&#x…;/&amp; usw.
+# - Datum: der ISO-String bzw. (Jahr/Zeitraum) eine passende Jahreszahl; mit &#… im File → parsen.
+# - Alles, was einen Text aus nicht zusammenhängenden Bytes zusammensetzen kann (Kommentare,
+#   CDATA, Processing Instructions, eigene Entities), macht die Datei zum Kandidaten.
+# - Unbekannte oder nicht ASCII-kompatible Kodierungen (UTF-16 …) werden immer geparst.
+_XML_ENCODING = re.compile(rb"""^<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z][A-Za-z0-9._-]*)["']""")
+_SPLIT_MARKERS = (b"<!--", b"<![CDATA[", b"<!ENTITY", b"<?")
+_NAMED_ENTITIES = {"&": b"&amp;", "<": b"&lt;", ">": b"&gt;", '"': b"&quot;", "'": b"&apos;"}
+_LOWER_SOURCES: dict[str, tuple[str, ...]] | None = None
+_MAX_PREFILTER_YEARS = 300
+# Alle Code Points mit x.lower() != x (Unicode-Stand _CASED_UNIDATA), als Hex-Bereiche "von-bis",
+# "/2" = jeder zweite. Damit baue ich die Umkehrtabelle aus ~1.400 statt 1,1 Mio. Zeichen – der
+# volle Durchlauf kostete ~115 ms bei jeder ersten Namenssuche. Passt die Unicode-Version des
+# Interpreters nicht, laufe ich wie früher über alle Code Points (keine falsch Negativen).
+_CASED_UNIDATA = "14.0.0"
+_CASED_CODEPOINTS = (
+    "41-5a c0-d6 d8-de 100-136/2 139-147/2 14a-178/2 179-17d/2 181-182 184-186/2 187-189/2 18a-18b "
+    "18e-191 193-194 196-198 19c-19d 19f-1a0 1a2-1a6/2 1a7-1a9/2 1ac-1ae/2 1af-1b1/2 1b2-1b3 "
+    "1b5-1b7/2 1b8 1bc 1c4-1c5 1c7-1c8 1ca-1cb 1cd-1db/2 1de-1ee/2 1f1-1f2 1f4-1f6/2 1f7-1f8 "
+    "1fa-232/2 23a-23b 23d-23e 241-243/2 244-246 248-24e/2 370-372/2 376 37f 386-388/2 389-38a "
+    "38c-38e/2 38f-391/2 392-3a1 3a3-3ab 3cf 3d8-3ee/2 3f4 3f7-3f9/2 3fa 3fd-42f 460-480/2 48a-4c0/2 "
+    "4c1-4cd/2 4d0-52e/2 531-556 10a0-10c5 10c7 10cd 13a0-13f5 1c90-1cba 1cbd-1cbf 1e00-1e94/2 "
+    "1e9e-1efe/2 1f08-1f0f 1f18-1f1d 1f28-1f2f 1f38-1f3f 1f48-1f4d 1f59-1f5f/2 1f68-1f6f 1f88-1f8f "
+    "1f98-1f9f 1fa8-1faf 1fb8-1fbc 1fc8-1fcc 1fd8-1fdb 1fe8-1fec 1ff8-1ffc 2126 212a-212b 2132 "
+    "2160-216f 2183 24b6-24cf 2c00-2c2f 2c60-2c62/2 2c63-2c64 2c67-2c6d/2 2c6e-2c70 2c72 2c75 "
+    "2c7e-2c80 2c82-2ce2/2 2ceb-2ced/2 2cf2 a640-a66c/2 a680-a69a/2 a722-a72e/2 a732-a76e/2 "
+    "a779-a77d/2 a77e-a786/2 a78b-a78d/2 a790-a792/2 a796-a7aa/2 a7ab-a7ae a7b0-a7b4 a7b6-a7c4/2 "
+    "a7c5-a7c7 a7c9 a7d0 a7d6-a7d8/2 a7f5 ff21-ff3a 10400-10427 104b0-104d3 10570-1057a 1057c-1058a "
+    "1058c-10592 10594-10595 10c80-10cb2 118a0-118bf 16e40-16e5f 1e900-1e921 "
+)
+
+
+def _cased_codepoints():
+    """Kandidaten für _lower_sources: die Code Points aus _CASED_CODEPOINTS bzw. alle (andere Unicode-Version)."""
+    if unicodedata.unidata_version != _CASED_UNIDATA:
+        return range(sys.maxunicode + 1)
+    codepoints: list[int] = []
+    for token in "".join(_CASED_CODEPOINTS).split():
+        span, _, step = token.partition("/")
+        first, _, last = span.partition("-")
+        codepoints.extend(range(int(first, 16), int(last or first, 16) + 1, int(step or 1)))
+    return codepoints
+
+
+def _lower_sources(c: str) -> tuple[str, ...]:
+    """Alle Zeichen X, deren lower() das Zeichen c enthält (c selbst inklusive). Tabelle einmal je Prozess."""
+    global _LOWER_SOURCES
+    if _LOWER_SOURCES is None:
+        # str.lower() ist kontextabhängig: Σ am Wortende wird ς (Final Sigma) – zeichenweise sieht man das nicht.
+        table: dict[str, list[str]] = {"ς": ["Σ"]}
+        for i in _cased_codepoints():
+            x = chr(i)
+            low = x.lower()
+            if low != x:
+                for ch in low:
+                    table.setdefault(ch, []).append(x)
+        _LOWER_SOURCES = {ch: tuple(xs) for ch, xs in table.items()}
+    return (c,) + _LOWER_SOURCES.get(c, ())
+
+
+def _char_ref_pattern(ch: str) -> bytes:
+    """Regex für die Zeichenreferenzen eines Zeichens: &#228; / &#xE4; (führende Nullen erlaubt)."""
+    hex_digits = "".join(f"[{d}{d.upper()}]" if d.isalpha() else d for d in f"{ord(ch):x}")
+    return f"&#0*{ord(ch)};|&#x0*{hex_digits};".encode("ascii")
+
+
+def _year_pattern(lo: str, hi: str) -> re.Pattern | None:
+    """Regex für alle Jahreszahlen lo..hi (nach Jahrzehnten gruppiert); None bei zu großem Bereich."""
+    first, last = int(lo[:4]), int(hi[:4])
+    if last - first >= _MAX_PREFILTER_YEARS:
+        return None
+    decades: dict[str, str] = {}
+    for year in range(first, last + 1):
+        decades[f"{year:04d}"[:3]] = decades.get(f"{year:04d}"[:3], "") + str(year % 10)
+    return re.compile("|".join(f"{dec}[{digits}]" for dec, digits in decades.items()).encode("ascii"))
+
+
+def _file_encoding(head: bytes) -> str | None:
+    """Kodierung aus BOM/XML-Deklaration – nur ASCII-kompatible, sonst None (= immer parsen)."""
+    if head.startswith(b"\xef\xbb\xbf"):
+        head = head[3:]
+    elif head[:2] in (b"\xff\xfe", b"\xfe\xff") or b"\x00" in head[:4]:
+        return None
+    m = _XML_ENCODING.match(head)
+    try:
+        codec = codecs.lookup(m.group(1).decode("ascii") if m else "utf-8").name
+    except LookupError:
+        return None
+    if codec in ("utf-8", "ascii") or codec.startswith("iso8859-") or re.fullmatch(r"cp125\d", codec):
+        return codec
+    return None
+
+
+class Prefilter:
+    """
+    Byte-Vorfilter für eine Abfrage. may_match(path) ist False nur, wenn die Datei sicher keinen
+    Treffer enthält. Das Objekt ist picklebar und geht so unverändert an die Pool-Worker
+    (die Zeichentabelle für den Namen wird nur im Elternprozess gebaut).
+    - active = False → die Abfrage lässt sich nicht vorfiltern (z. B. offener Zeitraum), alles wird geparst.
+    """
+
+    def __init__(self, search_type: str, date_str: str, name_value: str) -> None:
+        self.date_literal: bytes | None = None
+        self.date_years: re.Pattern | None = None
+        self.needle_sources: tuple[tuple[str, ...], ...] | None = None
+        self._name_patterns: dict[tuple[str, bool], re.Pattern] = {}
+
+        if search_type in ("birth", "both"):
+            bounds = _date_bounds(date_str)
+            if bounds is None:
+                self.date_literal = date_str.encode("ascii", "replace")
+            else:
+                self.date_years = _year_pattern(*bounds)
+        needle = name_value.lower()
+        if search_type in ("name", "both") and needle and "\r" not in needle and "\n" not in needle \
+                and "\u0307" not in needle:  # U+0307 entsteht auch aus İ.lower() – dann lieber parsen
+            self.needle_sources = tuple(_lower_sources(c) for c in needle)
+
+        date_needed = search_type in ("birth", "both")
+        name_needed = search_type in ("name", "both")
+        self.active = ((not date_needed or self.date_literal is not None or self.date_years is not None)
+                       and (not name_needed or self.needle_sources is not None)
+                       and (date_needed or name_needed))
+
+    def _name_pattern(self, encoding: str, with_refs: bool) -> re.Pattern:
+        """Regex für den Namen in einer Kodierung; Referenz-Alternativen nur, wenn die Datei '&' enthält."""
+        key = (encoding, with_refs)
+        if key not in self._name_patterns:
+            parts = []
+            for sources in self.needle_sources:
+                raw = set()
+                for x in sources:
+                    try:
+                        raw.add(re.escape(x.encode(encoding)))
+                    except UnicodeEncodeError:
+                        pass  # in dieser Kodierung nur als Referenz möglich
+                alts = sorted(raw)
+                if with_refs:
+                    alts += [_char_ref_pattern(x) for x in sources]
+                    alts += [_NAMED_ENTITIES[x] for x in sources if x in _NAMED_ENTITIES]
+                parts.append(b"(?:" + b"|".join(alts) + b")" if alts else b"(?!)")
+            self._name_patterns[key] = re.compile(b"".join(parts))
+        return self._name_patterns[key]
+
+    def may_match(self, file_path: str) -> bool:
+        try:
+            with open(file_path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return True  # leere Datei: der Parser meldet den Fehler wie bisher
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._scan(mm)
+        except (OSError, ValueError):
+            return True  # im Zweifel parsen – der Parser meldet den eigentlichen Fehler
+
+    def _scan(self, mm: mmap.mmap) -> bool:
+        head = mm[:512]
+        encoding = _file_encoding(head)
+        if encoding is None:
+            return True
+        has_refs = mm.find(b"&") != -1
+
+        date_ok = True
+        if self.date_literal is not None:
+            date_ok = mm.find(self.date_literal) != -1
+        elif self.date_years is not None:
+            date_ok = self.date_years.search(mm) is not None
+        if not date_ok and has_refs and mm.find(b"&#") != -1:
+            date_ok = True  # Ziffern als Zeichenreferenz – selten, aber erlaubt
+
+        name_ok = True
+        if date_ok and self.needle_sources is not None:
+            name_ok = self._name_pattern(encoding, has_refs).search(mm) is not None
+
+        if date_ok and name_ok:
+            return True
+        # Kein zusammenhängender Fund – könnte der Text über Kommentar/CDATA/PI zerstückelt sein?
+        start = head.find(b"?>") + 2 if head.lstrip(b"\xef\xbb\xbf").startswith(b"<?xml") else 0
+        return any(mm.find(marker, max(start, 0)) != -1 for marker in _SPLIT_MARKERS)
+
+
+# -----------------------------------------------------------------------------
+# Archive: XML-Mitglieder direkt aus dem Entpack-Strom parsen
+# -----------------------------------------------------------------------------
+# Lieferungen kommen gepackt. Statt sie erst auszupacken, lese ich jedes *.xml-Mitglied direkt
+# aus dem Dekompressions-Strom (zip: zf.open, tar: Streaming-Modus "r|*", gz: gzip.open) –
+# auf der Platte landet nichts, der Speicher bleibt beim Stream-Parser flach.
+# Treffer tragen einen virtuellen Pfad: "lieferung.zip!/ordner/liste.xml".
+# Der Byte-Vorfilter greift hier nicht (kein mmap auf einen Strom) – Mitglieder werden immer geparst.
+ARCHIVE_SEP = "!/"
+_ARCHIVE_SUFFIXES = (".zip", ".tar", ".tgz", ".tar.gz", ".tar.bz2", ".tar.xz", ".xml.gz")
+_ARCHIVE_ERRORS = (OSError, EOFError, RuntimeError, zipfile.BadZipFile, tarfile.TarError, zlib.error)
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(_ARCHIVE_SUFFIXES)
+
+
+def split_virtual_path(path: str) -> tuple[str, str] | None:
+    """'a.zip!/x/y.xml' → ('a.zip', 'x/y.xml'); normale Pfade → None.
+    Ein '!/' zählt nur hinter einem Archivnamen (Ordner dürfen ein '!' im Namen haben)."""
+    start = 0
+    while (idx := path.find(ARCHIVE_SEP, start)) != -1:
+        if is_archive(path[:idx]):
+            return path[:idx], path[idx + len(ARCHIVE_SEP):]
+        start = idx + 1
+    return None
+
+
+def iter_archive_members(archive_path: str):
+    """
+    Liefert (Mitgliedsname, Binärstrom) für jedes *.xml im Archiv, der Reihe nach.
+    Den Strom muss der Aufrufer vor dem nächsten Mitglied fertig lesen (tar ist ein reiner Strom).
+    """
+    lower = archive_path.lower()
+    if lower.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(".xml"):
+                    with zf.open(info) as fh:
+                        yield info.filename, fh
+    elif lower.endswith(".xml.gz"):
+        with gzip.open(archive_path, "rb") as fh:
+            yield os.path.basename(archive_path)[:-3], fh
+    else:
+        with tarfile.open(archive_path, "r|*") as tf:
+            for member in tf:
+                if member.isfile() and member.name.lower().endswith(".xml"):
+                    fh = tf.extractfile(member)
+                    if fh is not None:
+                        with fh:
+                            yield member.name, fh
+
+
+def search_in_archive(archive_path: str, search_type: str, date_str: str, name_value: str,
+                      engine: str = DEFAULT_ENGINE, matcher=None, counts: dict | None = None,
+                      progress=None, parser: str | None = None, recover: bool = False) -> list[tuple]:
+    """
+    Durchsucht alle XML-Mitglieder eines Archivs mit der gewählten Engine (bzw. dem BatchMatcher).
+    Parse-Fehler verwerfen (wie bei Dateien) nur das Mitglied; ist das Archiv selbst kaputt,
+    behalte ich die Treffer bis dahin und protokolliere den Rest.
+    counts: wie bei den Engines; gelesene Bytes sind hier die entpackten.
+    progress: nur für den Abbruch (SearchCancelled) – den Fortschritt bucht _search_one am Ende.
+    parser/recover: Parser-Backend und tolerantes Parsen je Mitglied (wie bei den Engines).
+    """
+    func = get_engine(engine)
+    found: list[tuple] = []
+    try:
+        for member, fh in iter_archive_members(archive_path):
+            virtual = f"{archive_path}{ARCHIVE_SEP}{member}"
+            source = _CountingReader(fh, counts, progress, track=False) if counts is not None else fh
+            if matcher is not None:
+                found.extend(matcher.search_file(virtual, source=source, counts=counts, parser=parser, recover=recover))
+            else:
+                found.extend(func(virtual, search_type, date_str, name_value, source=source, counts=counts,
+                                  parser=parser, recover=recover))
+    except _ARCHIVE_ERRORS as e:
+        debug_file(f"Archiv nicht (vollständig) lesbar: {archive_path}: {e}")
+    return found
+
+
+def copy_virtual(path: str, out) -> None:
+    """Kopiert eine Datei oder ein Archiv-Mitglied (virtueller Pfad) in den Binärstrom out."""
+    parts = split_virtual_path(path)
+    if parts is None:
+        with open(path, "rb") as fh:
+            shutil.copyfileobj(fh, out)
+        return
+    archive_path, wanted = parts
+    for member, fh in iter_archive_members(archive_path):
+        if member == wanted:
+            shutil.copyfileobj(fh, out)
+            return
+    raise FileNotFoundError(f"Nicht im Archiv: {path}")
+
+
+# -----------------------------------------------------------------------------
+# Batch-Abfragen: viele (Name, Geburtsdatum)-Anfragen in einem Durchlauf
+# -----------------------------------------------------------------------------
+# Listen mit 500 Personen hiessen bisher 500 komplette Durchläufe. Der BatchMatcher prüft jede
+# Person einmal gegen alle Anfragen: Namen über einen Aho-Corasick-Automaten (alle Teilstrings
+# in einem Lauf über den Namen), Daten über Hash-Tabellen (exakt, Jahr-Monat, Jahr).
+# Die Laufzeit wächst damit mit dem Bestand, nicht mit Anfragen × Bestand.
+class AhoCorasick:
+    """Aho-Corasick-Automat: find(text) liefert die Nummern aller Muster, die in text vorkommen."""
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[int]] = [[]]
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(idx)
+        # Fehlerkanten in Breitensuche: längster echter Suffix, der auch Präfix eines Musters ist.
+        pending = deque(self.goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self.goto[node].items():
+                pending.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        found: set[int] = set()
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+def read_batch_queries(fh) -> list[tuple[str, str]]:
+    """
+    Liest die Anfrageliste (CSV mit Name und Geburtsdatum; Trenner , ; oder Tab, Kopfzeile optional).
+    Datum: leer, JJJJ-MM-TT, JJJJ, JJJJ-MM oder TT.MM.JJJJ – Zeiträume gehen im Batch nicht.
+    Fehler melde ich mit Zeilennummer als ValueError.
+    """
+    sample = fh.read(4096)
+    fh.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    queries: list[tuple[str, str]] = []
+    for line_no, row in enumerate(csv.reader(fh, dialect), start=1):
+        cells = [c.strip() for c in row] + ["", ""]
+        name, birth = cells[0], cells[1]
+        if not name and not birth:
+            continue
+        if line_no == 1 and (name.lower() == "name" or birth.lower() in ("geburtsdatum", "birth", "birthdate")):
+            continue  # Kopfzeile
+        m = _SWISS_DATE.match(birth)
+        if m:
+            birth = f"{m.group(3)}-{int(m.group(2)):02d}-{int(m.group(1)):02d}"
+        if birth and (".." in birth or not _PARTIAL_DATE.match(birth)):
+            raise ValueError(f"Zeile {line_no}: ungültiges Geburtsdatum '{birth}' (Zeiträume gehen im Batch nicht)")
+        if birth:
+            try:
+                _date_bounds(birth)
+            except ValueError:
+                raise ValueError(f"Zeile {line_no}: ungültiges Geburtsdatum '{birth}'") from None
+        queries.append((name, birth))
+    return queries
+
+
+class BatchMatcher:
+    """
+    Prüft Personen gegen viele Anfragen gleichzeitig – Semantik je Anfrage wie person_matches:
+    Name als Teilstring (case-insensitive), volles Datum als exakter String, Jahr/Monat als Bereich.
+    Picklebar (reine Dicts/Listen), geht so auch an die Pool-Worker.
+    """
+
+    # Abfrage für Vorfilter/Bloom (search_type, date_str, name_value) – viele Anfragen: keine.
+    prefilter = None
+
+    def __init__(self, queries: list[tuple[str, str]]) -> None:
+        self.queries = queries
+        needles: dict[str, list[int]] = {}
+        self.exact: dict[str, list[int]] = {}
+        self.partial: dict[str, list[int]] = {}  # "1985" bzw. "1985-12" → Anfragen
+        self.bounds: dict[int, tuple[str, str]] = {}
+        for qid, (name, birth) in enumerate(queries):
+            if name:
+                needles.setdefault(name.lower(), []).append(qid)
+            if birth:
+                bounds = _date_bounds(birth)
+                if bounds is None:
+                    self.exact.setdefault(birth, []).append(qid)
+                else:
+                    self.partial.setdefault(birth, []).append(qid)
+                    self.bounds[qid] = bounds
+        self.patterns = list(needles)
+        self.pattern_queries = [needles[p] for p in self.patterns]
+        self.automaton = AhoCorasick(self.patterns) if self.patterns else None
+
+    def match(self, person_name: str, person_birth: str) -> list[int]:
+        """Nummern aller Anfragen, die auf diese Person passen (aufsteigend)."""
+        dated: set[int] = set(self.exact.get(person_birth, ()))
+        if self.partial:
+            norm = _normalize_birth(person_birth)
+            if norm:
+                for key in (norm[:4], norm[:7]):
+                    for qid in self.partial.get(key, ()):
+                        lo, hi = self.bounds[qid]
+                        if lo <= norm <= hi:
+                            dated.add(qid)
+        hits = {qid for qid in dated if not self.queries[qid][0]}
+        if self.automaton is not None:
+            for pid in self.automaton.find(person_name.lower()):
+                for qid in self.pattern_queries[pid]:
+                    if not self.queries[qid][1] or qid in dated:
+                        hits.add(qid)
+        return sorted(hits)
+
+    def search_file(self, file_path: str, source=None, counts: dict | None = None, parser: str | None = None,
+                    recover: bool = False) -> list[tuple]:
+        """Eine Datei (oder ein Archiv-Mitglied) in einem Parse-Durchlauf gegen alle Anfragen prüfen.
+        Zeilen wie BATCH_COLUMNS. Parse-Fehler verwerfen – wie bei der Einzelsuche – die ganze Datei
+        (mit recover bleiben die Zeilen bis zum Fehler)."""
+        rows: list[tuple] = []
+        clock = time.perf_counter
+        persons = 0
+        t_match = 0.0
+        try:
+            for person_name, person_birth in iter_persons(source if source is not None else file_path,
+                                                          parser, recover):
+                persons += 1
+                t = clock()
+                for qid in self.match(person_name, person_birth):
+                    q_name, q_birth = self.queries[qid]
+                    rows.append((qid + 1, q_name, q_birth, person_name or "Unbekannt", person_birth, file_path))
+                t_match += clock() - t
+        except ET.ParseError:
+            return rows if _parse_failed(file_path, counts, persons, t_match, recover) else []
+        _count_file(counts, persons, t_match)
+        return rows
+
+
+# -----------------------------------------------------------------------------
+# Unscharfe Namenssuche (Kölner Phonetik + Tippfehler)
+# -----------------------------------------------------------------------------
+# Im Bestand steht derselbe Mensch als Meier, Meyer und Maier oder als Müller und Mueller.
+# Verglichen wird wortweise auf normalisierten Wörtern (klein, ä→ae, ö→oe, ü→ue, ß→ss, Akzente weg):
+# ein Suchwort passt auf ein Namenswort, wenn beide gleich sind, denselben Kölner-Phonetik-Code
+# haben oder (ab FUZZY_MIN_LENGTH) höchstens FUZZY_MAX_DISTANCE Tippfehler auseinanderliegen.
+# Ein Name passt, wenn jedes Suchwort auf eines seiner Wörter passt – oder wie bei der normalen
+# Suche als Teilstring (unscharf findet nie weniger als scharf). Der Index (truffledog_index)
+# rechnet Codes und Löschnachbarn einmal je Wort vor und liefert exakt dieselben Treffer.
+_NAME_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NAME_WORD = re.compile(r"[^\W\d_]+")
+
+
+def name_words(name: str) -> list[str]:
+    """Normalisierte Wörter eines Namens ("Müller-Lüdenscheidt, Hans" → mueller, luedenscheidt, hans)."""
+    folded = name.lower().translate(_NAME_FOLD)
+    if not folded.isascii():
+        folded = "".join(c for c in unicodedata.normalize("NFKD", folded) if not unicodedata.combining(c))
+    return _NAME_WORD.findall(folded)
+
+
+def koelner_phonetik(word: str) -> str:
+    """
+    Kölner Phonetik eines normalisierten Worts (siehe name_words), z. B. meier/meyer/maier → "67".
+    Zeichen außerhalb a–z zählen nicht mit; doppelte Ziffern werden zusammengefasst, Nullen
+    (Vokale) bleiben nur am Anfang stehen.
+    """
+    codes: list[str] = []
+    n = len(word)
+    for i, c in enumerate(word):
+        prev = word[i - 1] if i else ""
+        nxt = word[i + 1] if i + 1 < n else ""
+        if c in "aeijouy":
+            code = "0"
+        elif c == "b":
+            code = "1"
+        elif c == "p":
+            code = "3" if nxt == "h" else "1"
+        elif c in "dt":
+            code = "8" if nxt in ("c", "s", "z") else "2"
+        elif c in "fvw":
+            code = "3"
+        elif c in "gkq":
+            code = "4"
+        elif c == "c":
+            if i == 0:
+                code = "4" if nxt in ("a", "h", "k", "l", "o", "q", "r", "u", "x") else "8"
+            elif prev in ("s", "z"):
+                code = "8"
+            else:
+                code = "4" if nxt in ("a", "h", "k", "o", "q", "u", "x") else "8"
+        elif c == "x":
+            code = "8" if prev in ("c", "k", "q") else "48"
+        elif c == "l":
+            code = "5"
+        elif c in "mn":
+            code = "6"
+        elif c == "r":
+            code = "7"
+        elif c in "sz":
+            code = "8"
+        else:
+            continue  # h und alles Fremde
+        codes.append(code)
+    digits = "".join(codes)
+    if not digits:
+        return ""
+    # Erst Doppelte zusammenfassen, dann Nullen streichen – so bleibt "l-e-l" zweimal 5.
+    collapsed = [d for i, d in enumerate(digits) if i == 0 or d != digits[i - 1]]
+    return collapsed[0] + "".join(d for d in collapsed[1:] if d != "0")
+
+
+def within_distance(a: str, b: str, k: int) -> bool:
+    """Levenshtein-Abstand a↔b höchstens k? Band der Breite 2k+1, Abbruch sobald die Zeile k übersteigt."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > k:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    big = k + 1
+    prev = [j if j <= k else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo, hi = max(1, i - k), min(lb, i + k)
+        cur = [big] * (lb + 1)
+        cur[0] = i if i <= k else big
+        ca = a[i - 1]
+        best = cur[0]
+        for j in range(lo, hi + 1):
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != b[j - 1]))
+            cur[j] = v if v <= k else big
+            if v < best:
+                best = v
+        if best > k:
+            return False
+        prev = cur
+    return prev[lb] <= k
+
+
+def fuzzy_word_matches(query_word: str, query_code: str, word: str, code: str) -> bool:
+    """Ein Suchwort gegen ein Namenswort (beide normalisiert, Codes per koelner_phonetik)."""
+    if word == query_word:
+        return True
+    if len(query_word) > 1 and query_code and code == query_code:
+        return True
+    return (len(query_word) >= FUZZY_MIN_LENGTH and len(word) >= FUZZY_MIN_LENGTH
+            and within_distance(query_word, word, FUZZY_MAX_DISTANCE))
+
+
+class FuzzyMatcher:
+    """
+    Unscharfe Einzelabfrage für die Live-Suche (search_files(matcher=…)): Name wortweise wie oben,
+    Geburtsdatum (falls angegeben) wie person_matches. Treffer als normale Zeilen (COLUMNS).
+    Jedes Namenswort und jeder ganze Name wird nur einmal bewertet (Merker), die Namen wiederholen
+    sich im Bestand stark. Picklebar, geht also auch an die Pool-Worker.
+    """
+
+    # Merker leeren, wenn er so groß wird (sehr viele verschiedene Namen)
+    MEMO_LIMIT = 200_000
+
+    def __init__(self, name_value: str, date_str: str = "") -> None:
+        self.name_value = name_value
+        self.needle = name_value.lower()
+        self.date_str = date_str
+        self.words = list(dict.fromkeys(name_words(name_value)))
+        self.codes = [koelner_phonetik(w) for w in self.words]
+        # Das Datum kann der Byte-Vorfilter/Bloom weiter ausschließen, den Namen nicht.
+        self.prefilter = ("birth", date_str, "") if date_str else None
+        self._word_memo: dict[str, int] = {}
+        self._name_memo: dict[str, bool] = {}
+
+    def _word_mask(self, word: str) -> int:
+        mask = self._word_memo.get(word)
+        if mask is None:
+            code = koelner_phonetik(word)
+            mask = 0
+            for bit, (q, qc) in enumerate(zip(self.words, self.codes)):
+                if fuzzy_word_matches(q, qc, word, code):
+                    mask |= 1 << bit
+            if len(self._word_memo) >= self.MEMO_LIMIT:
+                self._word_memo.clear()
+            self._word_memo[word] = mask
+        return mask
+
+    def name_matches(self, person_name: str) -> bool:
+        hit = self._name_memo.get(person_name)
+        if hit is None:
+            full = (1 << len(self.words)) - 1
+            mask = 0
+            for word in name_words(person_name):
+                mask |= self._word_mask(word)
+            hit = (bool(self.words) and mask == full) or self.needle in person_name.lower()
+            if len(self._name_memo) >= self.MEMO_LIMIT:
+                self._name_memo.clear()
+            self._name_memo[person_name] = hit
+        return hit
+
+    def match(self, person_name: str, person_birth: str) -> bool:
+        if self.date_str and not person_matches(person_name, person_birth, "birth", self.date_str, ""):
+            return False
+        return self.name_matches(person_name)
+
+    def search_file(self, file_path: str, source=None, counts: dict | None = None, parser: str | None = None,
+                    recover: bool = False) -> list[tuple]:
+        """Eine Datei (oder ein Archiv-Mitglied) durchsuchen; Parse-Fehler verwerfen die ganze Datei
+        (mit recover bleiben die Treffer bis zum Fehler)."""
+        found: list[tuple] = []
+        clock = time.perf_counter
+        persons = 0
+        t_match = 0.0
+        try:
+            for person_name, person_birth in iter_persons(source if source is not None else file_path,
+                                                          parser, recover):
+                persons += 1
+                t = clock()
+                hit = self.match(person_name, person_birth)
+                t_match += clock() - t
+                if hit:
+                    found.append((person_name or "Unbekannt", person_birth, file_path))
+        except ET.ParseError:
+            return found if _parse_failed(file_path, counts, persons, t_match, recover) else []
+        _count_file(counts, persons, t_match)
+        return found
+
+
+# -----------------------------------------------------------------------------
+# Verzeichnis durchlaufen + Suche über viele Dateien
+# -----------------------------------------------------------------------------
+def iter_xml_files(directory: str, stop_event: threading.Event | None = None, archives: bool = False):
+    """
+    Liefert rekursiv alle *.xml (Groß-/Kleinschreibung egal) – per os.scandir, Reihenfolge wie os.walk
+    (erst die Dateien eines Ordners, dann die Unterordner der Reihe nach; Symlink-Ordner nicht).
+    Unlesbare Ordner überspringe ich wie os.walk stillschweigend; stop_event wird je Ordner geprüft.
+    archives=True liefert zusätzlich Archive (is_archive) – die durchsucht search_files mit.
+    """
+    for entry in _iter_xml_entries(directory, stop_event, archives):
+        yield entry.path
+
+
+def _iter_xml_entries(directory: str, stop_event: threading.Event | None, archives: bool):
+    """Wie iter_xml_files, liefert aber die os.DirEntry (stat() ist unter Windows damit gratis)."""
+    stack = [directory]
+    while stack:
+        if stop_event is not None and stop_event.is_set():
+            return
+        current = stack.pop()
+        subdirs: list[str] = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(".xml") or (archives and is_archive(entry.name)):
+                        yield entry
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def list_xml_files(directory: str) -> list[str]:
+    """Sammelt rekursiv alle *.xml (Groß-/Kleinschreibung egal) in os.walk-Reihenfolge."""
+    return list(iter_xml_files(directory))
+
+
+class FileScanner:
+    """
+    Producer der Such-Pipeline: läuft per iter_xml_files in einem Hintergrundthread durchs Verzeichnis
+    und legt die Pfade in eine begrenzte Queue. search_files holt sie dort ab, während der Walk noch läuft –
+    auf Netzlaufwerken kommen die ersten Treffer so nach Sekunden statt nach dem kompletten Walk.
+    - discovered: bisher gefundene Dateien; finished: Walk ist durch (oder abgebrochen)
+    - Läuft der Walk den Parsern davon, wartet er an der vollen Queue (Speicher bleibt flach).
+    - stop_event bricht auch den Walk ab; close() beendet nur den Scanner.
+    - fingerprint=True: nebenbei Pfad, mtime und Größe jeder Datei hashen (ein stat je Datei, kein
+      Lesen) – nach vollständigem Walk steht der Stand des Baums in .fingerprint (Query-Cache).
+    - sizes=True (bzw. mit fingerprint): discovered_bytes summiert die Dateigrößen – die Skala für
+      den Byte-Fortschritt (stats["bytes_done"]).
+    """
+
+    def __init__(self, directory: str, stop_event: threading.Event | None = None,
+                 maxsize: int = DISCOVERY_QUEUE_SIZE, archives: bool = DEFAULT_ARCHIVES,
+                 fingerprint: bool = False, sizes: bool = False) -> None:
+        self.directory = directory
+        self.archives = archives
+        self._digest = hashlib.blake2b(digest_size=16) if fingerprint else None
+        self._sizes = sizes or fingerprint
+        self.discovered_bytes = 0
+        self._complete = False
+        self.stop_event = stop_event or threading.Event()
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.discovered = 0
+        self.finished = False
+        self.walk_seconds = 0.0  # Zeit im Walk selbst (ohne Warten an der vollen Queue)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="truffledog-scan", daemon=True)
+
+    def start(self) -> "FileScanner":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def _cancelled(self) -> bool:
+        return self.stop_event.is_set() or self._closed.is_set()
+
+    def _run(self) -> None:
+        clock = time.perf_counter
+        t = clock()
+        try:
+            for entry in _iter_xml_entries(self.directory, self.stop_event, self.archives):
+                path = entry.path
+                if self._sizes:
+                    try:
+                        st = entry.stat()
+                        stamp = f"{st.st_mtime_ns}\0{st.st_size}"
+                        self.discovered_bytes += st.st_size
+                    except OSError:
+                        stamp = "?"
+                    if self._digest is not None:
+                        self._digest.update(f"{path}\0{stamp}\n".encode("utf-8", "surrogatepass"))
+                self.walk_seconds += clock() - t
+                self.discovered += 1
+                while True:
+                    try:
+                        self.queue.put(path, timeout=0.2)
+                        break
+                    except queue.Full:
+                        if self._cancelled():
+                            return
+                if self._closed.is_set():
+                    return
+                t = clock()
+            self.walk_seconds += clock() - t
+            self._complete = not self.stop_event.is_set()
+        finally:
+            self.finished = True
+            debug(f"Verzeichnis-Scan beendet: {self.discovered} XML-Dateien gefunden.")
+
+    def take(self, n: int, timeout: float = 0.0) -> list[str]:
+        """Bis zu n Pfade; wartet höchstens timeout auf den ersten. [] = gerade nichts da."""
+        items: list[str] = []
+        try:
+            items.append(self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait())
+            while len(items) < n:
+                items.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    @property
+    def exhausted(self) -> bool:
+        """Walk fertig und alles abgeholt (finished wird erst nach dem letzten put gesetzt)."""
+        return self.finished and self.queue.empty()
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Hash über (Pfad, mtime, Größe) aller Dateien – erst nach vollständigem Walk, sonst None."""
+        if self._digest is None or not self.finished or not self._complete:
+            return None
+        return self._digest.hexdigest()
+
+
+class _FileList:
+    """Fertige Dateiliste mit derselben Schnittstelle wie FileScanner (take/exhausted/discovered)."""
+
+    finished = True
+    discovered_bytes = 0  # unbekannt – Fortschritt dann nach Dateien
+
+    def __init__(self, files: list[str]) -> None:
+        self.files = files
+        self.discovered = len(files)
+        self.pos = 0
+
+    def take(self, n: int, timeout: float = 0.0) -> list[str]:
+        chunk = self.files[self.pos:self.pos + n]
+        self.pos += len(chunk)
+        return chunk
+
+    @property
+    def exhausted(self) -> bool:
+        return self.pos >= len(self.files)
+
+
+def search_files(xml_files: list[str] | FileScanner, search_type: str, date_str: str = "", name_value: str = "",
+                 engine: str = DEFAULT_ENGINE, jobs: int = 1, stop_event: threading.Event | None = None,
+                 prefilter: bool = DEFAULT_PREFILTER, stats: dict | None = None, bloom=None,
+                 matcher: BatchMatcher | FuzzyMatcher | None = None, parser: str = DEFAULT_PARSER,
+                 recover: bool = DEFAULT_RECOVER):
+    """
+    Durchsucht eine Dateiliste oder einen laufenden FileScanner und liefert
+    (Anzahl verarbeiteter Dateien, neue Treffer).
+    - Sequentiell im aufrufenden Thread; mit jobs > 1 übernimmt ein Prozess-Pool (search_in_pool), sobald
+      PARALLEL_MIN_FILES Dateien bzw. PARALLEL_MIN_BYTES anstehen – kleine Bäume starten keinen Pool.
+    - Treffer kommen in beiden Fällen in Dateireihenfolge.
+    - stop_event wird zwischen den Dateien und beim Lesen in der Datei geprüft (SearchCancelled).
+    - Beim Scanner kommt zwischendurch auch (done, []), solange nur der Walk vorankommt –
+      damit der Aufrufer "gefunden vs. verarbeitet" anzeigen kann.
+    - prefilter: Dateien erst per Byte-Vorfilter prüfen, nur Kandidaten parsen (siehe Prefilter).
+    - bloom: BloomCache (truffledog_bloom) – schließt Dateien ohne Öffnen aus; unbekannte oder
+      geänderte Dateien laufen normal durch.
+    - stats (optional) bekommt die Laufzähler hochgezählt: "files", "hits", _FILE_COUNTERS (geparst,
+      gelesene Bytes, Personen, Parse-Fehler, Bloom) und die Stufenzeiten _STAGE_TIMERS plus "t_walk".
+      "bytes_done" wächst auch während einer Datei (Lese-Position des Parsers) – gegen
+      FileScanner.discovered_bytes ergibt das einen Fortschritt, der bei wenigen Riesendateien nicht steht.
+    - matcher: BatchMatcher bzw. FuzzyMatcher statt Einzelabfrage (search_type etc. werden dann
+      ignoriert); Vorfilter und Bloom nur mit matcher.prefilter. Beim BatchMatcher sind die Treffer
+      Zeilen wie BATCH_COLUMNS (siehe search_batch), beim FuzzyMatcher normale Treffer.
+    - parser: Parser-Backend (PARSER_BACKENDS, "auto" = das schnellste installierte); recover: kaputte
+      Dateien tolerant parsen – ihre Treffer bis zum Fehler bleiben, stats["recovered"] zählt die Personen.
+    """
+    backend = resolve_parser(parser, recover)  # nicht installiert/unbekannt → sofort, nicht pro Datei
+    stop_event = stop_event or threading.Event()
+    stats = {} if stats is None else stats
+    for key in ("files", "hits", "bytes_done") + _FILE_COUNTERS:
+        stats.setdefault(key, 0)
+    for key in ("t_walk",) + _STAGE_TIMERS:
+        stats.setdefault(key, 0.0)
+    query = (search_type, date_str, name_value) if matcher is None else matcher.prefilter
+    pf = Prefilter(*query) if prefilter and query is not None else None
+    if pf is not None and not pf.active:
+        debug("Vorfilter greift bei dieser Abfrage nicht – alle Dateien werden geparst.")
+        pf = None
+    bq = bloom.query(*query) if bloom is not None and query is not None else None
+    feed = xml_files if isinstance(xml_files, FileScanner) else _FileList(xml_files)
+    if engine == "stream" or matcher is not None:
+        debug(f"Parser: {backend}{' (tolerant)' if recover else ''}")
+
+    done = 0
+    bytes_before = stats["bytes_done"]
+
+    def pool_worthwhile() -> bool:
+        """Genug Arbeit für den Pool? Offen = entdeckt, aber noch nicht sequentiell durchsucht
+        (nach Bytes erst ab zwei offenen Dateien – eine einzelne Riesendatei teilt sich nicht auf)."""
+        pending = feed.discovered - done
+        return pending >= PARALLEL_MIN_FILES or (
+            pending >= 2 and feed.discovered_bytes - (stats["bytes_done"] - bytes_before) >= PARALLEL_MIN_BYTES)
+
+    try:
+        # Erst sequentiell; sobald genug ansteht, übernimmt der Pool den Rest (Treffer bleiben in Dateireihenfolge).
+        for done, entries in _search_sequential(feed, search_type, date_str, name_value, engine, stop_event, pf,
+                                                stats, bq, matcher, backend, recover,
+                                                until=pool_worthwhile if jobs > 1 else None):
+            yield done, entries
+        if feed.exhausted or stop_event.is_set():
+            return
+        workers = min(jobs, feed.discovered - done) if feed.finished else jobs
+        debug(f"Parallele Suche mit {workers} Prozessen (ab Datei {done + 1}).")
+        for pool_done, entries in search_in_pool(feed, search_type, date_str, name_value, engine, workers,
+                                                 stop_event, pf, stats, bq, matcher, backend, recover):
+            yield done + pool_done, entries
+    finally:
+        if isinstance(feed, FileScanner):
+            stats["t_walk"] = feed.walk_seconds
+        if pf is not None or bq is not None:
+            debug(f"Geparst: {stats['parsed']} von {stats['files']} Dateien.")
+        if bq is not None:
+            maybe = stats["bloom_maybe"]
+            rate = f"{stats['bloom_false_pos'] / maybe:.1%}" if maybe else "-"
+            debug(f"Bloom: {stats['bloom_rejected']} ausgeschlossen, {maybe} vielleicht "
+                  f"(davon ohne Treffer: {stats['bloom_false_pos']}, {rate}), {stats['bloom_unknown']} unbekannt/geändert.")
+
+
+# Zähler des Bloom-Schnellfilters: sicher nicht / vielleicht / nicht im Cache bzw. geändert /
+# "vielleicht", aber ohne Treffer (beobachtete Falsch-Positive auf Dateiebene).
+_BLOOM_COUNTERS = ("bloom_rejected", "bloom_maybe", "bloom_unknown", "bloom_false_pos")
+
+# Zähler und Stufenzeiten (Sekunden), die pro Datei anfallen – auch in den Pool-Workern, die sie
+# blockweise zurückmelden. Im Pool sind die Zeiten über alle Worker summiert, können zusammen also
+# länger sein als die Wanduhr. filter = Bloom + Vorfilter, read = read() auf Datei/Archivstrom,
+# match = Filterlogik je Person, parse = der Rest (Parser und Baum). recovered = Personen aus kaputten
+# Dateien, deren Treffer mit recover geblieben sind.
+_FILE_COUNTERS = ("parsed", "bytes_read", "persons", "parse_errors", "recovered") + _BLOOM_COUNTERS
+_STAGE_TIMERS = ("t_filter", "t_read", "t_parse", "t_match")
+
+
+def _new_counts() -> dict:
+    return {**dict.fromkeys(_FILE_COUNTERS, 0), **dict.fromkeys(_STAGE_TIMERS, 0.0)}
+
+
+class SearchCancelled(Exception):
+    """Abbruch mitten in einer Datei – kommt aus _CountingReader.read() durch den Parser hoch."""
+
+
+class _LocalProgress:
+    """Byte-Fortschritt im eigenen Prozess (sequentielle Suche): zählt in stats["bytes_done"]."""
+
+    __slots__ = ("stats", "stop_event")
+
+    def __init__(self, stats: dict, stop_event: threading.Event) -> None:
+        self.stats = stats
+        self.stop_event = stop_event
+
+    def add(self, n: int) -> None:
+        self.stats["bytes_done"] += n
+
+    def cancelled(self) -> bool:
+        return self.stop_event.is_set()
+
+
+class _SharedProgress:
+    """
+    Dasselbe über Prozessgrenzen für den Pool: ein gemeinsamer Zähler und ein eigenes Abbruch-Event
+    (das threading.Event des Aufrufers sehen die Worker nicht). Kommt per initializer in die Worker.
+    """
+
+    def __init__(self) -> None:
+        self.value = multiprocessing.Value("q", 0)
+        self.event = multiprocessing.Event()
+
+    def add(self, n: int) -> None:
+        with self.value.get_lock():
+            self.value.value += n
+
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+
+class _CountingReader:
+    """
+    Dünner Wrapper um einen Binärstrom für die Parser: zählt gelesene Bytes und die Zeit in read().
+    Mit progress prüfe ich bei jedem read() auf Abbruch (wirft SearchCancelled) und melde die Bytes
+    als Fortschritt (track=False: nur Abbruch, z. B. für entpackte Archiv-Mitglieder). Die Parser
+    ziehen in Häppchen von 16–64 KB, der Test greift also auch mitten in einer 5-GB-Datei alle paar Personen.
+    """
+
+    __slots__ = ("raw", "counts", "progress", "track", "seen")
+
+    def __init__(self, raw, counts: dict, progress=None, track: bool = True) -> None:
+        self.raw = raw
+        self.counts = counts
+        self.progress = progress
+        self.track = track and progress is not None
+        self.seen = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self.progress is not None and self.progress.cancelled():
+            raise SearchCancelled
+        t = time.perf_counter()
+        data = self.raw.read(size)
+        self.counts["t_read"] += time.perf_counter() - t
+        self.counts["bytes_read"] += len(data)
+        if self.track:
+            self.seen += len(data)
+            self.progress.add(len(data))
+        return data
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _search_one(file_path: str, engine: str, search_type: str, date_str: str, name_value: str,
+                pf: Prefilter | None, bq, counts: dict, matcher: BatchMatcher | FuzzyMatcher | None = None,
+                progress=None, parser: str | None = None, recover: bool = False) -> list[tuple]:
+    """
+    Eine Datei bzw. ein Archiv durchsuchen (Bloom → Vorfilter → Parser); zählt in counts mit.
+    progress (_LocalProgress/_SharedProgress): Bytes der Datei als Fortschritt – beim Parsen laufend,
+    den ungelesenen Rest (ausgefilterte Datei, Parser vor dem Dateiende fertig) danach; Archive
+    erst komplett am Ende (gelesen wird dort entpackt, das passt nicht zur Dateigröße).
+    """
+    clock = time.perf_counter
+    verdict = None
+    if not is_archive(file_path) and (pf is not None or bq is not None):
+        t = clock()
+        if bq is not None:
+            verdict = bq.check(file_path)
+            if verdict is False:
+                counts["bloom_rejected"] += 1
+                counts["t_filter"] += clock() - t
+                if progress is not None:
+                    progress.add(_file_size(file_path))
+                return []
+            counts["bloom_maybe" if verdict else "bloom_unknown"] += 1
+        candidate = pf is None or pf.may_match(file_path)
+        counts["t_filter"] += clock() - t
+        if not candidate:
+            if progress is not None:
+                progress.add(_file_size(file_path))
+            return []
+
+    counts["parsed"] += 1
+    t = clock()
+    before = counts["t_read"] + counts["t_match"]
+    if is_archive(file_path):
+        entries = search_in_archive(file_path, search_type, date_str, name_value, engine, matcher, counts, progress,
+                                    parser, recover)
+        if progress is not None:
+            progress.add(_file_size(file_path))
+    else:
+        with open(file_path, "rb") as fh:
+            source = _CountingReader(fh, counts, progress)
+            if matcher is not None:
+                entries = matcher.search_file(file_path, source=source, counts=counts, parser=parser,
+                                              recover=recover)
+            else:
+                entries = get_engine(engine)(file_path, search_type, date_str, name_value,
+                                             source=source, counts=counts, parser=parser, recover=recover)
+            if progress is not None:
+                progress.add(max(0, os.fstat(fh.fileno()).st_size - source.seen))
+    counts["t_parse"] += clock() - t - (counts["t_read"] + counts["t_match"] - before)
+    if verdict and not entries:
+        counts["bloom_false_pos"] += 1
+    return entries
+
+
+def _search_sequential(feed: FileScanner | _FileList, search_type: str, date_str: str, name_value: str,
+                       engine: str, stop_event: threading.Event, pf: Prefilter | None, stats: dict, bq=None,
+                       matcher: BatchMatcher | FuzzyMatcher | None = None, parser: str | None = None,
+                       recover: bool = False, until=None):
+    """Sequentieller Zweig von search_files (im aufrufenden Thread).
+    until(): vor jeder Datei gefragt – True heißt aufhören, den Rest übernimmt der Pool."""
+    get_engine(engine)  # unbekannte Engine sofort melden, nicht erst pro Datei
+    progress = _LocalProgress(stats, stop_event)
+    idx = 0
+    while not feed.exhausted:
+        if stop_event.is_set():
+            debug("Suche wurde durch Benutzer abgebrochen.")
+            break
+        if until is not None and until():
+            return
+        batch = feed.take(1, timeout=0.2)
+        if not batch:
+            yield idx, []  # Parser wartet auf den Walk
+            continue
+        file_path = batch[0]
+        idx += 1
+        entries: list[tuple[str, str, str]] = []
+        try:
+            # Pro Datei nur gedrosselt loggen (debug_file) – die Konsole war bei großen Läufen selbst ein Kostenfaktor.
+            total = f"{feed.discovered}" if feed.finished else f"{feed.discovered}+"
+            debug_file(f"[{idx}/{total}] Verarbeite: {file_path}")
+            entries = _search_one(file_path, engine, search_type, date_str, name_value, pf, bq, stats, matcher,
+                                  progress, parser, recover)
+        except SearchCancelled:
+            debug(f"Suche wurde durch Benutzer abgebrochen (in {file_path}).")
+            break
+        except Exception as e:
+            debug_file(f"Fehler beim Verarbeiten von {file_path}: {e}")
+        stats["files"] += 1
+        stats["hits"] += len(entries)
+        yield idx, entries
+
+
+def search(directory: str, search_type: str, date_str: str = "", name_value: str = "",
+           engine: str = DEFAULT_ENGINE, jobs: int = 1, stop_event: threading.Event | None = None,
+           prefilter: bool = DEFAULT_PREFILTER, archives: bool = DEFAULT_ARCHIVES, bloom=None,
+           stats: dict | None = None, fuzzy: bool = False, parser: str = DEFAULT_PARSER,
+           recover: bool = DEFAULT_RECOVER):
+    """
+    Generator-API: liefert alle Treffer (Name, Geburtsdatum, Datei) unter directory, einzeln gestreamt.
+    Walk und Parsen laufen überlappend (FileScanner), der erste Treffer wartet nicht auf den ganzen Baum.
+    stats: wie bei search_files (z. B. RunLog.stats für das Laufprotokoll).
+    fuzzy: Name unscharf vergleichen (FuzzyMatcher: Meier = Meyer, Müller = Mueller, ein Tippfehler).
+    parser/recover: Parser-Backend und tolerantes Parsen (siehe search_files).
+    """
+    scanner = FileScanner(directory, stop_event, archives=archives).start()
+    try:
+        for _, entries in search_files(scanner, search_type, date_str, name_value, engine, jobs, stop_event,
+                                       prefilter, stats=stats, bloom=bloom,
+                                       matcher=fuzzy_matcher(search_type, date_str, name_value, fuzzy),
+                                       parser=parser, recover=recover):
+            yield from entries
+    finally:
+        scanner.close()
+
+
+def fuzzy_matcher(search_type: str, date_str: str, name_value: str, fuzzy: bool) -> FuzzyMatcher | None:
+    """FuzzyMatcher für die Abfrage – oder None, wenn nicht unscharf gesucht wird (bzw. ohne Namen)."""
+    if not fuzzy or search_type not in ("name", "both"):
+        return None
+    return FuzzyMatcher(name_value, date_str if search_type == "both" else "")
+
+
+def search_batch(xml_files: list[str] | FileScanner, queries: list[tuple[str, str]], jobs: int = 1,
+                 stop_event: threading.Event | None = None, stats: dict | None = None):
+    """
+    Batch-Modus: alle Anfragen (Name, Geburtsdatum) in einem Durchlauf über die Dateien.
+    Liefert wie search_files (verarbeitete Dateien, neue Zeilen) – Zeilen im Format BATCH_COLUMNS.
+    """
+    matcher = BatchMatcher(queries)
+    debug(f"Batch: {len(queries)} Anfragen, {len(matcher.patterns)} verschiedene Namen, "
+          f"{len(matcher.exact)} exakte Daten.")
+    yield from search_files(xml_files, "batch", jobs=jobs, stop_event=stop_event, prefilter=False,
+                            stats=stats, matcher=matcher)
+
+
+# -----------------------------------------------------------------------------
+# Prozess-Pool (Worker-Funktion auf Modulebene, damit sie picklebar ist)
+# -----------------------------------------------------------------------------
+_worker_progress: _SharedProgress | None = None
+
+
+def _init_worker(progress: _SharedProgress) -> None:
+    """initializer der Pool-Prozesse: gemeinsamen Fortschritt/Abbruch übernehmen."""
+    global _worker_progress
+    _worker_progress = progress
+
+
+def _search_chunk(chunk: list[str], engine: str, search_type: str, date_str: str, name_value: str,
+                  pf: Prefilter | None = None, bq=None, matcher: BatchMatcher | FuzzyMatcher | None = None,
+                  parser: str | None = None, recover: bool = False) -> tuple[list[tuple], list[str], dict]:
+    """Worker: durchsucht einen Block Dateien; Fehler sammle ich statt sie zu werfen.
+    Rückgabe: (Treffer, Fehlermeldungen, Zähler wie in search_files' stats)."""
+    found: list[tuple[str, str, str]] = []
+    errors: list[str] = []
+    counts = _new_counts()
+    for file_path in chunk:
+        try:
+            found.extend(_search_one(file_path, engine, search_type, date_str, name_value, pf, bq, counts, matcher,
+                                     _worker_progress, parser, recover))
+        except SearchCancelled:
+            break  # der Aufrufer verwirft den Block ohnehin
+        except Exception as e:
+            errors.append(f"Fehler beim Verarbeiten von {file_path}: {e}")
+    return found, errors, counts
+
+
+def search_in_pool(xml_files: list[str] | FileScanner | _FileList, search_type: str, date_str: str,
+                   name_value: str, engine: str, workers: int, stop_event: threading.Event,
+                   pf: Prefilter | None = None, stats: dict | None = None, bq=None,
+                   matcher: BatchMatcher | FuzzyMatcher | None = None, parser: str | None = None,
+                   recover: bool = False):
+    """
+    Verteilt die Dateien blockweise auf einen ProcessPoolExecutor.
+    Liefert (Anzahl verarbeiteter Dateien, neue Treffer) – die Treffer immer in Dateireihenfolge,
+    damit das Ergebnis deterministisch ist, egal welcher Worker zuerst fertig wird.
+    - Kleine Blöcke (max. 32 Dateien) halten den Fortschritt fein und die IPC-Last klein; die Größe
+      richtet sich nach dem, was gerade ansteht – beim laufenden Scanner starten die Worker sofort.
+    - Es sind nie mehr als workers*4 Blöcke unterwegs, damit Abbrechen schnell greift.
+    - pf (Prefilter) und bq (Bloom-Abfrage) laufen in den Workern direkt vor dem Parsen.
+    - Fortschritt in Bytes und Abbruch teilen sich die Worker über _SharedProgress: beim Abbruch
+      steigen auch laufende Blöcke mitten in der Datei aus, statt eine riesige Datei zu Ende zu parsen.
+    """
+    stats = {} if stats is None else stats
+    feed = xml_files if isinstance(xml_files, (FileScanner, _FileList)) else _FileList(xml_files)
+    in_flight: dict = {}
+    finished_chunks: dict[int, list[tuple[str, str, str]]] = {}
+    next_chunk = 0
+    submitted = 0
+    taken = 0
+    done = 0
+
+    progress = _SharedProgress()
+    bytes_before = stats.setdefault("bytes_done", 0)  # was search_files vorher sequentiell gelesen hat
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(progress,))
+    try:
+        def submit_more() -> None:
+            nonlocal submitted, taken
+            while len(in_flight) < workers * 4:
+                chunk = feed.take(max(1, min(32, (feed.discovered - taken) // (workers * 8))))
+                if not chunk:
+                    return
+                future = pool.submit(_search_chunk, chunk, engine, search_type, date_str, name_value, pf, bq, matcher,
+                                     parser, recover)
+                in_flight[future] = (submitted, len(chunk))
+                submitted += 1
+                taken += len(chunk)
+
+        submit_more()
+        while in_flight or not feed.exhausted:
+            if not in_flight:
+                # Die Parser sind dem Walk voraus – kurz warten (Abbruch beendet das Warten sofort).
+                if stop_event.wait(0.05):
+                    debug("Suche wurde durch Benutzer abgebrochen.")
+                    break
+                stats["bytes_done"] = bytes_before + progress.value.value
+                yield done, []
+                submit_more()
+                continue
+            # Mit Timeout warten, damit ich das Abbruch-Event regelmäßig sehe.
+            finished, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+            if stop_event.is_set():
+                debug("Suche wurde durch Benutzer abgebrochen.")
+                break
+            for future in finished:
+                idx, size = in_flight.pop(future)
+                try:
+                    found, errors, counts = future.result()
+                except Exception as e:
+                    found, errors, counts = [], [f"Fehler im Worker-Prozess (Block {idx}): {e}"], {}
+                for err in errors:
+                    debug_file(err)
+                finished_chunks[idx] = found
+                done += size
+                stats["files"] = stats.get("files", 0) + size
+                stats["hits"] = stats.get("hits", 0) + len(found)
+                for key, value in counts.items():
+                    stats[key] = stats.get(key, 0) + value
+            ready: list[tuple[str, str, str]] = []
+            while next_chunk in finished_chunks:
+                ready.extend(finished_chunks.pop(next_chunk))
+                next_chunk += 1
+            stats["bytes_done"] = bytes_before + progress.value.value
+            yield done, ready
+            submit_more()
+    finally:
+        # Offene Blöcke verwerfen; laufende steigen über das gemeinsame Event beim nächsten read() aus.
+        if in_flight:
+            progress.event.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        stats["bytes_done"] = bytes_before + progress.value.value
+
+
+# -----------------------------------------------------------------------------
+# Ergebnisablage + Export
+# -----------------------------------------------------------------------------
+class ResultStore:
+    """
+    Kompakte Spaltenablage für Treffer (Name, Geburtsdatum, Datei).
+    - Namen als Liste, Geburtsdatum und Datei als array('I') mit IDs auf internierte Tabellen –
+      dieselben paar tausend Pfade/Daten liegen so nur einmal im Speicher.
+    - 'order' ist die Anzeige-Reihenfolge nach einer Sortierung (None = Fundreihenfolge).
+    - Ab spill_rows Zeilen lagere ich alles in eine temporäre SQLite-Datei aus (_spill): Zeilen und
+      Anzeige-Reihenfolge liegen dann auf der Platte, im Speicher nur noch SQLites Seiten-Cache.
+      Sortieren wird dort ein ORDER BY (SQLite sortiert extern), Iteration/Export lesen seitenweise.
+    Iteration und len() verhalten sich wie die frühere Tupel-Liste (Export läuft unverändert).
+    """
+
+    def __init__(self, spill_rows: int | None = RESULT_SPILL_ROWS, spill_dir: str | None = None) -> None:
+        self.spill_rows = spill_rows
+        self.spill_dir = spill_dir
+        self._db = None
+        self._db_path: str | None = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Leert die Ablage – neue Objekte statt Löschen, damit das bei 1M Zeilen sofort geht.
+        Eine ausgelagerte Datei wird gelöscht."""
+        self._drop_spill()
+        self.names: list[str] = []
+        self.birth_ids = array('I')
+        self.path_ids = array('I')
+        self.births: list[str] = []
+        self.paths: list[str] = []
+        self._birth_lookup: dict[str, int] = {}
+        self._path_lookup: dict[str, int] = {}
+        self.order: array | None = None
+        self.sort_column: str | None = None
+        self.sort_desc = False
+        self._count = 0          # Zeilen in der ausgelagerten Ablage
+        self._db_sorted = False  # ausgelagert: gibt es eine Anzeige-Reihenfolge (Tabelle ord)?
+        self._ord_len = 0        # so viele Positionen deckt die letzte Sortierung ab (danach: angehängt)
+        self._ord_flipped = False  # die ersten _ord_len Positionen gelten rückwärts (Richtung gedreht)
+
+    @property
+    def spilled(self) -> bool:
+        """True, sobald die Ablage auf der Platte liegt."""
+        return self._db is not None
+
+    def __len__(self) -> int:
+        return self._count if self._db is not None else len(self.names)
+
+    def __iter__(self):
+        if self._db is not None:
+            yield from self._iter_spilled()
+            return
+        for pos in range(len(self.names)):
+            if self._db is not None:  # während der Iteration ausgelagert – dort weiterlesen
+                yield from self._iter_spilled(pos)
+                return
+            yield self.row(self.index_at(pos))
+
+    @staticmethod
+    def _intern(table: list[str], lookup: dict[str, int], value: str) -> int:
+        idx = lookup.get(value)
+        if idx is None:
+            idx = lookup[value] = len(table)
+            table.append(value)
+        return idx
+
+    def extend(self, rows) -> None:
+        """Hängt Treffer an. Ist sortiert, landen neue Zeilen hinten (bis zur nächsten Sortierung)."""
+        if self._db is not None:
+            self._extend_spilled(rows)
+            return
+        start = len(self.names)
+        for name, birth, path in rows:
+            self.names.append(name)
+            self.birth_ids.append(self._intern(self.births, self._birth_lookup, birth))
+            self.path_ids.append(self._intern(self.paths, self._path_lookup, path))
+        if self.order is not None:
+            self.order.extend(range(start, len(self.names)))
+        if self.spill_rows is not None and len(self.names) > self.spill_rows:
+            self._spill()
+
+    def row(self, idx: int) -> tuple[str, str, str]:
+        """Zeile nach Speicherindex."""
+        if self._db is not None:
+            return self._db.execute("SELECT name, birth, path FROM rows WHERE id = ?", (idx,)).fetchone()
+        return self.names[idx], self.births[self.birth_ids[idx]], self.paths[self.path_ids[idx]]
+
+    def index_at(self, pos: int) -> int:
+        """Speicherindex der Zeile an Anzeigeposition pos."""
+        if self._db is not None:
+            if not self._db_sorted:
+                return pos
+            return self._db.execute("SELECT id FROM ord WHERE pos = ?", (self._stored_pos(pos),)).fetchone()[0]
+        return self.order[pos] if self.order is not None else pos
+
+    def sort(self, column: str) -> None:
+        """
+        Sortiert die Anzeige nach Spalte; erneuter Klick dreht die Richtung.
+        Geburtsdatum/Datei sortiere ich über den Rang in der (kleinen) internierten Tabelle,
+        dann ist der Schlüssel pro Zeile nur ein int – deutlich schneller als Stringvergleiche.
+        """
+        if self._db is not None:
+            self._sort_spilled(column)
+            return
+        if column == self.sort_column and self.order is not None:
+            # Nur Richtung drehen – Umkehren ist O(n), neu sortieren wäre O(n log n).
+            self.sort_desc = not self.sort_desc
+            self.order.reverse()
+            return
+        self.sort_desc = False
+        self.sort_column = column
+        if column == "Name":
+            keys = [n.casefold() for n in self.names]
+        else:
+            table, ids = (self.births, self.birth_ids) if column == "Geburtsdatum" else (self.paths, self.path_ids)
+            rank = [0] * len(table)
+            for r, idx in enumerate(sorted(range(len(table)), key=table.__getitem__)):
+                rank[idx] = r
+            keys = [rank[i] for i in ids]
+        self.order = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+
+    # --- Auslagerung auf die Platte ------------------------------------------------
+    # Tabelle rows: id = Speicherindex (Fundreihenfolge). Tabelle ord: pos = Anzeigeposition → id,
+    # nur nach einer Sortierung. Nur ein Thread benutzt die Ablage (in der GUI der Hauptthread).
+    # fold = name.casefold(), beim Einfügen berechnet – so sortiert SQLite ohne Python-Aufrufe.
+    _SORT_KEYS = {"Name": "fold, id", "Geburtsdatum": "birth, id", "Datei": "path, id"}
+
+    def _spill(self) -> None:
+        """Verschiebt die Ablage samt Anzeige-Reihenfolge in eine temporäre SQLite-Datei."""
+        import sqlite3
+        import tempfile
+        fd, self._db_path = tempfile.mkstemp(prefix="truffledog-", suffix=".sqlite", dir=self.spill_dir)
+        os.close(fd)
+        db = sqlite3.connect(self._db_path, isolation_level=None)
+        # Wegwerfdaten: kein Journal, kein fsync.
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("PRAGMA temp_store = FILE")
+        db.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY, name TEXT, birth TEXT, path TEXT, fold TEXT)")
+        db.execute("CREATE TABLE ord (pos INTEGER PRIMARY KEY, id INTEGER)")
+        db.execute("BEGIN")
+        db.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?)",
+                       ((i, name, self.births[b], self.paths[p], name.casefold())
+                        for i, (name, b, p) in enumerate(zip(self.names, self.birth_ids, self.path_ids))))
+        if self.order is not None:
+            db.executemany("INSERT INTO ord VALUES (?, ?)", enumerate(self.order))
+        db.execute("COMMIT")
+        self._count = self._ord_len = len(self.names)
+        self._db_sorted = self.order is not None
+        self._db = db
+        self.names, self.birth_ids, self.path_ids = [], array('I'), array('I')
+        self.births, self.paths, self._birth_lookup, self._path_lookup = [], [], {}, {}
+        self.order = None
+        debug(f"Ergebnisablage auf die Platte ausgelagert ({self._count} Zeilen): {self._db_path}")
+
+    def _extend_spilled(self, rows) -> None:
+        start = self._count
+        batch = [(start + i, name, birth, path, name.casefold()) for i, (name, birth, path) in enumerate(rows)]
+        self._db.execute("BEGIN")
+        self._db.executemany("INSERT INTO rows VALUES (?, ?, ?, ?, ?)", batch)
+        if self._db_sorted:
+            self._db.executemany("INSERT INTO ord VALUES (?, ?)", ((r[0], r[0]) for r in batch))
+        self._db.execute("COMMIT")
+        self._count += len(batch)
+
+    def _stored_pos(self, pos: int) -> int:
+        """Anzeigeposition → pos in ord (die ersten _ord_len stehen bei gedrehter Richtung rückwärts)."""
+        return self._ord_len - 1 - pos if self._ord_flipped and pos < self._ord_len else pos
+
+    def _sort_spilled(self, column: str) -> None:
+        db = self._db
+        if column == self.sort_column and self._db_sorted:
+            self.sort_desc = not self.sort_desc
+            if self._count == self._ord_len:
+                # Nichts angehängt seit der Sortierung: nur die Leserichtung drehen – O(1).
+                self._ord_flipped = not self._ord_flipped
+                return
+            # Sonst ord umschreiben: neue pos = n-1-Anzeigeposition, über negative Zwischenwerte
+            # (sonst kollidiert der Primärschlüssel mitten im UPDATE).
+            db.execute("BEGIN")
+            if self._ord_flipped:
+                db.execute("UPDATE ord SET pos = -1 - (CASE WHEN pos < ?1 THEN ?1 - 1 - pos ELSE pos END)",
+                           (self._ord_len,))
+            else:
+                db.execute("UPDATE ord SET pos = -1 - pos")
+            db.execute("UPDATE ord SET pos = pos + ?", (self._count,))
+            db.execute("COMMIT")
+        else:
+            db.execute("BEGIN")
+            self.sort_desc = False
+            self.sort_column = column
+            db.execute("DELETE FROM ord")
+            db.execute(f"INSERT INTO ord SELECT row_number() OVER (ORDER BY {self._SORT_KEYS[column]}) - 1, id FROM rows")
+            db.execute("COMMIT")
+            self._db_sorted = True
+        self._ord_len = self._count
+        self._ord_flipped = False
+
+    def _iter_spilled(self, pos: int = 0):
+        """Zeilen in Anzeigereihenfolge, seitenweise (Speicher bleibt flach, auch während extend)."""
+        page = 10_000
+        while pos < self._count:
+            if self._db_sorted and self._ord_flipped and pos < self._ord_len:
+                chunk = self._db.execute(
+                    "SELECT r.name, r.birth, r.path FROM ord o JOIN rows r ON r.id = o.id "
+                    "WHERE o.pos <= ? ORDER BY o.pos DESC LIMIT ?",
+                    (self._stored_pos(pos), min(page, self._ord_len - pos))).fetchall()
+            elif self._db_sorted:
+                chunk = self._db.execute(
+                    "SELECT r.name, r.birth, r.path FROM ord o JOIN rows r ON r.id = o.id "
+                    "WHERE o.pos >= ? ORDER BY o.pos LIMIT ?", (pos, page)).fetchall()
+            else:
+                chunk = self._db.execute("SELECT name, birth, path FROM rows WHERE id >= ? ORDER BY id LIMIT ?",
+                                         (pos, page)).fetchall()
+            if not chunk:
+                return
+            yield from chunk
+            pos += len(chunk)
+
+    def _drop_spill(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._db_path is not None:
+            try:
+                os.remove(self._db_path)
+            except OSError:
+                pass
+            self._db_path = None
+
+
+def person_key(name: str, birth: str) -> tuple[str, str]:
+    """
+    Gruppenschlüssel einer Person: Namenswörter normalisiert (name_words) und sortiert – "Meier, Hans",
+    "HANS MEIER" und "Hans Meier" sind dieselbe Person – und das Datum als ISO (TT.MM.JJJJ wie JJJJ-MM-TT).
+    """
+    return _name_key(name), _normalize_birth(birth) or birth.strip()
+
+
+def _name_key(name: str) -> str:
+    words = name_words(name)
+    return " ".join(sorted(words)) if words else name.strip().casefold()
+
+
+class PersonGroups:
+    """
+    Treffer je Person zusammengefasst: (Name, Geburtsdatum, Fundstellen, Dateien).
+    - extend() gruppiert per Hash auf person_key – O(n), Batch für Batch während der Suche, ohne zu sortieren.
+    - Angezeigt werden Name/Datum des ersten Vorkommens; Dateien sind wie im ResultStore interniert,
+      je Gruppe die erste Datei als array('I') und nur bei mehreren ein eigenes array (die meisten
+      Personen stehen in genau einer Datei).
+    - Gleiche Schnittstelle wie ResultStore (len, row, index_at, sort, clear, Iteration) – die
+      Ergebnisanzeige kann beide zeigen. row() fasst die Dateien zusammen, files() liefert alle.
+    Die Gruppen liegen immer im Speicher (eine je Person, nicht je Treffer).
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._lookup: dict[tuple[str, str], int] = {}
+        # Normalisierung je Rohwert nur einmal (Namen und Daten wiederholen sich über die Treffer)
+        self._name_keys: dict[str, str] = {}
+        self._birth_keys: dict[str, str] = {}
+        self.names: list[str] = []
+        self.births: list[str] = []
+        self.counts = array('I')
+        self.first_file = array('I')
+        self.more_files: dict[int, array] = {}  # Gruppe → weitere Datei-IDs (ohne direkte Wiederholung)
+        self.paths: list[str] = []
+        self._path_lookup: dict[str, int] = {}
+        self.order: array | None = None
+        self.sort_column: str | None = None
+        self.sort_desc = False
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        """Zeilen in Anzeigereihenfolge wie GROUP_COLUMNS (Dateien ausgeschrieben) – für den Export."""
+        for pos in range(len(self.names)):
+            idx = self.index_at(pos)
+            yield self.names[idx], self.births[idx], self.counts[idx], GROUP_FILE_SEP.join(self.files(idx))
+
+    def extend(self, rows) -> None:
+        """Treffer (Name, Geburtsdatum, Datei) einsortieren; neue Personen landen hinten."""
+        lookup, paths = self._lookup, self._path_lookup
+        name_keys, birth_keys = self._name_keys, self._birth_keys
+        start = len(self.names)
+        for name, birth, path in rows:
+            pid = paths.get(path)
+            if pid is None:
+                pid = paths[path] = len(self.paths)
+                self.paths.append(path)
+            name_key = name_keys.get(name)
+            if name_key is None:
+                name_key = name_keys[name] = _name_key(name)
+            birth_key = birth_keys.get(birth)
+            if birth_key is None:
+                birth_key = birth_keys[birth] = _normalize_birth(birth) or birth.strip()
+            key = (name_key, birth_key)
+            idx = lookup.get(key)
+            if idx is None:
+                lookup[key] = len(self.names)
+                self.names.append(name)
+                self.births.append(birth)
+                self.counts.append(1)
+                self.first_file.append(pid)
+                continue
+            self.counts[idx] += 1
+            more = self.more_files.get(idx)
+            if more is None:
+                if self.first_file[idx] != pid:
+                    self.more_files[idx] = array('I', (pid,))
+            elif more[-1] != pid:
+                # Treffer kommen dateiweise – eine Wiederholung steht fast immer direkt hintereinander;
+                # den Rest sortiert files() aus.
+                more.append(pid)
+        if self.order is not None:
+            self.order.extend(range(start, len(self.names)))
+
+    def files(self, idx: int) -> list[str]:
+        """Alle Dateien einer Gruppe in Fundreihenfolge, jede einmal."""
+        ids = (self.first_file[idx], *self.more_files.get(idx, ()))
+        return [self.paths[i] for i in dict.fromkeys(ids)]
+
+    def row(self, idx: int) -> tuple[str, str, int, str]:
+        """Anzeigezeile: bei mehreren Dateien die erste plus Anzahl der weiteren."""
+        files = self.files(idx)
+        shown = files[0] if len(files) == 1 else f"{files[0]} (+{len(files) - 1} weitere)"
+        return self.names[idx], self.births[idx], self.counts[idx], shown
+
+    def index_at(self, pos: int) -> int:
+        return self.order[pos] if self.order is not None else pos
+
+    def sort(self, column: str) -> None:
+        """Wie ResultStore.sort; Fundstellen absteigend (die häufigsten Personen zuerst), Dateien nach der ersten."""
+        if column == self.sort_column and self.order is not None:
+            self.sort_desc = not self.sort_desc
+            self.order.reverse()
+            return
+        self.sort_desc = column == "Fundstellen"
+        self.sort_column = column
+        if column == "Name":
+            keys = [n.casefold() for n in self.names]
+        elif column == "Geburtsdatum":
+            keys = self.births
+        elif column == "Fundstellen":
+            keys = self.counts
+        else:
+            keys = [self.paths[i] for i in self.first_file]
+        self.order = array('I', sorted(range(len(keys)), key=keys.__getitem__, reverse=self.sort_desc))
+
+
+def write_results(rows, fh, fmt: str = "csv", columns: tuple[str, ...] = COLUMNS) -> int:
+    """
+    Schreibt Treffer als CSV (mit Kopfzeile wie im GUI-Export) oder JSONL in ein offenes
+    Textfile und liefert die Anzahl Zeilen. rows darf ein Generator sein – es wird gestreamt.
+    columns: Kopfzeile/Schlüssel (BATCH_COLUMNS für den Batch-Export).
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            fh.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}")
+    return count
+
+
+# -----------------------------------------------------------------------------
+# Laufprotokoll: Zähler, Stufenzeiten und optional ein Profil je Suche als JSON
+# -----------------------------------------------------------------------------
+class RunLog:
+    """
+    Protokoll eines Suchlaufs. stats geht an search_files (bzw. search/search_batch) und sammelt dort die
+    Zähler und Stufenzeiten; die GUI addiert ihre Zeit fürs Einfügen der Treffer als "t_ui" dazu.
+    finish() schreibt alles als JSON nach RUN_DIR (die letzten RUN_KEEP Läufe bleiben liegen).
+    profile: None, "cprofile" oder "tracemalloc" – erfasst wird, was innerhalb von profiled() läuft.
+    cProfile sieht nur den eigenen Thread/Prozess: für Parser-Profile mit jobs=1 suchen.
+    """
+
+    def __init__(self, kind: str, params: dict, profile: str | None = DEFAULT_PROFILE,
+                 run_dir: str = RUN_DIR) -> None:
+        if profile not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unbekannter Profiling-Modus: {profile}")
+        self.kind = kind
+        self.params = params
+        self.profile = profile
+        self.run_dir = run_dir
+        self.stats: dict = {}
+        self.started = datetime.datetime.now()
+        self._t0 = time.perf_counter()
+        self._profile_result: dict | None = None
+        self._profiler = None
+
+    @contextlib.contextmanager
+    def profiled(self):
+        """Profiling (falls eingeschaltet) um den eigentlichen Suchlauf – im Thread, der sucht."""
+        if self.profile == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            try:
+                yield self
+            finally:
+                self._profiler.disable()
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+            tracemalloc.start()
+            try:
+                yield self
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                top = snapshot.statistics("lineno")[:15]
+                self._profile_result = {"mode": "tracemalloc", "peak_kb": peak // 1024,
+                                        "top": [f"{st.size // 1024} KB  {st.count}x  {st.traceback}" for st in top]}
+        else:
+            yield self
+
+    def summary(self, **extra) -> dict:
+        """Das Protokoll als dict (Kennzahlen berechnet aus stats und Wanduhr)."""
+        seconds = time.perf_counter() - self._t0
+        counters = {k: v for k, v in self.stats.items() if not k.startswith("t_")}
+        stages = {k[2:]: round(v, 4) for k, v in self.stats.items() if k.startswith("t_")}
+        result = {
+            "kind": self.kind,
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(seconds, 4),
+            "params": self.params,
+            **extra,
+            "counters": counters,
+            "stages": stages,
+            "throughput": {
+                "files_per_s": round(counters.get("files", 0) / seconds, 1) if seconds else None,
+                "mb_per_s": round(counters.get("bytes_read", 0) / (1024 * 1024) / seconds, 2) if seconds else None,
+                "persons_per_s": round(counters.get("persons", 0) / seconds) if seconds else None,
+            },
+        }
+        if self._profile_result is not None:
+            result["profile"] = self._profile_result
+        return result
+
+    def finish(self, **extra) -> str | None:
+        """Schreibt das Protokoll (extra: z. B. hits=…, cancelled=…) und liefert den Pfad; None bei Fehler."""
+        stamp = self.started.strftime("%Y%m%d-%H%M%S-%f")
+        base = os.path.join(self.run_dir, f"{stamp}-{self.kind}")
+        try:
+            os.makedirs(self.run_dir, exist_ok=True)
+            if self._profiler is not None:
+                self._profiler.dump_stats(base + ".prof")
+                self._profile_result = {"mode": "cprofile", "file": base + ".prof", "top": self._top_functions()}
+            summary = self.summary(**extra)
+            with open(base + ".json", "w", encoding="utf-8") as fh:
+                json.dump(summary, fh, ensure_ascii=False, indent=1)
+            self._prune()
+        except OSError as e:
+            debug(f"Laufprotokoll nicht geschrieben: {e}")
+            return None
+        c, st = summary["counters"], summary["stages"]
+        debug(f"Lauf: {c.get('files', 0)} Dateien ({c.get('parsed', 0)} geparst), "
+              f"{c.get('bytes_read', 0) / (1024 * 1024):.1f} MB, {c.get('persons', 0)} Personen, "
+              f"{c.get('parse_errors', 0)} Parse-Fehler"
+              + (f" ({c['recovered']} Personen gerettet)" if c.get("recovered") else "")
+              + f", {summary['seconds']:.2f} s – "
+              + ", ".join(f"{k} {v:.2f} s" for k, v in st.items()))
+        debug(f"Laufprotokoll: {base}.json")
+        return base + ".json"
+
+    def _top_functions(self, limit: int = 25) -> list[str]:
+        import pstats
+        stats = pstats.Stats(self._profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [f"{ct:.3f} s kumuliert, {tt:.3f} s selbst, {nc}x  {file}:{line}({func})"
+                for (file, line, func), (_, nc, tt, ct, _) in rows]
+
+    def _prune(self) -> None:
+        """Nur die letzten RUN_KEEP Läufe aufheben (Dateinamen beginnen mit dem Zeitstempel)."""
+        names = sorted(n for n in os.listdir(self.run_dir) if n.endswith(".json"))
+        for name in names[:-RUN_KEEP]:
+            for path in (os.path.join(self.run_dir, name), os.path.join(self.run_dir, name[:-5] + ".prof")):
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+
+
+# -----------------------------------------------------------------------------
+# Kommandozeile
+# -----------------------------------------------------------------------------
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="truffledog", description="TruffleDog – XML-Personensuche ohne GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_search = sub.add_parser("search", help="Personen suchen, Treffer nach stdout")
+    p_search.add_argument("--birth", default="", help="Geburtsdatum: 1985-12-03, 1985, 1985-12 oder 1980..1985")
+    p_search.add_argument("--name", default="", help="Name (Teilstring, Groß-/Kleinschreibung egal)")
+    p_search.add_argument("--fuzzy", action="store_true",
+                          help="Name unscharf: Kölner Phonetik, Umlaute/ß, ein Tippfehler (Meier = Meyer = Maier)")
+    p_search.add_argument("--dir", required=True, help="Suchverzeichnis (rekursiv)")
+    p_search.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="Anzahl Prozesse (Standard: Kerne)")
+    p_search.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    p_search.add_argument("--engine", choices=("stream", "tree"), default=DEFAULT_ENGINE)
+    p_search.add_argument("--parser", choices=("auto",) + PARSER_BACKENDS, default=DEFAULT_PARSER,
+                          help="Parser-Backend (auto: das schnellste installierte; lxml ist optional)")
+    p_search.add_argument("--recover", action="store_true", default=DEFAULT_RECOVER,
+                          help="kaputte Dateien tolerant parsen: Treffer bis zum Fehler behalten "
+                               "(lxml: auch dahinter)")
+    p_search.add_argument("--index", action="store_true", help="aus dem persistenten Index antworten")
+    p_search.add_argument("--snapshot", metavar="DATEI",
+                          help="aus einem Snapshot antworten (truffledog snapshot; Stand des Exports)")
+    p_search.add_argument("--server", metavar="URL", nargs="?", const="",
+                          help="den lokalen Suchdienst fragen (truffledog serve; ohne URL: TRUFFLEDOG_SERVER "
+                               "bzw. http://127.0.0.1:8737)")
+    p_search.add_argument("--no-prefilter", dest="prefilter", action="store_false",
+                          help="Byte-Vorfilter aus: jede Datei parsen")
+    p_search.add_argument("--no-archives", dest="archives", action="store_false",
+                          help="Archive (.zip/.tar/.gz) nicht mitdurchsuchen")
+    p_search.add_argument("--no-bloom", dest="bloom", action="store_false",
+                          help="Bloom-Schnellfilter nicht nutzen (sonst: falls aufgebaut)")
+    p_search.add_argument("--group", action="store_true",
+                          help="eine Zeile je Person (Name/Datum normalisiert) mit Fundstellen und Dateien")
+    p_search.add_argument("--cache", action="store_true",
+                          help="Query-Cache (~/.truffledog/query_cache.sqlite): unveränderter Baum = nur ein stat-Walk")
+    p_search.add_argument("--profile", choices=("cprofile", "tracemalloc"), default=DEFAULT_PROFILE,
+                          help="Profil ins Laufprotokoll (cProfile: nur der Hauptprozess, also mit --jobs 1)")
+    p_search.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+
+    p_batch = sub.add_parser("batch", help="Anfrageliste (CSV: Name, Geburtsdatum) in einem Durchlauf abarbeiten")
+    p_batch.add_argument("--queries", required=True, help="CSV mit Name und Geburtsdatum je Zeile (Kopfzeile optional)")
+    p_batch.add_argument("--dir", required=True, help="Suchverzeichnis (rekursiv)")
+    p_batch.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="Anzahl Prozesse (Standard: Kerne)")
+    p_batch.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    p_batch.add_argument("--no-archives", dest="archives", action="store_false",
+                         help="Archive (.zip/.tar/.gz) nicht mitdurchsuchen")
+    p_batch.add_argument("--profile", choices=("cprofile", "tracemalloc"), default=DEFAULT_PROFILE,
+                         help="Profil ins Laufprotokoll (cProfile: nur der Hauptprozess, also mit --jobs 1)")
+    p_batch.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+
+    p_bloom = sub.add_parser("bloom", help="Bloom-Schnellfilter für ein Verzeichnis aufbauen/aktualisieren")
+    p_bloom.add_argument("--dir", help="Verzeichnis (ohne: nur Statistik ausgeben)")
+    p_bloom.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+
+    p_snap = sub.add_parser("snapshot", help="Bestand einmal parsen und als kompakten Snapshot (mmap) ablegen")
+    p_snap.add_argument("--dir", required=True, help="Verzeichnis (rekursiv)")
+    p_snap.add_argument("--out", required=True, help="Snapshot-Datei (z. B. archiv.tdsnap)")
+    p_snap.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="Anzahl Prozesse (Standard: Kerne)")
+    p_snap.add_argument("--no-archives", dest="archives", action="store_false",
+                        help="Archive (.zip/.tar/.gz) nicht mitdurchsuchen")
+    p_snap.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+
+    p_serve = sub.add_parser("serve", help="lokaler Suchdienst: ein warmer Index für mehrere Clients (HTTP/JSON)")
+    p_serve.add_argument("--dir", required=True, help="Verzeichnis (rekursiv), das der Dienst beobachtet")
+    p_serve.add_argument("--host", default=None, help="Adresse (Standard: 127.0.0.1 – nur dieser Rechner)")
+    p_serve.add_argument("--port", type=int, default=None, help="Port (Standard: 8737)")
+    p_serve.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="Prozesse für den Aufbau (Standard: Kerne)")
+    p_serve.add_argument("--no-archives", dest="archives", action="store_false",
+                         help="Archive (.zip/.tar/.gz) nicht mitdurchsuchen")
+    p_serve.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+
+    p_cat = sub.add_parser("cat", help="Datei oder Archiv-Mitglied (a.zip!/x.xml aus dem Export) nach stdout")
+    p_cat.add_argument("path")
+    p_cat.add_argument("--verbose", "-v", action="store_true", help="Debug-Ausgaben nach stderr")
+    return parser
+
+
+def _batch(args) -> int:
+    """'truffledog batch': alle Anfragen der Liste in einem Durchlauf, Treffer samt Anfrage nach stdout."""
+    try:
+        with open(args.queries, encoding="utf-8-sig", newline="") as fh:
+            queries = read_batch_queries(fh)
+    except (OSError, ValueError) as e:
+        print(f"Anfrageliste nicht lesbar: {e}", file=sys.stderr)
+        return 1
+    if not os.path.isdir(args.dir):
+        print(f"Verzeichnis nicht gefunden: {args.dir}", file=sys.stderr)
+        return 1
+    scanner = FileScanner(args.dir, archives=args.archives).start()
+    run = RunLog("batch", {"queries": args.queries, "count": len(queries), "dir": args.dir, "jobs": args.jobs},
+                 args.profile)
+
+    def rows():
+        for _, entries in search_batch(scanner, queries, max(1, args.jobs), stats=run.stats):
+            yield from entries
+
+    count = None
+    try:
+        with run.profiled():
+            count = write_results(rows(), sys.stdout, args.format, BATCH_COLUMNS)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        scanner.close()
+        run.finish(hits=count)
+    debug(f"{count} Treffer für {len(queries)} Anfragen.")
+    return 0
+
+
+def _bloom(directory: str | None) -> int:
+    """'truffledog bloom': Schnellfilter aufbauen und Kennzahlen (inkl. erwarteter FP-Rate) ausgeben."""
+    from truffledog_bloom import BloomCache
+    cache = BloomCache()
+    if directory is not None:
+        if not os.path.isdir(directory):
+            print(f"Verzeichnis nicht gefunden: {directory}", file=sys.stderr)
+            return 1
+        print(json.dumps(cache.build(directory)))
+    print(json.dumps(cache.stats()))
+    return 0
+
+
+def _snapshot(args) -> int:
+    """'truffledog snapshot': Bestand parsen und als Snapshot schreiben, Kennzahlen als JSON."""
+    from truffledog_snapshot import export_snapshot
+    if not os.path.isdir(args.dir):
+        print(f"Verzeichnis nicht gefunden: {args.dir}", file=sys.stderr)
+        return 1
+    try:
+        stats = export_snapshot(args.dir, args.out, archives=args.archives, jobs=max(1, args.jobs))
+    except OSError as e:
+        print(f"Snapshot nicht geschrieben: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(stats))
+    return 0
+
+
+def _serve(args) -> int:
+    """'truffledog serve': Suchdienst starten (läuft bis Strg+C)."""
+    from truffledog_server import SearchServer, DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+    if not os.path.isdir(args.dir):
+        print(f"Verzeichnis nicht gefunden: {args.dir}", file=sys.stderr)
+        return 1
+    server = SearchServer(args.dir, args.host or DEFAULT_SERVER_HOST,
+                          DEFAULT_SERVER_PORT if args.port is None else args.port,
+                          jobs=max(1, args.jobs), archives=args.archives)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Suchdienst nicht gestartet: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _cat(path: str) -> int:
+    """'truffledog cat': virtuelle Pfade aus CSV/JSONL wieder lesbar machen."""
+    try:
+        copy_virtual(path, sys.stdout.buffer)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (FileNotFoundError, *_ARCHIVE_ERRORS) as e:
+        print(f"Nicht lesbar: {path}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Einstieg für 'truffledog search|batch|bloom|snapshot|serve|cat …'. Rückgabe = Exit-Code."""
+    global VERBOSE
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    VERBOSE = args.verbose
+    if args.command == "cat":
+        return _cat(args.path)
+    if args.command == "bloom":
+        return _bloom(args.dir)
+    if args.command == "batch":
+        return _batch(args)
+    if args.command == "snapshot":
+        return _snapshot(args)
+    if args.command == "serve":
+        return _serve(args)
+
+    if not args.birth and not args.name:
+        parser.error("mindestens --birth oder --name angeben")
+    search_type = "both" if args.birth and args.name else ("birth" if args.birth else "name")
+    if args.birth:
+        try:
+            _date_bounds(args.birth)
+        except ValueError as e:
+            parser.error(str(e))
+    try:
+        backend = resolve_parser(args.parser, args.recover)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.recover and (args.index or args.snapshot or args.server is not None or args.engine == "tree"):
+        parser.error("--recover gilt nur für die Suche über die Dateien "
+                     "(nicht mit --index, --snapshot, --server oder --engine tree)")
+    if not os.path.isdir(args.dir):
+        print(f"Verzeichnis nicht gefunden: {args.dir}", file=sys.stderr)
+        return 1
+
+    params = {"search_type": search_type, "birth": args.birth, "name": args.name, "dir": args.dir,
+              "engine": args.engine, "parser": backend, "recover": args.recover, "jobs": args.jobs,
+              "index": args.index, "prefilter": args.prefilter,
+              "archives": args.archives, "bloom": args.bloom, "cache": args.cache, "fuzzy": args.fuzzy,
+              "group": args.group, "snapshot": args.snapshot, "server": args.server}
+    run = RunLog("search", params, args.profile)
+    scanner = None
+    remote_errors: tuple = ()
+    if args.server is not None:
+        from truffledog_server import SearchClient, ServerError, SERVER_URL
+        client = SearchClient(args.server or SERVER_URL)
+        remote_errors = (ConnectionError, TimeoutError, ServerError)
+        rows = (row for page in client.search(args.dir, search_type, args.birth, args.name, fuzzy=args.fuzzy)
+                for row in page)
+    elif args.snapshot:
+        from truffledog_snapshot import Snapshot
+        try:
+            snapshot = Snapshot(args.snapshot)
+        except (OSError, ValueError) as e:
+            print(f"Snapshot nicht lesbar: {e}", file=sys.stderr)
+            return 1
+        with snapshot:
+            if snapshot.directory != os.path.abspath(args.dir):
+                print(f"Snapshot gehört zu {snapshot.directory}, nicht zu {args.dir}", file=sys.stderr)
+                return 1
+            rows = iter(snapshot.search(search_type, args.birth, args.name,
+                                        matcher=fuzzy_matcher(search_type, args.birth, args.name, args.fuzzy)))
+    elif args.index:
+        from truffledog_index import PersonIndex
+        index = PersonIndex()
+        # Vor jeder Abfrage abgleichen: bei unverändertem Baum nur ein stat je Datei, neue/geänderte
+        # Dateien werden geparst – so antwortet --index wie die Live-Suche, nicht mit dem Stand von gestern.
+        run.stats["index"] = index.refresh(args.dir, archives=args.archives)
+        rows = iter(index.search(args.dir, search_type, args.birth, args.name, fuzzy=args.fuzzy,
+                                 archives=args.archives))
+    else:
+        bloom = None
+        if args.bloom:
+            from truffledog_bloom import BloomCache
+            bloom = BloomCache()
+        if args.cache:
+            from truffledog_cache import QueryCache, DEFAULT_CACHE_PATH, cache_key, search_cached
+            scanner = FileScanner(args.dir, archives=args.archives, fingerprint=True).start()
+            batches = search_files(scanner, search_type, args.birth, args.name, args.engine, max(1, args.jobs),
+                                   scanner.stop_event, args.prefilter, stats=run.stats, bloom=bloom,
+                                   matcher=fuzzy_matcher(search_type, args.birth, args.name, args.fuzzy),
+                                   parser=backend, recover=args.recover)
+            key = cache_key(search_type, args.birth, args.name, args.dir, args.archives, args.fuzzy, args.recover,
+                            backend)
+            rows = (row for _, entries in search_cached(QueryCache(DEFAULT_CACHE_PATH), key, scanner, batches,
+                                                        scanner.stop_event, run.stats)
+                    for row in entries)
+        else:
+            rows = search(args.dir, search_type, args.birth, args.name, args.engine, max(1, args.jobs),
+                          prefilter=args.prefilter, archives=args.archives, bloom=bloom, stats=run.stats,
+                          fuzzy=args.fuzzy, parser=backend, recover=args.recover)
+
+    count = None
+    try:
+        with run.profiled():
+            if args.group:
+                groups = PersonGroups()
+                groups.extend(rows)
+                run.stats["groups"] = len(groups)
+                write_results(groups, sys.stdout, args.format, GROUP_COLUMNS)
+                count = sum(groups.counts)
+            else:
+                count = write_results(rows, sys.stdout, args.format)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # z.B. "| head": Leser ist weg, das ist kein Fehler. stdout auf devnull umbiegen,
+        # sonst meckert Python beim Beenden nochmal über die Pipe.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except remote_errors as e:
+        print(f"Suchdienst ({client.url}): {e}", file=sys.stderr)
+        return 1
+    finally:
+        if scanner is not None:
+            scanner.close()
+        run.finish(hits=count)
+    debug(f"{count} Treffer.")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    # Über den echten Modulnamen starten: sonst gäbe es __main__ und truffledog doppelt
+    # (eigenes VERBOSE, und die Pool-Worker müssten __main__ statt truffledog importieren).
+    import truffledog
+    sys.exit(truffledog.main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – Bloom-Filter je Datei (Schnellfilter, eine mmap-Datei)
+# -----------------------------------------------------------------------------
+# Der SQLite-Index ist schwer für Shares, die sich ständig ändern. Der Mittelweg: pro Datei
+# ein kleiner Bloom-Filter über Geburtsdaten und Namens-Trigramme. Bei der Suche schließt er
+# die meisten Dateien aus, ohne sie zu öffnen (nur ein stat für mtime/Größe).
+# - Bloom-Filter sagen "sicher nicht" oder "vielleicht" – nie falsch negativ.
+# - Geänderte/neue Dateien (mtime oder Größe anders) kennt der Filter nicht → normale Suche.
+# - Alles liegt in einer Datei, die per mmap geladen und je Prozess einmal gehalten wird
+#   (auch die Pool-Worker laden sie nur einmal, nicht pro Block).
+# -----------------------------------------------------------------------------
+
+import os
+import math
+import mmap
+import struct
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+
+from truffledog import debug, iter_persons, iter_xml_files, _date_bounds, _normalize_birth
+
+# Wie der Index: im Benutzerprofil, nicht auf dem Share.
+DEFAULT_BLOOM_PATH = os.path.join(os.path.expanduser("~"), ".truffledog", "bloom.bin")
+
+# Ziel-Falsch-Positiv-Rate je Abfrage-Element; daraus folgen Bits je Element und Anzahl Hashes.
+BLOOM_FP_RATE = 0.01
+BLOOM_HASHES = max(1, round(-math.log2(BLOOM_FP_RATE)))
+
+# Zeiträume über mehr Jahre prüfe ich nicht mehr Jahr für Jahr (wie beim Byte-Vorfilter).
+_MAX_BLOOM_YEARS = 300
+
+# Dateiaufbau: Kopf | Einträge | Pfade (UTF-8) | Filterbits
+_MAGIC = b"TDBLOOM1"
+_HEADER = struct.Struct("<8sIII")      # Magic, Version, Hashes, Anzahl Einträge
+_ENTRY = struct.Struct("<QIdQQI")      # Pfad-Offset, Pfad-Länge, mtime, Größe, Bits-Offset, Anzahl Bits
+_VERSION = 2  # 2: kaputte Dateien mit vollem Filter ("vielleicht") statt leerem – alte Caches neu bauen
+
+# Geladene Caches je Prozess: Pfad → (mtime_ns der Cache-Datei, _Loaded)
+_LOADED: dict[str, tuple[int, "_Loaded"]] = {}
+_LOADED_LOCK = threading.Lock()
+
+
+def _hash_pair(item: str) -> tuple[int, int]:
+    """Zwei 64-Bit-Hashes für Double Hashing (Position i = h1 + i*h2)."""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def person_items(name: str, birth: str) -> set[str]:
+    """
+    Elemente, die eine Person in den Filter ihrer Datei einträgt:
+    r:<Rohdatum> (exakte Suche vergleicht den Rohstring), y:/m: aus dem normalisierten Datum
+    (Jahr/Monat/Zeitraum) und t:<Trigramm> aus name.lower() (Teilstring-Suche).
+    """
+    items = {"r:" + birth}
+    norm = _normalize_birth(birth)
+    if norm:
+        items.add("y:" + norm[:4])
+        items.add("m:" + norm[:7])
+    items.update("t:" + tri for tri in _trigrams(name.lower()))
+    return items
+
+
+def _filter_bits(items: set[str], k: int) -> tuple[bytes, int]:
+    """Baut den Filter für eine Datei: Größe nach n und BLOOM_FP_RATE, auf ganze Bytes gerundet."""
+    if not items:
+        return b"", 0
+    nbits = max(64, math.ceil(-len(items) * math.log(BLOOM_FP_RATE) / math.log(2) ** 2))
+    nbits = (nbits + 7) // 8 * 8
+    bits = bytearray(nbits // 8)
+    for item in items:
+        h1, h2 = _hash_pair(item)
+        for i in range(k):
+            pos = (h1 + i * h2) % nbits
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return bytes(bits), nbits
+
+
+class _Loaded:
+    """Eine geöffnete Cache-Datei: mmap plus Pfad-Tabelle (Pfad → mtime, Größe, Bits-Offset, Bits)."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as fh:
+            self.mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.k, count = _HEADER.unpack_from(self.mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.mm.close()
+            raise ValueError(f"Unbekanntes Bloom-Cache-Format: {path}")
+        table_end = _HEADER.size + count * _ENTRY.size
+        self.entries: dict[str, tuple[float, int, int, int]] = {}
+        for path_off, path_len, mtime, size, bits_off, nbits in _ENTRY.iter_unpack(self.mm[_HEADER.size:table_end]):
+            self.entries[self.mm[path_off:path_off + path_len].decode("utf-8")] = (mtime, size, bits_off, nbits)
+
+    def contains(self, bits_off: int, nbits: int, h1: int, h2: int) -> bool:
+        if nbits == 0:
+            return False
+        mm = self.mm
+        for i in range(self.k):
+            pos = (h1 + i * h2) % nbits
+            if not mm[bits_off + (pos >> 3)] >> (pos & 7) & 1:
+                return False
+        return True
+
+    def close(self) -> None:
+        self.mm.close()
+
+
+def _load(path: str) -> _Loaded | None:
+    """Cache-Datei laden (je Prozess einmal, neu bei geänderter Datei); None, wenn es keine gibt."""
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _LOADED_LOCK:
+        cached = _LOADED.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            loaded = _Loaded(path)
+        except (OSError, ValueError, struct.error) as e:
+            debug(f"Bloom-Cache nicht lesbar ({path}): {e}")
+            return None
+        _LOADED[path] = (stamp, loaded)
+        return loaded
+
+
+def _release(path: str) -> None:
+    """Eigene mmap schließen, bevor die Datei ersetzt wird (Windows lässt sonst kein os.replace zu)."""
+    with _LOADED_LOCK:
+        cached = _LOADED.pop(path, None)
+    if cached is not None:
+        cached[1].close()
+
+
+class BloomQuery:
+    """
+    Eine Abfrage gegen den Bloom-Cache. check(path) liefert False (sicher kein Treffer),
+    True (vielleicht) oder None (Datei unbekannt/geändert → normal suchen).
+    Picklebar: an die Pool-Worker gehen nur Cache-Pfad und vorberechnete Hashes.
+    """
+
+    def __init__(self, cache_path: str, date_any: list[tuple[int, int]] | None,
+                 name_all: list[tuple[int, int]] | None) -> None:
+        self.cache_path = cache_path
+        self.date_any = date_any      # mindestens eines muss drin sein (None = Datum nicht prüfen)
+        self.name_all = name_all      # alle müssen drin sein (None = Name nicht prüfen)
+
+    def check(self, file_path: str) -> bool | None:
+        loaded = _load(self.cache_path)
+        if loaded is None:
+            return None
+        entry = loaded.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        mtime, size, bits_off, nbits = entry
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if st.st_mtime != mtime or st.st_size != size:
+            return None
+        if self.date_any is not None and not any(loaded.contains(bits_off, nbits, h1, h2) for h1, h2 in self.date_any):
+            return False
+        if self.name_all is not None and not all(loaded.contains(bits_off, nbits, h1, h2) for h1, h2 in self.name_all):
+            return False
+        return True
+
+
+class BloomCache:
+    """
+    Schnellfilter-Cache: je Datei ein Bloom-Filter, alle zusammen in einer mmap-Datei.
+    - build(dir) parst nur neue/geänderte Dateien (mtime+Größe), Filter unveränderter Dateien
+      werden übernommen; Einträge anderer Verzeichnisse bleiben stehen.
+    - query(...) liefert einen BloomQuery für search_files (bloom=…), oder None, wenn es nichts zu filtern gibt.
+    - stats() liefert Größe und erwartete Falsch-Positiv-Rate; die beobachtete zählt search_files mit.
+    """
+
+    def __init__(self, path: str = DEFAULT_BLOOM_PATH) -> None:
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def query(self, search_type: str, date_str: str, name_value: str) -> BloomQuery | None:
+        if not self.exists():
+            return None
+        date_any = None
+        if search_type in ("birth", "both") and date_str:
+            bounds = _date_bounds(date_str)
+            if bounds is None:
+                date_any = ["r:" + date_str]
+            elif bounds[0][:7] == bounds[1][:7]:
+                date_any = ["m:" + bounds[0][:7]]
+            elif int(bounds[1][:4]) - int(bounds[0][:4]) < _MAX_BLOOM_YEARS:
+                date_any = [f"y:{year:04d}" for year in range(int(bounds[0][:4]), int(bounds[1][:4]) + 1)]
+        name_all = None
+        needle = name_value.lower()
+        if search_type in ("name", "both") and len(needle) >= 3:
+            name_all = sorted("t:" + tri for tri in _trigrams(needle))
+        if date_any is None and name_all is None:
+            return None
+        return BloomQuery(self.path,
+                          [_hash_pair(item) for item in date_any] if date_any is not None else None,
+                          [_hash_pair(item) for item in name_all] if name_all is not None else None)
+
+    def build(self, directory: str, stop_event: threading.Event | None = None, progress=None) -> dict[str, int]:
+        """
+        Gleicht den Cache mit dem Verzeichnis ab und liefert Zähler (neu/geändert, unverändert,
+        entfernt, Parse-Fehler). progress(done, total) wird pro Datei aufgerufen.
+        Geschrieben wird erst am Ende in eine Temp-Datei, dann os.replace – ein Abbruch lässt den alten Stand.
+        """
+        root = os.path.join(os.path.abspath(directory), "")
+        xml_files = [os.path.abspath(p) for p in iter_xml_files(directory, stop_event)]
+        old = _load(self.path)
+        k = old.k if old is not None else BLOOM_HASHES
+        records: dict[str, tuple[float, int, bytes, int]] = {}
+        if old is not None:
+            # Andere Wurzeln unverändert übernehmen; unter dieser Wurzel entscheidet der Walk.
+            for path, (mtime, size, bits_off, nbits) in old.entries.items():
+                records[path] = (mtime, size, old.mm[bits_off:bits_off + nbits // 8], nbits)
+        stale = {p for p in records if p.startswith(root)}
+        stats = {"built": 0, "unchanged": 0, "removed": 0, "errors": 0}
+
+        total = len(xml_files)
+        for idx, file_path in enumerate(xml_files, start=1):
+            if stop_event is not None and stop_event.is_set():
+                debug("Bloom-Cache: Aufbau abgebrochen, alter Stand bleibt.")
+                return stats
+            stale.discard(file_path)
+            try:
+                st = os.stat(file_path)
+                known = records.get(file_path)
+                if known is not None and known[0] == st.st_mtime and known[1] == st.st_size:
+                    stats["unchanged"] += 1
+                else:
+                    items: set[str] = set()
+                    try:
+                        for name, birth in iter_persons(file_path):
+                            items |= person_items(name, birth)
+                        bits, nbits = _filter_bits(items, k)
+                    except ET.ParseError:
+                        # Kaputte Datei: tolerant geparst (recover) kann sie Treffer liefern, je nach Parser
+                        # auch hinter dem Fehler → alle Bits gesetzt, sie bleibt immer "vielleicht".
+                        bits, nbits = b"\xff" * 8, 64
+                        stats["errors"] += 1
+                    records[file_path] = (st.st_mtime, st.st_size, bits, nbits)
+                    stats["built"] += 1
+            except OSError as e:
+                debug(f"Bloom-Cache: Datei nicht lesbar {file_path}: {e}")
+            if progress is not None:
+                progress(idx, total)
+
+        for path in stale:
+            del records[path]
+        stats["removed"] = len(stale)
+        self._write(records, k)
+        debug(f"Bloom-Cache aktualisiert: {stats}")
+        return stats
+
+    def _write(self, records: dict[str, tuple[float, int, bytes, int]], k: int) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        paths = sorted(records)
+        encoded = [p.encode("utf-8") for p in paths]
+        path_start = _HEADER.size + len(paths) * _ENTRY.size
+        bits_start = path_start + sum(len(e) for e in encoded)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, _VERSION, k, len(paths)))
+            path_off, bits_off = path_start, bits_start
+            for path, raw in zip(paths, encoded):
+                mtime, size, bits, nbits = records[path]
+                fh.write(_ENTRY.pack(path_off, len(raw), mtime, size, bits_off, nbits))
+                path_off += len(raw)
+                bits_off += len(bits)
+            for raw in encoded:
+                fh.write(raw)
+            for path in paths:
+                fh.write(records[path][2])
+        _release(self.path)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Überblick: Dateien, Dateigröße und erwartete Falsch-Positiv-Rate je Element-Abfrage
+        (aus dem Füllgrad der Filter: (Anteil gesetzter Bits)^k, gemittelt bzw. Maximum).
+        """
+        loaded = _load(self.path)
+        if loaded is None:
+            return {"files": 0, "bytes": 0, "expected_fp_mean": 0.0, "expected_fp_max": 0.0}
+        rates = []
+        for _, _, bits_off, nbits in loaded.entries.values():
+            if nbits:
+                ones = sum(bin(b).count("1") for b in loaded.mm[bits_off:bits_off + nbits // 8])
+                rates.append((ones / nbits) ** loaded.k)
+        return {
+            "files": len(loaded.entries),
+            "bytes": len(loaded.mm),
+            "expected_fp_mean": sum(rates) / len(rates) if rates else 0.0,
+            "expected_fp_max": max(rates, default=0.0),
+        }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – Query-Cache (LRU im Speicher, optional in SQLite persistiert)
+# -----------------------------------------------------------------------------
+# Dieselbe Abfrage kommt oft mehrfach (nach einem Telefonat nochmal nachsehen …) und kostete
+# jedes Mal einen kompletten Durchlauf. Der Cache merkt sich die Treffer je Abfrage zusammen mit
+# dem Fingerabdruck des Verzeichnisses (Pfad/mtime/Größe aller Dateien, siehe FileScanner).
+# Ein Treffer zählt nur, wenn der Fingerabdruck noch exakt stimmt – veraltet ist er so nie.
+# -----------------------------------------------------------------------------
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from truffledog import FileScanner, debug
+
+# So viele Trefferzeilen hält der Cache insgesamt (Speicher bzw. Datei); ältere Einträge fliegen raus (LRU).
+QUERY_CACHE_MAX_ROWS = 1_000_000
+
+# Größere Ergebnisse cache ich gar nicht erst – die sind ohnehin nicht "mal eben nachsehen".
+QUERY_CACHE_MAX_ENTRY_ROWS = 50_000
+
+# Persistenter Cache (CLI --cache; GUI nur mit QUERY_CACHE_PERSIST).
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".truffledog", "query_cache.sqlite")
+QUERY_CACHE_PERSIST = False
+
+
+def cache_key(search_type: str, date_str: str, name_value: str, directory: str, archives: bool,
+              fuzzy: bool = False, recover: bool = False, parser: str | None = None) -> str:
+    """
+    Schlüssel einer Abfrage. Normalisiert wird nur, was die Treffer nachweislich nicht ändert:
+    Name klein (person_matches vergleicht ohnehin mit lower()), was die Suchart ignoriert, fällt weg,
+    und das Verzeichnis als absoluter Pfad. Unscharfe Suche ist ein eigener Eintrag, tolerantes
+    Parsen (recover, Treffer aus kaputten Dateien) auch – und zwar je Backend: parser ist das
+    aufgelöste Backend (resolve_parser), denn lxml liest hinter einem Fehler weiter, expat und etree
+    hören dort auf. Ohne recover liefern alle Backends dieselben Treffer, parser zählt dann nicht.
+    """
+    name = name_value.lower() if search_type in ("name", "both") else ""
+    date = date_str if search_type in ("birth", "both") else ""
+    directory = os.path.normcase(os.path.abspath(directory))
+    key = [search_type, date, name, directory, bool(archives)]
+    if fuzzy and name:
+        key.append("fuzzy")
+    if recover:
+        key += ["recover", parser or ""]
+    return json.dumps(key, ensure_ascii=False)
+
+
+class QueryCache:
+    """
+    LRU-Cache Abfrage → (Fingerabdruck, Treffer).
+    - Speicher: OrderedDict, begrenzt über die Summe der Zeilen (max_rows).
+    - path gesetzt: zusätzlich SQLite-Datei (zlib-komprimiertes JSON je Eintrag), gleiche Grenze.
+    - get() mit abweichendem Fingerabdruck löscht den Eintrag (der Baum hat sich geändert).
+    Thread-sicher über ein Lock; jede DB-Operation öffnet ihre eigene Verbindung (wie PersonIndex).
+    """
+
+    def __init__(self, path: str | None = None, max_rows: int = QUERY_CACHE_MAX_ROWS,
+                 max_entry_rows: int = QUERY_CACHE_MAX_ENTRY_ROWS) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self.max_entry_rows = max_entry_rows
+        self._mem: OrderedDict[str, tuple[str, list[tuple]]] = OrderedDict()
+        self._mem_rows = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                            key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, rows INTEGER NOT NULL,
+                            data BLOB NOT NULL, used REAL NOT NULL)""")
+        return conn
+
+    def size(self, key: str) -> int | None:
+        """Zeilenzahl des Eintrags (egal ob noch gültig) oder None – für search_cached."""
+        with self._lock:
+            if key in self._mem:
+                return len(self._mem[key][1])
+        if self.path is None:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT rows FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str, fingerprint: str) -> list[tuple] | None:
+        """Treffer, falls vorhanden und der Fingerabdruck stimmt; ein veralteter Eintrag wird gelöscht."""
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[0] == fingerprint:
+                    self._mem.move_to_end(key)
+                    return entry[1]
+                self._drop_mem(key)
+        if self.path is None:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT fingerprint, data FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[0] != fingerprint:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        rows = [tuple(r) for r in json.loads(zlib.decompress(row[1]))]
+        self._put_mem(key, fingerprint, rows)
+        return rows
+
+    def put(self, key: str, fingerprint: str, rows: list[tuple]) -> None:
+        """Ergebnis ablegen (zu große Ergebnisse ignoriere ich, siehe max_entry_rows)."""
+        if len(rows) > self.max_entry_rows:
+            return
+        self._put_mem(key, fingerprint, rows)
+        if self.path is None:
+            return
+        data = zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                             (key, fingerprint, len(rows), data, time.time()))
+                # LRU auf der Platte: älteste Einträge löschen, bis die Summe wieder passt.
+                total = conn.execute("SELECT COALESCE(SUM(rows), 0) FROM entries").fetchone()[0]
+                for old_key, old_rows in conn.execute("SELECT key, rows FROM entries ORDER BY used").fetchall():
+                    if total <= self.max_rows:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    total -= old_rows
+        except sqlite3.Error as e:
+            debug(f"Query-Cache nicht gespeichert: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_rows = 0
+        if self.path is not None and os.path.exists(self.path):
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+
+    def _put_mem(self, key: str, fingerprint: str, rows: list[tuple]) -> None:
+        with self._lock:
+            self._drop_mem(key)
+            self._mem[key] = (fingerprint, rows)
+            self._mem_rows += len(rows)
+            while self._mem_rows > self.max_rows and len(self._mem) > 1:
+                self._drop_mem(next(iter(self._mem)))
+
+    def _drop_mem(self, key: str) -> None:
+        entry = self._mem.pop(key, None)
+        if entry is not None:
+            self._mem_rows -= len(entry[1])
+
+
+def search_cached(cache: QueryCache, key: str, scanner: FileScanner, batches, stop_event: threading.Event,
+                  stats: dict | None = None):
+    """
+    Legt den Cache um einen Suchlauf: batches ist search_files(...) über scanner (mit fingerprint=True).
+    Liefert wie search_files (verarbeitet, neue Treffer).
+    - Gibt es zur Abfrage einen Eintrag, halte ich die Live-Treffer zurück, bis der Walk fertig ist und
+      der Fingerabdruck feststeht: passt er, kommen die Cache-Treffer und die Suche wird beendet
+      (ein Treffer kostet also nur den Walk); sonst gehen die zurückgehaltenen Treffer normal raus.
+      Sind es schon mehr Live-Treffer als im Eintrag, ist der sicher veraltet – dann sofort weiter.
+    - Ohne Eintrag läuft alles wie gehabt (Walk und Parsen überlappen); ein vollständiger Lauf
+      landet danach im Cache. stats bekommt "cache" = "hit" / "miss".
+    """
+    stats = {} if stats is None else stats
+    held_size = cache.size(key)
+    held: list[tuple] | None = [] if held_size is not None else None
+    collected: list[tuple] | None = []
+    done = 0
+    stats["cache"] = "miss"
+
+    def verify():
+        return cache.get(key, scanner.fingerprint) if scanner.fingerprint is not None else None
+
+    try:
+        for done, entries in batches:
+            if collected is not None:
+                collected.extend(entries)
+                if len(collected) > cache.max_entry_rows:
+                    collected = None
+            if held is None:
+                yield done, entries
+                continue
+            held.extend(entries)
+            if scanner.finished:
+                rows = verify()
+                if rows is not None:
+                    stats["cache"] = "hit"
+                    debug(f"Treffer aus dem Query-Cache ({len(rows)}).")
+                    yield done, rows
+                    return
+            elif len(held) <= held_size:
+                yield done, []
+                continue
+            yield done, held
+            held = None
+        if held is not None:
+            # Lauf zu Ende, bevor ich nachsehen konnte (z. B. leeres Verzeichnis oder sehr schneller Lauf)
+            rows = verify() if not stop_event.is_set() else None
+            if rows is not None:
+                stats["cache"] = "hit"
+                yield done, rows
+                return
+            yield done, held
+        if collected is not None and not stop_event.is_set() and scanner.fingerprint is not None:
+            cache.put(key, scanner.fingerprint, collected)
+    finally:
+        batches.close()
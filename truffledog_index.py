@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – persistenter Personen-Index (SQLite)
+# -----------------------------------------------------------------------------
+# Eigenes Modul, damit "import truffledog" schlank bleibt: sqlite3 & Co. lade ich erst,
+# wenn wirklich jemand den Index will (GUI-Option, CLI --index).
+# -----------------------------------------------------------------------------
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+
+from truffledog import (
+    debug, iter_persons, iter_xml_files, iter_archive_members, is_archive, _date_bounds, _normalize_birth,
+    name_words, koelner_phonetik, fuzzy_word_matches, FUZZY_MAX_DISTANCE, FUZZY_MIN_LENGTH,
+    ARCHIVE_SEP, DEFAULT_ARCHIVES, _ARCHIVE_ERRORS,
+)
+
+# Bewusst im Benutzerprofil und nicht im Archiv – auf dem Share habe ich oft keine
+# Schreibrechte, und jeder soll seinen eigenen Stand haben.
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".truffledog", "index.sqlite")
+
+
+def _file_digest(file_path: str) -> str:
+    """Inhalts-Hash einer Datei (blake2b, blockweise gelesen)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_persons(file_path: str) -> tuple[list[tuple[str, str, str]], int]:
+    """
+    (Mitglied, Name, Geburtsdatum) einer Datei bzw. eines Archivs und die Zahl der Parse-Fehler.
+    Fehler wie bei der Live-Suche: eine kaputte Datei (bzw. ein kaputtes Mitglied) liefert nichts,
+    ein kaputtes Archiv alles bis zur Stelle. Mitglied "" = die Datei selbst.
+    """
+    if not is_archive(file_path):
+        try:
+            return [("", name, birth) for name, birth in iter_persons(file_path)], 0
+        except ET.ParseError:
+            debug(f"Fehler beim Parsen der Datei: {file_path}")
+            return [], 1
+    persons: list[tuple[str, str, str]] = []
+    errors = 0
+    try:
+        for member, fh in iter_archive_members(file_path):
+            try:
+                found = list(iter_persons(fh))
+            except ET.ParseError:
+                debug(f"Fehler beim Parsen der Datei: {file_path}{ARCHIVE_SEP}{member}")
+                errors += 1
+                continue
+            persons.extend((member, name, birth) for name, birth in found)
+    except _ARCHIVE_ERRORS as e:
+        debug(f"Archiv nicht (vollständig) lesbar: {file_path}: {e}")
+    return persons, errors
+
+
+def _deletion_keys(word: str, k: int = FUZZY_MAX_DISTANCE) -> set[str]:
+    """
+    Löschnachbarn: alle Varianten mit bis zu k gestrichenen Zeichen (inkl. word selbst).
+    Liegen zwei Wörter höchstens k Tippfehler auseinander, haben sie einen gemeinsamen Nachbarn –
+    so findet die unscharfe Suche ihre Kandidaten über einen B-Baum statt über alle Wörter.
+    """
+    keys = {word}
+    frontier = {word}
+    for _ in range(k):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        keys |= frontier
+    return keys
+
+
+def _path_range(directory: str) -> tuple[str, str]:
+    """Pfad-Präfix als Bereich [lo, hi) – so nutzt SQLite den Index auf files.path statt LIKE-Scan."""
+    prefix = os.path.join(os.path.abspath(directory), "")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PersonIndex:
+    """
+    Persistenter Personen-Index in SQLite: (Name, Name klein, Geburtsdatum, Datei, Archiv-Mitglied).
+    - Dateien sind über Pfad, mtime, Größe und Inhalts-Hash erfasst – Archive (archives=True, wie
+      bei der Live-Suche) als Ganzes; ihre Personen tragen den Mitgliedsnamen.
+    - refresh() parst nur neue/geänderte Dateien und löscht Zeilen gelöschter Dateien.
+    - search() liefert exakt die Treffer von search_in_xml – nur eben aus der DB.
+    - Namens-Teilstrings laufen über einen FTS5-Trigramm-Index (falls SQLite ihn kann),
+      kürzere Suchbegriffe als 3 Zeichen über den linearen instr()-Scan.
+    - Unscharfe Suche (fuzzy=True) über ein Wortverzeichnis: jedes Namenswort einmal mit Kölner Code
+      und Löschnachbarn, dazu die Zuordnung Wort → Person. Tippfehler werden nur gegen die wenigen
+      Kandidaten gerechnet, nie gegen alle Personen.
+    Jede Methode öffnet ihre eigene Verbindung, damit der Index aus dem Suchthread nutzbar ist.
+    """
+
+    # Bei Schemaänderungen hochzählen – der Index ist nur ein Cache und wird dann neu aufgebaut.
+    SCHEMA_VERSION = 5
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            id          INTEGER PRIMARY KEY,
+            path        TEXT NOT NULL UNIQUE,
+            mtime       REAL NOT NULL,
+            size        INTEGER NOT NULL,
+            hash        TEXT NOT NULL,
+            parse_error INTEGER NOT NULL DEFAULT 0,
+            archive     INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS persons (
+            id         INTEGER PRIMARY KEY,
+            file_id    INTEGER NOT NULL,
+            seq        INTEGER NOT NULL,
+            member     TEXT NOT NULL DEFAULT '',
+            name       TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            birth      TEXT NOT NULL,
+            birth_norm TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS persons_file ON persons(file_id, seq);
+        CREATE INDEX IF NOT EXISTS persons_birth ON persons(birth);
+        CREATE INDEX IF NOT EXISTS persons_birth_norm ON persons(birth_norm);
+        CREATE TABLE IF NOT EXISTS roots (
+            path      TEXT PRIMARY KEY,
+            refreshed REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS name_words (
+            id   INTEGER PRIMARY KEY,
+            word TEXT NOT NULL UNIQUE,
+            code TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS name_words_code ON name_words(code);
+        CREATE TABLE IF NOT EXISTS name_word_keys (
+            key     TEXT NOT NULL,
+            word_id INTEGER NOT NULL,
+            PRIMARY KEY (key, word_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS person_words (
+            word_id   INTEGER NOT NULL,
+            person_id INTEGER NOT NULL,
+            PRIMARY KEY (word_id, person_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS person_words_person ON person_words(person_id);
+        CREATE TRIGGER IF NOT EXISTS persons_words_ad AFTER DELETE ON persons BEGIN
+            DELETE FROM person_words WHERE person_id = old.id;
+        END;
+    """
+
+    # Trigramm-Index über name_lower. case_sensitive 1, weil name_lower schon mit str.lower()
+    # gefaltet ist – so ist ein Phrasen-MATCH exakt derselbe Teilstring-Test wie in Python.
+    # External Content: der Text liegt nur einmal (in persons), Trigger halten FTS synchron.
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS person_names USING fts5(
+            name_lower, content='persons', content_rowid='id', tokenize='trigram case_sensitive 1'
+        );
+        CREATE TRIGGER IF NOT EXISTS persons_ai AFTER INSERT ON persons BEGIN
+            INSERT INTO person_names(rowid, name_lower) VALUES (new.id, new.name_lower);
+        END;
+        CREATE TRIGGER IF NOT EXISTS persons_ad AFTER DELETE ON persons BEGIN
+            INSERT INTO person_names(person_names, rowid, name_lower) VALUES ('delete', old.id, old.name_lower);
+        END;
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH) -> None:
+        self.db_path = db_path
+        self.has_fts = True  # wird beim ersten Connect geprüft
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._reset_schema(conn)
+        conn.executescript(self.SCHEMA)
+        try:
+            conn.executescript(self.FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            # Ältere SQLite-Builds ohne FTS5/Trigramm: dann eben linear (gleiche Treffer, nur langsamer).
+            if self.has_fts:
+                debug(f"[INFO] Kein FTS5-Trigramm-Index verfügbar ({e}) – Namenssuche linear.")
+            self.has_fts = False
+        return conn
+
+    def _reset_schema(self, conn: sqlite3.Connection) -> None:
+        """Verwirft einen Index mit altem Schema (wird beim nächsten Refresh neu aufgebaut)."""
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'files'").fetchone():
+            debug("Index-Schema veraltet – Index wird neu aufgebaut.")
+        conn.executescript("""
+            DROP TRIGGER IF EXISTS persons_ai;
+            DROP TRIGGER IF EXISTS persons_ad;
+            DROP TRIGGER IF EXISTS persons_words_ad;
+            DROP TABLE IF EXISTS person_words;
+            DROP TABLE IF EXISTS name_word_keys;
+            DROP TABLE IF EXISTS name_words;
+            DROP TABLE IF EXISTS person_names;
+            DROP TABLE IF EXISTS persons;
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS roots;
+        """)
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def last_refresh(self, directory: str) -> float | None:
+        """Zeitpunkt des letzten vollständigen Refresh für dieses Verzeichnis (oder None)."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT refreshed FROM roots WHERE path = ?",
+                               (os.path.abspath(directory),)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def refresh(self, directory: str, stop_event: threading.Event | None = None, progress=None,
+                archives: bool = DEFAULT_ARCHIVES) -> dict[str, int]:
+        """
+        Gleicht den Index mit dem Verzeichnis ab und liefert Zähler
+        (neu, geändert, unverändert, gelöscht, Parse-Fehler).
+        - mtime+Größe gleich → nichts tun (nur stat, kein Lesen).
+        - sonst Hash vergleichen; nur bei anderem Inhalt wird neu geparst.
+        - Gelöschte Dateien räume ich nur nach vollständigem Durchlauf ab (Abbruch = halber Walk).
+        - archives=True nimmt Archive mit (wie die Live-Suche); mit False bleiben schon erfasste
+          Archive unangetastet im Index.
+        progress(done, total) wird pro Datei aufgerufen.
+        """
+        root = os.path.abspath(directory)
+        xml_files = list(iter_xml_files(root, archives=archives))
+
+        stats = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0, "errors": 0}
+        conn = self._connect()
+        try:
+            lo, hi = _path_range(root)
+            known = {path: (file_id, mtime, size, digest) for file_id, path, mtime, size, digest in conn.execute(
+                "SELECT id, path, mtime, size, hash FROM files WHERE path >= ? AND path < ? AND (? OR archive = 0)",
+                (lo, hi, archives))}
+            vocab: dict[str, int] = dict(conn.execute("SELECT word, id FROM name_words"))
+            total = len(xml_files)
+            for idx, file_path in enumerate(xml_files, start=1):
+                if stop_event is not None and stop_event.is_set():
+                    debug("Index-Refresh abgebrochen.")
+                    conn.commit()
+                    return stats
+                try:
+                    st = os.stat(file_path)
+                    entry = known.pop(file_path, None)
+                    if entry and entry[1] == st.st_mtime and entry[2] == st.st_size:
+                        stats["unchanged"] += 1
+                    else:
+                        digest = _file_digest(file_path)
+                        if entry and entry[3] == digest:
+                            # Nur "angefasst" (touch/Kopie) – Inhalt gleich, also kein Re-Parse.
+                            conn.execute("UPDATE files SET mtime = ?, size = ? WHERE id = ?",
+                                         (st.st_mtime, st.st_size, entry[0]))
+                            stats["unchanged"] += 1
+                        else:
+                            self._index_file(conn, file_path, st, digest, entry[0] if entry else None, stats, vocab)
+                            stats["changed" if entry else "new"] += 1
+                except OSError as e:
+                    debug(f"Index: Datei nicht lesbar {file_path}: {e}")
+                if idx % 200 == 0:
+                    conn.commit()
+                if progress is not None:
+                    progress(idx, total)
+
+            # Was jetzt noch in 'known' steht, gibt es nicht mehr.
+            for file_id, *_ in known.values():
+                conn.execute("DELETE FROM persons WHERE file_id = ?", (file_id,))
+                conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            stats["removed"] = len(known)
+            conn.execute("INSERT OR REPLACE INTO roots(path, refreshed) VALUES (?, ?)", (root, time.time()))
+            conn.commit()
+        finally:
+            conn.close()
+        debug(f"Index-Refresh fertig: {stats}")
+        return stats
+
+    @staticmethod
+    def _index_file(conn: sqlite3.Connection, file_path: str, st: os.stat_result, digest: str,
+                    file_id: int | None, stats: dict[str, int], vocab: dict[str, int]) -> None:
+        """Parst eine Datei bzw. ein Archiv und ersetzt ihre Personen (samt Namenswörtern, vocab: Wort → id)."""
+        # Kaputte Dateien liefern wie bei der Live-Suche keine Treffer, werden aber erfasst,
+        # damit ich sie nicht bei jedem Refresh erneut parse.
+        persons, errors = _read_persons(file_path)
+        stats["errors"] += errors
+        parse_error, archive = int(errors > 0), int(is_archive(file_path))
+        if file_id is None:
+            file_id = conn.execute(
+                "INSERT INTO files(path, mtime, size, hash, parse_error, archive) VALUES (?, ?, ?, ?, ?, ?)",
+                (file_path, st.st_mtime, st.st_size, digest, parse_error, archive)).lastrowid
+        else:
+            conn.execute("UPDATE files SET mtime = ?, size = ?, hash = ?, parse_error = ?, archive = ? WHERE id = ?",
+                         (st.st_mtime, st.st_size, digest, parse_error, archive, file_id))
+            conn.execute("DELETE FROM persons WHERE file_id = ?", (file_id,))
+        conn.executemany(
+            "INSERT INTO persons(file_id, seq, member, name, name_lower, birth, birth_norm) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((file_id, seq, member, name, name.lower(), birth, _normalize_birth(birth))
+             for seq, (member, name, birth) in enumerate(persons)))
+        PersonIndex._index_words(conn, file_id, vocab)
+
+    @staticmethod
+    def _index_words(conn: sqlite3.Connection, file_id: int, vocab: dict[str, int]) -> None:
+        """Namenswörter der Personen einer Datei ins Wortverzeichnis (für die unscharfe Suche)."""
+        links: list[tuple[int, int]] = []
+        by_name: dict[str, list[int]] = {}  # Namen wiederholen sich in einer Liste oft
+        for person_id, name in conn.execute("SELECT id, name FROM persons WHERE file_id = ?", (file_id,)).fetchall():
+            word_ids = by_name.get(name)
+            if word_ids is None:
+                word_ids = by_name[name] = []
+                for word in set(name_words(name)):
+                    word_id = vocab.get(word)
+                    if word_id is None:
+                        # Neues Wort: Code und Löschnachbarn nur dieses eine Mal rechnen.
+                        word_id = conn.execute("INSERT INTO name_words(word, code) VALUES (?, ?)",
+                                               (word, koelner_phonetik(word))).lastrowid
+                        vocab[word] = word_id
+                        if len(word) >= FUZZY_MIN_LENGTH:
+                            conn.executemany("INSERT OR IGNORE INTO name_word_keys(key, word_id) VALUES (?, ?)",
+                                             ((key, word_id) for key in _deletion_keys(word)))
+                    word_ids.append(word_id)
+            links.extend((word_id, person_id) for word_id in word_ids)
+        conn.executemany("INSERT OR IGNORE INTO person_words(word_id, person_id) VALUES (?, ?)", links)
+
+    def search(self, directory: str, search_type: str, date_str: str, name_value: str,
+               fuzzy: bool = False, archives: bool = DEFAULT_ARCHIVES) -> list[tuple[str, str, str]]:
+        """
+        Beantwortet birth/name/both aus dem Index. Semantik wie person_matches:
+        exakter ISO-String beim vollen Datum, Bereich auf birth_norm bei Jahr/Monat/Zeitraum
+        (B-Baum-Range-Scan statt Durchlaufen aller Dateien), Teilstring case-insensitive beim Namen.
+        Das Kleinschreiben mache ich in Python (str.lower), nicht mit SQLite-lower() –
+        das kennt nur ASCII und würde bei Umlauten andere Treffer liefern.
+        fuzzy=True: Name wie FuzzyMatcher (wortweise, siehe _fuzzy_words, oder als Teilstring),
+        gleiche Treffer wie die Live-Suche.
+        Treffer aus Archiven tragen den Pfad "Archiv!/Mitglied" (ARCHIVE_SEP); archives=False lässt sie weg.
+        """
+        conn = self._connect()
+        try:
+            where, params = [], []
+            source = "persons p"
+            if search_type in ("birth", "both"):
+                bounds = _date_bounds(date_str)
+                if bounds is None:
+                    where.append("p.birth = ?")
+                    params.append(date_str)
+                else:
+                    where.append("p.birth_norm BETWEEN ? AND ? AND p.birth_norm != ''")
+                    params.extend(bounds)
+            if search_type in ("name", "both"):
+                needle = name_value.lower()
+                if fuzzy:
+                    # Wortweise unscharf ODER Teilstring wie sonst (über FTS, damit es kein Scan wird)
+                    # Eine Id-Menge (UNION), damit SQLite von ihr aus nachschlägt statt alle Personen zu prüfen;
+                    # CROSS JOIN legt die Reihenfolge fest: von den paar Suchwörtern aus, nicht über alle Zuordnungen.
+                    slots = self._fuzzy_words(conn, name_value)
+                    if self.has_fts and len(needle) >= 3:
+                        exact = "SELECT rowid FROM person_names WHERE person_names MATCH ?"
+                        phrase = '"' + needle.replace('"', '""') + '"'
+                    else:
+                        exact, phrase = "SELECT id FROM persons WHERE instr(name_lower, ?) > 0", needle
+                    where.append(f"p.id IN (SELECT w.person_id FROM query_words q CROSS JOIN person_words w "
+                                 f"ON w.word_id = q.word_id GROUP BY w.person_id HAVING COUNT(DISTINCT q.slot) = ? "
+                                 f"UNION {exact})")
+                    params.extend((slots, phrase))
+                elif search_type == "name" and self.has_fts and len(needle) >= 3:
+                    # Trigramm-Lookup; bei "both" ist der Datums-Index selektiver, da bleibt instr().
+                    source = "person_names n JOIN persons p ON p.id = n.rowid"
+                    where.append("person_names MATCH ?")
+                    params.append('"' + needle.replace('"', '""') + '"')
+                else:
+                    where.append("instr(p.name_lower, ?) > 0")
+                    params.append(needle)
+            if not where:
+                return []
+            if not archives:
+                where.append("f.archive = 0")
+            lo, hi = _path_range(directory)
+            sql = (
+                f"SELECT p.name, p.birth, f.path, p.member FROM {source} JOIN files f ON f.id = p.file_id "
+                f"WHERE f.path >= ? AND f.path < ? AND {' AND '.join(where)} ORDER BY f.path, p.seq"
+            )
+            return [(name or "Unbekannt", birth, f"{path}{ARCHIVE_SEP}{member}" if member else path)
+                    for name, birth, path, member in conn.execute(sql, (lo, hi, *params))]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _fuzzy_words(conn: sqlite3.Connection, name_value: str) -> int:
+        """
+        Füllt die temporäre Tabelle query_words (slot = Suchwort, word_id = passendes Namenswort)
+        und liefert die Zahl der Suchwörter (0 = kein Wort → kein Treffer).
+        Kandidaten: gleiches Wort, gleicher Kölner Code, gemeinsamer Löschnachbar; geprüft wird
+        danach mit fuzzy_word_matches – dieselbe Regel wie beim FuzzyMatcher der Live-Suche.
+        """
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_words (slot INTEGER NOT NULL, word_id INTEGER NOT NULL)")
+        conn.execute("DELETE FROM query_words")
+        words = list(dict.fromkeys(name_words(name_value)))
+        for slot, query_word in enumerate(words):
+            query_code = koelner_phonetik(query_word)
+            candidates = conn.execute("SELECT id, word, code FROM name_words WHERE word = ? OR code = ?",
+                                      (query_word, query_code)).fetchall()
+            if len(query_word) >= FUZZY_MIN_LENGTH:
+                keys = sorted(_deletion_keys(query_word))
+                candidates += conn.execute(
+                    "SELECT w.id, w.word, w.code FROM name_word_keys k JOIN name_words w ON w.id = k.word_id "
+                    f"WHERE k.key IN ({','.join('?' * len(keys))})", keys).fetchall()
+            matched = {word_id for word_id, word, code in candidates
+                       if fuzzy_word_matches(query_word, query_code, word, code)}
+            conn.executemany("INSERT INTO query_words(slot, word_id) VALUES (?, ?)",
+                             ((slot, word_id) for word_id in matched))
+        return len(words)
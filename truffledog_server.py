@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – lokaler Suchdienst (asyncio, HTTP/JSON) mit einem warmen Live-Index
+# -----------------------------------------------------------------------------
+# Mehrere Kolleginnen und Kollegen durchsuchen denselben Share, und jede GUI hat ihn bisher
+# selbst durchkämmt. Der Suchdienst hält EINEN Live-Index (truffledog_watch.py) warm – einmal
+# eingelesen, danach laufend abgeglichen – und beantwortet Abfragen aller Clients daraus.
+# - Nur Standardbibliothek: asyncio.start_server und ein schlankes HTTP/1.1 (GET, Connection: close).
+# - GET /status → JSON (Verzeichnis, bereit, Personen, Dateien, Fortschritt beim Aufbau)
+# - GET /search?type=birth|name|both&date=…&name=…&fuzzy=1&dir=… → JSON Lines, seitenweise:
+#     {"progress": [fertig, gesamt]}   solange der Index noch aufgebaut wird (hält die Verbindung offen)
+#     {"rows": [[Name, Datum, Datei], …]}   je Seite SERVER_PAGE_SIZE Treffer
+#     {"done": true, "hits": n, "seconds": s}   zum Schluss
+# - Die Suche selbst läuft in einem Thread (asyncio.to_thread), die Event-Loop bedient derweil
+#   die anderen Clients; höchstens SERVER_MAX_SEARCHES Suchen gleichzeitig.
+# Standardmäßig nur auf 127.0.0.1 – der Dienst prüft keine Anmeldung.
+# -----------------------------------------------------------------------------
+
+import os
+import json
+import time
+import asyncio
+import threading
+import http.client
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from truffledog import DEFAULT_ARCHIVES, debug, fuzzy_matcher, _date_bounds
+from truffledog_watch import LiveIndex
+
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8737
+
+# Adresse, die GUI und CLI als Client ansprechen (Umgebungsvariable TRUFFLEDOG_SERVER überschreibt).
+SERVER_URL = os.environ.get("TRUFFLEDOG_SERVER") or f"http://{DEFAULT_SERVER_HOST}:{DEFAULT_SERVER_PORT}"
+
+# Treffer je Seite im Antwort-Stream.
+SERVER_PAGE_SIZE = 1000
+
+# So viele Suchen laufen gleichzeitig in Threads; weitere warten (die Event-Loop bleibt frei).
+SERVER_MAX_SEARCHES = 4
+
+# Wartezeit des Clients auf die nächste Zeile bzw. des Servers auf die Anfragezeile (Sekunden).
+SERVER_TIMEOUT_S = 60.0
+
+# Abstand der Fortschrittszeilen, solange der Index noch aufgebaut wird.
+_PROGRESS_INTERVAL_S = 1.0
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 503: "Service Unavailable"}
+
+
+class ServerError(Exception):
+    """Der Suchdienst hat die Anfrage abgelehnt bzw. die Antwort brach ab (Meldung vom Dienst)."""
+
+
+def _query_params(params: dict[str, str]) -> tuple[str, str, str, bool]:
+    """Prüft die Abfrage wie die GUI/CLI (Suchart, Datum, Name) – ValueError mit Meldung sonst."""
+    search_type = params.get("type", "")
+    if search_type not in ("name", "birth", "both"):
+        raise ValueError("type muss name, birth oder both sein")
+    date_str = params.get("date", "") if search_type in ("birth", "both") else ""
+    name_value = params.get("name", "") if search_type in ("name", "both") else ""
+    if search_type in ("birth", "both"):
+        if not date_str:
+            raise ValueError("Datum fehlt")  # _date_bounds("") wäre der volle Bereich – also alle Personen
+        _date_bounds(date_str)  # ValueError bei ungültigem Datum
+    if search_type in ("name", "both") and not name_value:
+        raise ValueError("Name fehlt")
+    return search_type, date_str, name_value, params.get("fuzzy") == "1"
+
+
+class SearchServer:
+    """
+    Der Suchdienst für ein Verzeichnis. run() blockiert (asyncio.run), stop() beendet ihn aus
+    einem anderen Thread. Der Index wird nach dem Start im Hintergrund aufgebaut; Anfragen, die
+    vorher kommen, bekommen Fortschrittszeilen und dann ihre Treffer. port=0 wählt einen freien Port
+    (nach listening.wait() steht er in self.port).
+    """
+
+    def __init__(self, directory: str, host: str = DEFAULT_SERVER_HOST, port: int = DEFAULT_SERVER_PORT,
+                 jobs: int = 1, archives: bool = DEFAULT_ARCHIVES, page_size: int = SERVER_PAGE_SIZE) -> None:
+        self.live = LiveIndex(directory, archives=archives, jobs=jobs)
+        self.host = host
+        self.port = port
+        self.page_size = page_size
+        self.listening = threading.Event()
+        self.progress = (0, 0)
+        self._closing = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._build: asyncio.Future | None = None
+        self._searches: asyncio.Semaphore | None = None
+
+    def run(self) -> None:
+        asyncio.run(self._serve())
+
+    def stop(self) -> None:
+        self._closing.set()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._searches = asyncio.Semaphore(SERVER_MAX_SEARCHES)
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._build = asyncio.ensure_future(asyncio.to_thread(self._warm_up))
+        debug(f"Suchdienst für {self.live.directory} auf http://{self.host}:{self.port}")
+        self.listening.set()
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            self._closing.set()
+            self.live.close()
+            debug("Suchdienst beendet.")
+
+    def _warm_up(self) -> None:
+        """Erster Aufbau (im Thread), danach gleicht der Live-Index selbst im Hintergrund ab."""
+        stats = self.live.update(self._closing, self._set_progress)
+        if stats.get("cancelled"):
+            raise RuntimeError("Aufbau abgebrochen")
+        self.live.watch()
+
+    def _set_progress(self, done: int, total: int) -> None:
+        self.progress = (done, total)
+
+    # --- HTTP ---------------------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), SERVER_TIMEOUT_S)
+            while (await asyncio.wait_for(reader.readline(), SERVER_TIMEOUT_S)).strip():
+                pass  # Kopfzeilen brauche ich nicht
+            method, target, _ = request.decode("latin-1").split(" ", 2)
+            url = urlsplit(target)
+            params = dict(parse_qsl(url.query))
+            if method != "GET":
+                await self._reply(writer, 405, {"error": "nur GET"})
+            elif url.path == "/status":
+                await self._reply(writer, 200, self._status())
+            elif url.path == "/search":
+                await self._search(writer, params)
+            else:
+                await self._reply(writer, 404, {"error": f"unbekannt: {url.path}"})
+        except (ValueError, asyncio.TimeoutError, ConnectionError) as e:
+            debug(f"Suchdienst: Anfrage verworfen ({e!r})")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _head(writer: asyncio.StreamWriter, status: int, content_type: str) -> None:
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                     f"Connection: close\r\n\r\n".encode("ascii"))
+
+    async def _reply(self, writer: asyncio.StreamWriter, status: int, body: dict) -> None:
+        self._head(writer, status, "application/json; charset=utf-8")
+        writer.write(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+        await writer.drain()
+
+    @staticmethod
+    async def _line(writer: asyncio.StreamWriter, message: dict) -> None:
+        writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()  # Gegendruck: ein langsamer Client bremst nur seine eigene Antwort
+
+    def _status(self) -> dict:
+        done, total = self.progress
+        return {"directory": self.live.directory, "ready": self.live.ready, "persons": self.live.persons,
+                "files": self.live.files, "progress": [done, total]}
+
+    async def _search(self, writer: asyncio.StreamWriter, params: dict[str, str]) -> None:
+        try:
+            search_type, date_str, name_value, fuzzy = _query_params(params)
+        except ValueError as e:
+            await self._reply(writer, 400, {"error": str(e)})
+            return
+        directory = params.get("dir")
+        if directory and os.path.normcase(os.path.abspath(directory)) != os.path.normcase(self.live.directory):
+            await self._reply(writer, 409, {"error": f"Der Suchdienst beobachtet {self.live.directory}"})
+            return
+        self._head(writer, 200, "application/x-ndjson; charset=utf-8")
+        while not self._build.done():
+            await self._line(writer, {"progress": list(self.progress)})
+            await asyncio.wait({self._build}, timeout=_PROGRESS_INTERVAL_S)
+        if self._build.exception() is not None:
+            await self._line(writer, {"error": f"Index nicht verfügbar: {self._build.exception()}"})
+            return
+        t0 = time.perf_counter()
+        async with self._searches:
+            rows = await asyncio.to_thread(self.live.search, search_type, date_str, name_value,
+                                           fuzzy_matcher(search_type, date_str, name_value, fuzzy))
+        seconds = time.perf_counter() - t0
+        for start in range(0, len(rows), self.page_size):
+            await self._line(writer, {"rows": rows[start:start + self.page_size]})
+        await self._line(writer, {"done": True, "hits": len(rows), "seconds": round(seconds, 3)})
+        debug(f"Suchdienst: {search_type} {date_str or '-'} {name_value or '-'} → {len(rows)} Treffer "
+              f"in {seconds * 1000:.0f} ms")
+
+
+class SearchClient:
+    """
+    Blockierender Client für GUI und CLI (http.client, ein Request je Verbindung).
+    search() liefert die Treffer seitenweise als Listen von Tupeln – wie die Batches der Live-Suche.
+    Verbindungsprobleme kommen als OSError, Ablehnungen des Dienstes als ServerError.
+    """
+
+    def __init__(self, url: str = SERVER_URL, timeout: float = SERVER_TIMEOUT_S) -> None:
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or DEFAULT_SERVER_HOST
+        self.port = parts.port or DEFAULT_SERVER_PORT
+        self.timeout = timeout
+        self.last: dict = {}  # Abschlusszeile der letzten Suche (hits, seconds)
+
+    def _get(self, path: str, params: dict | None = None) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request("GET", path + (f"?{urlencode(params)}" if params else ""))
+            response = conn.getresponse()
+            if response.status != 200:
+                body = response.read()
+                try:
+                    message = json.loads(body).get("error", body)
+                except ValueError:
+                    message = body.decode("utf-8", "replace")
+                raise ServerError(f"{response.status}: {message}")
+        except BaseException:
+            conn.close()
+            raise
+        return conn, response
+
+    def status(self) -> dict:
+        conn, response = self._get("/status")
+        try:
+            return json.loads(response.read())
+        finally:
+            conn.close()
+
+    def search(self, directory: str | None, search_type: str, date_str: str = "", name_value: str = "",
+               fuzzy: bool = False, progress=None):
+        """
+        Generator über die Trefferseiten. progress(done, total) bekommt den Aufbau-Fortschritt,
+        solange der Dienst noch einliest. Abbrechen: Generator schließen (schließt die Verbindung).
+        """
+        params = {"type": search_type, "date": date_str, "name": name_value}
+        if fuzzy:
+            params["fuzzy"] = "1"
+        if directory:
+            params["dir"] = os.path.abspath(directory)
+        conn, response = self._get("/search", params)
+        try:
+            for line in response:
+                message = json.loads(line)
+                if "rows" in message:
+                    yield [tuple(row) for row in message["rows"]]
+                elif "progress" in message:
+                    if progress is not None:
+                        progress(*message["progress"])
+                elif message.get("done"):
+                    self.last = message
+                    return
+                else:
+                    raise ServerError(message.get("error", line))
+        finally:
+            conn.close()
+        raise ServerError("Antwort des Suchdienstes vorzeitig beendet")
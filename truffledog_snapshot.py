@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – Snapshot: der ganze Bestand als kompakte Spalten-Datei (mmap)
+# -----------------------------------------------------------------------------
+# Das Teure an jeder Suche ist das XML-Parsen – durchsucht werden aber nur Name und Datum je
+# Person. Der Snapshot parst den Bestand einmal (über den Live-Index, also mit Archiven und
+# Prozess-Pool) und legt nur diese Spalten ab:
+# - Pfade als String-Tabelle (jede Datei einmal), je Person nur die Datei-Nummer (uint32)
+# - Namen und Namen klein als UTF-8-Blob mit Start-Offsets – die Namenssuche ist ein find() über
+#   den Blob direkt in der mmap, die Person dazu liefert bisect über die Offsets
+# - Geburtsdaten roh als String-Tabelle (es gibt nur ein paar zehntausend verschiedene) plus Nummer
+#   je Person, und normalisiert als int32 JJJJMMTT (0 = nicht lesbar) für Zeiträume
+# Laden heißt: mmap öffnen, Pfad- und Datumstabelle dekodieren – die Spalten bleiben auf der Platte,
+# das Betriebssystem holt nur, was eine Suche anfasst. Mit NumPy laufen die Datumsspalten als
+# Vektor-Vergleich, ohne als Schleife über memoryview bzw. find() auf den Bytes (gleiche Treffer).
+# Die Treffer sind dieselben wie bei der Live-Suche – zum Stand des Exports (kein Abgleich danach).
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from truffledog import DEFAULT_ARCHIVES, debug, _date_bounds, _normalize_birth
+from truffledog_watch import LiveIndex
+
+try:
+    import numpy as np
+except ImportError:  # ohne NumPy geht es auch, nur die Datumsspalten sind dann langsamer
+    np = None
+
+# Ab so vielen Namens-Fundstellen je Person (Kehrwert) prüfe ich jeden Namen statt find() je Fundstelle.
+DENSE_NAME_RATIO = 8
+
+# Dateiendung, die GUI und CLI vorschlagen.
+SNAPSHOT_SUFFIX = ".tdsnap"
+
+# Dateiaufbau: Kopf | Abschnittstabelle (Offset, Länge je Abschnitt) | Abschnitte (je auf 8 Byte ausgerichtet)
+_MAGIC = b"TDSNAP01"
+_HEADER = struct.Struct("<8sIIII")     # Magic, Version, Personen, Dateien, verschiedene Rohdaten
+_SECTION = struct.Struct("<QQ")
+_VERSION = 1
+_SECTIONS = ("meta", "paths", "path_ends", "file_ids", "names", "name_ends", "lowered", "lower_ends",
+             "births", "birth_ends", "birth_ids", "dates")
+_SEP = "\0"
+
+
+def _date_key(value: str) -> int:
+    """Normalisiertes Datum als int32 JJJJMMTT (0 = nicht lesbar) – gleiche Ordnung wie der ISO-String."""
+    return int(value.replace("-", "")) if value else 0
+
+
+def _append_column(blob: bytearray, ends: array, text: str, char_ends) -> None:
+    """
+    Hängt eine Spalte eines Live-Index-Teils an (text = _SEP + Felder durch _SEP getrennt + _SEP).
+    Im Blob steht jedes Feld mit abschließendem \\0; ends bekommt die Byte-Starts. Bei reinem ASCII
+    sind das die Zeichenpositionen des Teils, sonst rechne ich die UTF-8-Längen nach.
+    """
+    raw = text[1:].encode("utf-8")
+    base = len(blob)
+    if len(raw) == len(text) - 1:
+        ends.extend(base + pos for pos in char_ends[:-1])
+    else:
+        lengths = (len(value.encode("utf-8")) + 1 for value in text[1:-1].split(_SEP))
+        ends.extend(accumulate(lengths, initial=base))
+        ends.pop()
+    blob += raw
+
+
+def export_snapshot(directory: str, path: str, archives: bool = DEFAULT_ARCHIVES, jobs: int = 1,
+                    stop_event: threading.Event | None = None, progress=None, live: LiveIndex | None = None) -> dict:
+    """
+    Parst den Bestand (bzw. nimmt live, einen schon aufgebauten Live-Index) und schreibt den Snapshot.
+    Liefert Zähler (Dateien, Personen, Parse-Fehler, Bytes, Sekunden; "cancelled" bei Abbruch – dann
+    bleibt eine vorhandene Datei unverändert). progress(done, total) läuft beim Parsen mit.
+    """
+    t0 = time.perf_counter()
+    if live is None:
+        live = LiveIndex(directory, archives=archives, jobs=jobs)
+    update = live.update(stop_event, progress)
+    if update.get("cancelled"):
+        return {"cancelled": True}
+
+    paths: list[str] = []
+    file_ids = array("I")
+    names, name_ends = bytearray(), array("Q")
+    lowered, lower_ends = bytearray(), array("Q")
+    birth_table: dict[str, int] = {}
+    birth_ids = array("I")
+    for part in live.parts():
+        file_ids.extend(array("I", [len(paths)]) * part.count)
+        paths.append(part.path)
+        _append_column(names, name_ends, part.names, part.name_ends)
+        _append_column(lowered, lower_ends, part.lowered, part.lower_ends)
+        birth_ids.extend(birth_table.setdefault(birth, len(birth_table)) for birth in part.births[1:-1].split(_SEP))
+    births = list(birth_table)
+    dates = array("i", (_date_key(_normalize_birth(birth)) for birth in births))
+    dates = array("i", (dates[i] for i in birth_ids))
+
+    meta = {"directory": os.path.abspath(directory), "created": time.time(), "archives": archives,
+            "byteorder": sys.byteorder, "errors": update["errors"]}
+    sections = {"meta": json.dumps(meta, ensure_ascii=False).encode("utf-8"), "file_ids": file_ids,
+                "names": names, "lowered": lowered, "birth_ids": birth_ids, "dates": dates}
+    for column, values in (("paths", paths), ("births", births)):
+        blob, ends = bytearray(), array("Q")
+        for value in values:
+            ends.append(len(blob))
+            blob += value.encode("utf-8") + b"\0"
+        sections[column] = blob
+        sections[column[:-1] + "_ends"] = ends
+    for column, ends, blob in (("name_ends", name_ends, names), ("lower_ends", lower_ends, lowered)):
+        ends.append(len(blob))
+        sections[column] = ends
+    sections["path_ends"].append(len(sections["paths"]))
+    sections["birth_ends"].append(len(sections["births"]))
+
+    _write(path, sections, len(file_ids), len(paths), len(births))
+    stats = {"files": update["files"], "parts": len(paths), "persons": len(file_ids), "errors": update["errors"],
+             "bytes": os.path.getsize(path), "seconds": round(time.perf_counter() - t0, 3)}
+    debug(f"Snapshot geschrieben ({path}): {stats}")
+    return stats
+
+
+def _write(path: str, sections: dict, persons: int, files: int, births: int) -> None:
+    """Alles in eine Temp-Datei, dann os.replace – ein Abbruch oder Fehler lässt den alten Snapshot."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    table_end = _HEADER.size + len(_SECTIONS) * _SECTION.size
+    offsets, pos = [], table_end
+    for name in _SECTIONS:
+        pos = (pos + 7) // 8 * 8
+        size = memoryview(sections[name]).nbytes
+        offsets.append((pos, size))
+        pos += size
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, persons, files, births))
+        for offset, size in offsets:
+            fh.write(_SECTION.pack(offset, size))
+        for name, (offset, _) in zip(_SECTIONS, offsets):
+            fh.write(b"\0" * (offset - fh.tell()))
+            fh.write(sections[name])
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """
+    Ein geladener Snapshot (read-only mmap). search() wie LiveIndex.search, close() gibt die Datei frei.
+    use_numpy: None = NumPy, falls installiert; False erzwingt die Variante ohne (für den Benchmark).
+    Nach dem Laden nur lesend – mehrere Threads dürfen gleichzeitig suchen.
+    """
+
+    def __init__(self, path: str, use_numpy: bool | None = None) -> None:
+        self.path = path
+        self.numpy = np is not None and use_numpy is not False
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            magic, version, self.persons, files, births = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Unbekanntes Snapshot-Format: {path}")
+            self._sections = dict(zip(_SECTIONS, _SECTION.iter_unpack(
+                self._mm[_HEADER.size:_HEADER.size + len(_SECTIONS) * _SECTION.size])))
+            self.meta = json.loads(self._raw("meta").decode("utf-8"))
+            if self.meta["byteorder"] != sys.byteorder:
+                raise ValueError(f"Snapshot von einer Plattform mit anderer Byte-Reihenfolge: {path}")
+            self.directory = self.meta["directory"]
+            self.paths = self._table("paths", "path_ends", files)
+            self._births = self._table("births", "birth_ends", births)
+            self._birth_index = {birth: i for i, birth in enumerate(self._births)}
+            self._name_ends = self._view("name_ends", "Q")
+            self._lower_ends = self._view("lower_ends", "Q")
+            self._file_ids = self._view("file_ids", "I")
+            self._birth_ids = self._view("birth_ids", "I")
+            self._dates = self._view("dates", "i")
+            # Für ganze Spalten die NumPy-Sicht auf dieselben Bytes; einzelne Personen über memoryview
+            # (ein NumPy-Skalar je Zugriff wäre langsamer als der int aus dem memoryview).
+            self._np = {name: self._column(name, typecode) for name, typecode in
+                        (("name_ends", "Q"), ("lower_ends", "Q"), ("file_ids", "I"), ("birth_ids", "I"),
+                         ("dates", "i"))} if self.numpy else {}
+        except (ValueError, KeyError, struct.error):
+            self.close()
+            raise
+
+    # --- Laden ------------------------------------------------------------------
+    def _raw(self, name: str) -> bytes:
+        offset, size = self._sections[name]
+        return self._mm[offset:offset + size]
+
+    def _view(self, name: str, typecode: str) -> memoryview:
+        offset, size = self._sections[name]
+        base = memoryview(self._mm)
+        view = base[offset:offset + size]
+        cast = view.cast(typecode)
+        self._views += [base, view, cast]
+        return cast
+
+    def _column(self, name: str, typecode: str):
+        offset, size = self._sections[name]
+        dtype = np.dtype(typecode)
+        return np.frombuffer(self._mm, dtype=dtype, count=size // dtype.itemsize, offset=offset)
+
+    def _table(self, blob: str, ends: str, count: int) -> list[str]:
+        """String-Tabelle komplett dekodieren (Pfade, Rohdaten – klein gegen die Personen)."""
+        text = self._raw(blob).decode("utf-8")
+        values = text[:-1].split(_SEP) if count else []
+        if len(values) != count:
+            raise ValueError(f"Snapshot beschädigt ({blob}): {self.path}")
+        return values
+
+    def close(self) -> None:
+        """mmap freigeben (unter Windows sonst kein Überschreiben der Datei)."""
+        self._np = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        try:
+            self._mm.close()
+        except BufferError:  # hält noch jemand eine NumPy-Spalte, räumt der GC die mmap später weg
+            pass
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Suche ------------------------------------------------------------------
+    def _find_names(self, needle: str) -> list[int]:
+        """
+        Personen, deren Name klein needle enthält: find() über den Blob in der mmap, die Nummer per
+        bisect über die Offsets (mit NumPy: alle Fundstellen sammeln, dann ein searchsorted).
+        Kommt needle sehr oft vor (z. B. ein einzelner Buchstabe), teile ich die Spalte stattdessen
+        einmal auf und prüfe jeden Namen – das ist dann billiger als ein find() je Fundstelle.
+        """
+        raw = needle.encode("utf-8")
+        offset, size = self._sections["lowered"]
+        ends, mm, end = self._lower_ends, self._mm, offset + size
+        limit = self.persons // DENSE_NAME_RATIO
+        found: list[int] = []
+        pos = mm.find(raw, offset, end)
+        while pos != -1:
+            if len(found) > limit:
+                return [i for i, name in enumerate(mm[offset:end - 1].split(b"\0")) if raw in name]
+            if self.numpy:
+                found.append(pos - offset)
+                pos = mm.find(raw, pos + len(raw), end)
+            else:
+                i = bisect_right(ends, pos - offset) - 1
+                found.append(i)
+                pos = mm.find(raw, offset + ends[i + 1], end)
+        if self.numpy and found:
+            return np.unique(np.searchsorted(self._np["lower_ends"], found, side="right") - 1).tolist()
+        return found
+
+    def _select_dates(self, date_str: str, candidates: list[int] | None = None) -> list[int]:
+        """
+        Personen (aus candidates bzw. allen), deren Datum passt – Semantik wie person_matches:
+        volles Datum = gleicher Rohstring (über die Datumsnummer), sonst Zeitraum auf JJJJMMTT.
+        Kandidaten prüfe ich einzeln, ganze Spalten mit NumPy als Vektor-Vergleich.
+        """
+        bounds = _date_bounds(date_str)
+        if bounds is None:
+            wanted = self._birth_index.get(date_str)
+            if wanted is None:
+                return []
+            if candidates is not None:
+                ids = self._birth_ids
+                return [i for i in candidates if ids[i] == wanted]
+            if self.numpy:
+                return np.flatnonzero(self._np["birth_ids"] == wanted).tolist()
+            return self._find_id(wanted)
+        lo, hi = _date_key(bounds[0]), _date_key(bounds[1])
+        dates = self._dates
+        if candidates is not None:
+            return [i for i in candidates if lo <= dates[i] <= hi]
+        if self.numpy:
+            dates = self._np["dates"]
+            return np.flatnonzero((dates >= lo) & (dates <= hi)).tolist()
+        return [i for i, d in enumerate(dates) if lo <= d <= hi]
+
+    def _find_id(self, wanted: int) -> list[int]:
+        """Ohne NumPy: Datumsnummer als 4 Bytes per find() in der Spalte suchen (nur ausgerichtete Funde)."""
+        pattern = struct.pack("=I", wanted)
+        offset, size = self._sections["birth_ids"]
+        mm, end = self._mm, offset + size
+        found: list[int] = []
+        pos = mm.find(pattern, offset, end)
+        while pos != -1:
+            if (pos - offset) % 4 == 0:
+                found.append((pos - offset) // 4)
+                pos = mm.find(pattern, pos + 4, end)
+            else:
+                pos = mm.find(pattern, pos + 1, end)
+        return found
+
+    def search(self, search_type: str, date_str: str = "", name_value: str = "", matcher=None) -> list[tuple]:
+        """
+        Treffer (Name, Geburtsdatum, Datei) wie die Live-Suche, in Walk-Reihenfolge des Exports.
+        matcher: FuzzyMatcher (unscharfe Namenssuche) – Datum trotzdem über die Spalten, Name per matcher.
+        """
+        if search_type not in ("name", "birth", "both"):
+            return []
+        if matcher is not None:
+            date_query = matcher.date_str or None
+        else:
+            date_query = date_str if search_type in ("birth", "both") else None
+        needle = name_value.lower() if matcher is None and search_type in ("name", "both") else ""
+
+        # Namens-Fundstellen per find(), das Datum dann je Fundstelle; ohne Namen die ganze Datumsspalte.
+        candidates = self._find_names(needle) if needle else None
+        if date_query is not None:
+            candidates = self._select_dates(date_query, candidates)
+        return self._rows(candidates, matcher)
+
+    def _rows(self, candidates: list[int] | None, matcher=None) -> list[tuple]:
+        """Trefferzeilen zu den Personennummern (None = alle); mit NumPy die Spalten vorab als Vektor holen."""
+        mm, base = self._mm, self._sections["names"][0]
+        births, paths = self._births, self.paths
+        if self.numpy:
+            idx = np.arange(self.persons) if candidates is None else np.asarray(candidates, dtype=np.int64)
+            ends = self._np["name_ends"]
+            rows = zip((ends[idx] + base).tolist(), (ends[idx + 1] + (base - 1)).tolist(),
+                       self._np["birth_ids"][idx].tolist(), self._np["file_ids"][idx].tolist())
+        else:
+            ends, birth_ids, file_ids = self._name_ends, self._birth_ids, self._file_ids
+            rows = ((base + ends[i], base + ends[i + 1] - 1, birth_ids[i], file_ids[i])
+                    for i in (range(self.persons) if candidates is None else candidates))
+        found: list[tuple] = []
+        for start, stop, birth_id, file_id in rows:
+            name = mm[start:stop].decode("utf-8")
+            if matcher is not None and not matcher.name_matches(name):
+                continue
+            found.append((name or "Unbekannt", births[birth_id], paths[file_id]))
+        return found
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------
+# TruffleDog – Live-Index im Speicher (Ordner beobachten)
+# -----------------------------------------------------------------------------
+# Wer TruffleDog den ganzen Tag offen hat, während neue Lieferungen im Suchverzeichnis landen,
+# zahlte bisher bei jeder Suche wieder den kompletten Walk und alle Parser. Der Live-Index parst
+# den Baum einmal, hält die Personen kompakt im Speicher und gleicht danach nur noch ab:
+# - Ein Ordner, dessen mtime gleich geblieben ist, hat keine neuen/gelöschten Einträge – den lese
+#   ich gar nicht erst (ein stat je Ordner statt scandir + stat je Datei).
+# - Geänderte Ordner lese ich per scandir neu; geparst werden nur neue und geänderte Dateien
+#   (mtime/Größe), Gelöschtes fliegt raus. Die Kosten wachsen mit den Änderungen, nicht mit dem Baum.
+# - Dateien, die an Ort und Stelle überschrieben werden, ändern die Ordner-mtime nicht – die findet
+#   jeder WATCH_FULL_EVERY-te Abgleich (alle Ordner lesen, stat je Datei, geparst wird trotzdem nur Geändertes).
+# Die Treffer sind dieselben wie bei der Live-Suche (person_matches bzw. FuzzyMatcher, Archive inklusive).
+# -----------------------------------------------------------------------------
+
+import os
+import time
+import threading
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from truffledog import (
+    DEFAULT_ARCHIVES, ARCHIVE_SEP, debug, debug_file, iter_persons, iter_archive_members, is_archive,
+    person_matches, _date_bounds, _normalize_birth, _ARCHIVE_ERRORS,
+)
+
+# Abstand zwischen zwei Abgleichen im Hintergrund (Sekunden).
+WATCH_INTERVAL_S = 5.0
+
+# Jeder so-vielte Abgleich liest alle Ordner (findet auch an Ort und Stelle überschriebene Dateien).
+WATCH_FULL_EVERY = 12
+
+# Ordner, deren mtime jünger ist, lese ich beim nächsten Abgleich sicherheitshalber nochmal:
+# auf FAT/manchen Shares ist die mtime grob, eine Datei im selben Takt fiele sonst durch.
+WATCH_MTIME_SLACK_S = 2.0
+
+# Trenner in den Personen-Blobs – kann in XML-Text nicht vorkommen.
+_SEP = "\0"
+
+
+def _ends(values: list[str]) -> array:
+    """Positionen der Trenner im Blob _SEP + _SEP.join(values) + _SEP: Feld i = blob[ends[i] + 1:ends[i + 1]]."""
+    ends = array('I')
+    pos = 0
+    for value in values:
+        ends.append(pos)
+        pos += len(value) + 1
+    ends.append(pos)
+    return ends if pos < 1 << 32 else array('Q', ends)
+
+
+class _Part:
+    """
+    Personen einer Datei (bzw. eines Archiv-Mitglieds) kompakt: je Spalte ein String, Felder durch
+    _SEP getrennt (auch am Anfang und Ende), dazu die Trennerpositionen als array – ein paar Objekte
+    je Datei statt zwei Strings je Person, und jedes Feld ist ohne split() direkt greifbar.
+    - lowered: Namen klein für die Teilstring-Suche (eigene Positionen nur, falls lower() die Länge ändert)
+    - normalized: Geburtsdaten normalisiert, nur wenn sie vom Rohwert abweichen (meist steht ISO drin);
+      lo/hi sind das kleinste/größte davon – Datumsbereiche überspringen so ganze Dateien.
+    """
+
+    __slots__ = ("path", "count", "names", "name_ends", "lowered", "lower_ends", "births", "birth_ends",
+                 "normalized", "lo", "hi")
+
+    def __init__(self, path: str, persons: list[tuple[str, str]]) -> None:
+        names = [name for name, _ in persons]
+        births = [birth for _, birth in persons]
+        normalized = [_normalize_birth(b) for b in births]
+        valid = [b for b in normalized if b]
+        self.path = path
+        self.count = len(persons)
+        self.names = _SEP + _SEP.join(names) + _SEP
+        self.name_ends = _ends(names)
+        self.lowered = self.names.lower()
+        self.lower_ends = self.name_ends if len(self.lowered) == len(self.names) else \
+            _ends([name.lower() for name in names])
+        self.births = _SEP + _SEP.join(births) + _SEP
+        self.birth_ends = _ends(births)
+        self.normalized = None if normalized == births else _SEP + _SEP.join(normalized) + _SEP
+        self.lo = min(valid, default="")
+        self.hi = max(valid, default="")
+
+    def person(self, i: int) -> tuple[str, str]:
+        ne, be = self.name_ends, self.birth_ends
+        return self.names[ne[i] + 1:ne[i + 1]], self.births[be[i] + 1:be[i + 1]]
+
+
+def _find_persons(blob: str, ends: array, needle: str) -> list[int]:
+    """
+    Nummern der Personen, deren Feld im Blob needle enthält – find() über den ganzen Blob, die Nummer
+    per bisect über die Trennerpositionen (Python läuft nur je Fundstelle, nicht je Person).
+    needle mit _SEP an beiden Enden sucht ein ganzes Feld (exaktes Datum).
+    """
+    found: list[int] = []
+    pos = blob.find(needle)
+    while pos != -1:
+        i = bisect_right(ends, pos) - 1
+        found.append(i)
+        pos = blob.find(needle, ends[i + 1])
+    return found
+
+
+def _parse_path(path: str) -> tuple[list[_Part], int]:
+    """Datei bzw. Archiv → (Teile, Parse-Fehler). Fehler wie bei der Live-Suche: eine kaputte
+    Datei (bzw. ein kaputtes Mitglied) liefert nichts, ein kaputtes Archiv alles bis zur Stelle."""
+    if not is_archive(path):
+        try:
+            persons = list(iter_persons(path))
+        except (ET.ParseError, OSError):
+            debug_file(f"Fehler beim Parsen der Datei: {path}")
+            return [], 1
+        return ([_Part(path, persons)] if persons else []), 0
+    parts: list[tuple] = []
+    errors = 0
+    try:
+        for member, fh in iter_archive_members(path):
+            try:
+                persons = list(iter_persons(fh))
+            except ET.ParseError:
+                errors += 1
+                continue
+            if persons:
+                parts.append(_Part(f"{path}{ARCHIVE_SEP}{member}", persons))
+    except _ARCHIVE_ERRORS as e:
+        debug_file(f"Archiv nicht (vollständig) lesbar: {path}: {e}")
+    return parts, errors
+
+
+def _parse_chunk(paths: list[str]) -> list[tuple[str, list[_Part], int]]:
+    """Worker für den Prozess-Pool (Modulebene, damit picklebar)."""
+    return [(path, *_parse_path(path)) for path in paths]
+
+
+class LiveIndex:
+    """
+    Personen eines Verzeichnisbaums im Speicher, per update() mit dem Baum abgeglichen.
+    - Erster update(): kompletter Aufbau (mit jobs > 1 im Prozess-Pool), danach inkrementell.
+    - watch() startet einen Hintergrundthread, der alle WATCH_INTERVAL_S abgleicht; close() beendet ihn.
+    - search() antwortet aus dem Speicher; Dateien, die den Namen bzw. das Datum sicher nicht
+      enthalten, überspringe ich am Blob (ein 'in' je Datei), den Rest prüft person_matches.
+    Thread-sicher: ein Abgleich zur Zeit (_update_lock); Suchen sehen immer einen vollständigen Stand.
+    """
+
+    def __init__(self, directory: str, archives: bool = DEFAULT_ARCHIVES, jobs: int = 1) -> None:
+        self.directory = os.path.abspath(directory)
+        self.archives = archives
+        self.jobs = jobs
+        self.ready = False       # erster vollständiger Aufbau fertig
+        self.persons = 0
+        self._dirs: dict[str, tuple[int | None, tuple[str, ...], tuple[str, ...]]] = {}  # mtime_ns, Dateien, Unterordner
+        self._files: dict[str, tuple[int, int, list[_Part]]] = {}                       # mtime_ns, Größe, Teile
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._polls = 0
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # --- Abgleich -------------------------------------------------------------
+    def update(self, stop_event: threading.Event | None = None, progress=None, full: bool = False) -> dict:
+        """
+        Gleicht den Index mit dem Baum ab und liefert Zähler (Ordner, davon gelesen, neu, geändert,
+        gelöscht, Parse-Fehler, Sekunden; "cancelled" bei Abbruch – dann bleibt der alte Stand).
+        progress(done, total) läuft beim Parsen mit.
+        """
+        with self._update_lock:
+            t0 = time.perf_counter()
+            full = full or not self.ready or self._polls % WATCH_FULL_EVERY == WATCH_FULL_EVERY - 1
+            self._polls += 1
+            stats = {"dirs": 0, "listed": 0, "new": 0, "changed": 0, "removed": 0, "errors": 0}
+            scan = self._scan(full, stop_event, stats)
+            if scan is None:
+                return {**stats, "cancelled": True}
+            dirs, to_parse, removed = scan
+            parsed = self._parse(to_parse, stop_event, progress, stats)
+            if parsed is None:
+                return {**stats, "cancelled": True}
+            with self._lock:
+                for path in removed:
+                    entry = self._files.pop(path, None)
+                    if entry is not None:
+                        self.persons -= sum(part.count for part in entry[2])
+                        stats["removed"] += 1
+                for path, entry in parsed.items():
+                    old = self._files.get(path)
+                    if old is not None:
+                        self.persons -= sum(part.count for part in old[2])
+                    self._files[path] = entry
+                    self.persons += sum(part.count for part in entry[2])
+                self._dirs = dirs
+                self.ready = True
+            stats["files"] = len(self._files)
+            stats["persons"] = self.persons
+            stats["seconds"] = round(time.perf_counter() - t0, 3)
+            if full or to_parse or removed:
+                debug(f"Live-Index abgeglichen: {stats}")
+            return stats
+
+    def _scan(self, full: bool, stop_event: threading.Event | None, stats: dict):
+        """Walk über die bekannten Ordner: unveränderte (mtime) übernehme ich, die anderen lese ich neu.
+        Liefert (neue Ordnerliste, zu parsen [(Pfad, mtime_ns, Größe)], gelöschte Pfade) oder None bei Abbruch."""
+        dirs: dict[str, tuple[int | None, tuple[str, ...], tuple[str, ...]]] = {}
+        to_parse: list[tuple[str, int, int]] = []
+        removed: list[str] = []
+        now = time.time()
+        stack = [self.directory]
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            current = stack.pop()
+            try:
+                st = os.stat(current)
+            except OSError:
+                continue
+            stats["dirs"] += 1
+            old = self._dirs.get(current)
+            if not full and old is not None and old[0] == st.st_mtime_ns:
+                dirs[current] = old
+                stack.extend(reversed(old[2]))
+                continue
+            files: list[str] = []
+            subdirs: list[str] = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(".xml") or (self.archives and is_archive(entry.name)):
+                            try:
+                                est = entry.stat()
+                            except OSError:
+                                continue
+                            files.append(entry.path)
+                            known = self._files.get(entry.path)
+                            if known is None or known[0] != est.st_mtime_ns or known[1] != est.st_size:
+                                to_parse.append((entry.path, est.st_mtime_ns, est.st_size))
+                                stats["changed" if known is not None else "new"] += 1
+            except OSError:
+                pass  # unlesbar wie bei os.walk: dann eben leer (bisherige Dateien gelten als gelöscht)
+            stats["listed"] += 1
+            if old is not None:
+                listed = set(files)
+                removed.extend(path for path in old[1] if path not in listed)
+            fresh = now - st.st_mtime < WATCH_MTIME_SLACK_S
+            dirs[current] = (None if fresh else st.st_mtime_ns, tuple(files), tuple(subdirs))
+            stack.extend(reversed(subdirs))
+        # Ordner, die es nicht mehr gibt (gelöscht, umbenannt): deren Dateien auch weg
+        for path, old in self._dirs.items():
+            if path not in dirs:
+                removed.extend(old[1])
+        return dirs, to_parse, removed
+
+    def _parse(self, to_parse: list[tuple[str, int, int]], stop_event: threading.Event | None, progress,
+               stats: dict) -> dict[str, tuple[int, int, list[_Part]]] | None:
+        """Parst die neuen/geänderten Dateien – ab ein paar Blöcken im Prozess-Pool. None = abgebrochen."""
+        stamps = {path: (mtime, size) for path, mtime, size in to_parse}
+        parsed: dict[str, tuple[int, int, list[_Part]]] = {}
+        total = len(to_parse)
+
+        def take(results) -> None:
+            for path, parts, errors in results:
+                parsed[path] = (*stamps[path], parts)
+                stats["errors"] += errors
+            if progress is not None:
+                progress(len(parsed), total)
+
+        paths = [path for path, _, _ in to_parse]
+        chunks = [paths[i:i + 32] for i in range(0, total, 32)]
+        if self.jobs <= 1 or len(chunks) < 2:
+            for chunk in chunks:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                take(_parse_chunk(chunk))
+            return parsed
+        pool = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            pending = {pool.submit(_parse_chunk, chunk) for chunk in chunks}
+            while pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                for future in done:
+                    take(future.result())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return parsed
+
+    # --- Beobachten -------------------------------------------------------------
+    def watch(self, interval: float = WATCH_INTERVAL_S) -> None:
+        """Abgleich alle interval Sekunden im Hintergrund (einmal starten genügt; close() beendet)."""
+        if self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._closed.wait(interval):
+                try:
+                    self.update(self._closed)
+                except Exception as e:  # Share kurz weg o. Ä. – der nächste Abgleich versucht es wieder
+                    debug(f"Live-Index: Abgleich fehlgeschlagen: {e}")
+
+        self._thread = threading.Thread(target=run, name="truffledog-watch", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._closed.set()
+
+    @property
+    def files(self) -> int:
+        """Anzahl Dateien im Index (Archive zählen einmal)."""
+        return len(self._files)
+
+    def parts(self) -> list[_Part]:
+        """Aktueller Stand als Teile in Walk-Reihenfolge (z. B. für den Snapshot-Export)."""
+        with self._lock:
+            return [part for _, _, parts in self._files.values() for part in parts]
+
+    # --- Suche ------------------------------------------------------------------
+    def search(self, search_type: str, date_str: str = "", name_value: str = "", matcher=None) -> list[tuple]:
+        """
+        Treffer (Name, Geburtsdatum, Datei) wie die Live-Suche, in Walk-Reihenfolge (neue Dateien hinten).
+        matcher: FuzzyMatcher (unscharfe Namenssuche) – dann ohne Blob-Vorprüfung.
+        """
+        needle = exact = bounds = None
+        if matcher is None:
+            if search_type in ("name", "both"):
+                needle = name_value.lower()
+            if search_type in ("birth", "both"):
+                bounds = _date_bounds(date_str)
+                if bounds is None:
+                    exact = f"{_SEP}{date_str}{_SEP}"
+        if not needle:
+            needle = None  # leerer Name passt auf alle
+        with self._lock:
+            entries = list(self._files.values())
+        found: list[tuple] = []
+        for _, _, parts in entries:
+            for part in parts:
+                if needle is not None and needle not in part.lowered:
+                    continue
+                if exact is not None and exact not in part.births:
+                    continue
+                if bounds is not None and (not part.lo or part.hi < bounds[0] or part.lo > bounds[1]):
+                    continue
+                # Kandidaten in C vorsortieren; das letzte Wort hat person_matches (gleiche Treffer wie live).
+                if exact is not None:
+                    candidates = _find_persons(part.births, part.birth_ends, exact)
+                elif needle is not None:
+                    candidates = _find_persons(part.lowered, part.lower_ends, needle)
+                else:
+                    candidates = range(part.count)
+                if bounds is not None:
+                    dates = (part.normalized or part.births)[1:-1].split(_SEP)
+                    low, high = bounds
+                    candidates = [i for i in candidates if low <= dates[i] <= high]
+                for i in candidates:
+                    name, birth = part.person(i)
+                    if matcher.match(name, birth) if matcher is not None else \
+                            person_matches(name, birth, search_type, date_str, name_value):
+                        found.append((name or "Unbekannt", birth, part.path))
+        return found